@@ -0,0 +1,83 @@
+"""Overview:.
+
+Demonstrates how to use the Semi Device Control APIs with the simulated
+device backend, to run a test program without the Semi Device Control addon.
+
+Requirement: Python full development system.
+Instructions:
+1. Run this python code.
+2. View the read register value and the simulated bus time printed in the terminal.
+"""
+# flake8: noqa
+import os
+import sys
+
+# To add the directory of the source file(nisemidevicecontrol.py) when the
+# example is opened from the examples folder or the top level folder
+sys.path.append(os.path.normpath(os.getcwd() + os.sep + os.pardir))
+sys.path.append(os.getcwd())
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nisdc.nisemidevicecontrol import SemiconductorDeviceControl  # noqa:E402
+from nisdc.simulation import (  # noqa:E402
+    LatencyModel,
+    SimulatedSemiDeviceControlMain,
+    load_register_map_description,
+)
+
+# Get Instrument Studio Configuration and the register map description of the simulated device
+ISconfigpath = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "conf", "isconfig.sdconfig"
+)
+register_map_path = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "conf", "simulated-register-map-LPS22HH.json"
+)
+
+# Model a bus transaction of 100 us and 20 us for every additional register
+latency_model = LatencyModel(default_latency=100e-6, default_element_latency=20e-6)
+semidevicecontrol_main = SimulatedSemiDeviceControlMain(
+    load_register_map_description(register_map_path), latency_model
+)
+
+semi_device_control = None
+
+try:
+    semi_device_control = SemiconductorDeviceControl(ISconfigpath, semidevicecontrol_main)
+    semi_device_control.start()
+
+    semi_device_control.execute_script("PowerUpInI2C")
+
+    for i in range(25):
+        semi_device_control.write_register_by_name_device(
+            "LPS22HH-Control_Register-THS_P_H", i
+        )
+
+        reg_data = semi_device_control.read_register_by_name_device(
+            "LPS22HH-Control_Register-THS_P_H"
+        )
+
+        print(hex(reg_data))
+
+    semi_device_control.execute_script("PowerDownInI2C")
+
+    simulated_session = semi_device_control.semidevicecontrol_session
+    print(
+        "{} device calls, simulated bus time {:.6f} s".format(
+            simulated_session.call_count, simulated_session.simulated_time
+        )
+    )
+
+except Exception as e:
+    print("Exception occurred: {}".format(e))
+    raise e
+
+# Stop the Hardware sessions that are previously initialized during the Start
+# operation, and closing the Device Control session using the destroy API
+finally:
+    try:
+        semi_device_control.stop()
+        semi_device_control.destroy()
+
+    except Exception as e:
+        print("Exception during close: {}".format(e))
+        raise e
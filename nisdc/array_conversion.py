@@ -0,0 +1,201 @@
+"""This file is used for the NumPy array conversion of the Semi Device Control API.
+
+The .NET arrays of primitive elements are copied to and from NumPy arrays in a single bulk
+memory copy of the pinned .NET array, instead of converting the elements one by one. NumPy
+is an optional dependency, it is imported on the first conversion.
+"""
+import ctypes
+
+_NUMPY_DTYPE_BY_DOTNET_TYPE = {
+    "System.Byte": "uint8",
+    "System.SByte": "int8",
+    "System.Int16": "int16",
+    "System.UInt16": "uint16",
+    "System.Int32": "int32",
+    "System.UInt32": "uint32",
+    "System.Int64": "int64",
+    "System.UInt64": "uint64",
+    "System.Single": "float32",
+    "System.Double": "float64",
+}
+
+_parameter_element_types = {}
+
+
+def import_numpy():
+    """Imports NumPy.
+
+    Return:
+        numpy module
+
+    Raises:
+        ImportError: if NumPy is not installed
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            "NumPy is required for the NumPy array methods, install it with 'pip install nisdc[numpy]'"
+        ) from e
+    return numpy
+
+
+def is_dotnet_object(value):
+    """Checks whether the value is a .NET object.
+
+    Args:
+        value: {object}
+
+    Return:
+        bool
+    """
+    return hasattr(value, "GetType")
+
+
+def to_numpy_array(values, dtype=None):
+    """Converts the values returned by the backend session to a NumPy array.
+
+    A .NET array of primitive elements is copied in bulk, other values are converted by NumPy.
+
+    Args:
+        values: {System.Array or sequence}
+        dtype: {numpy dtype} if not specified, the dtype matching the .NET element type is used
+
+    Return:
+        numpy.ndarray
+    """
+    numpy = import_numpy()
+    if not is_dotnet_object(values):
+        return numpy.asarray(values, dtype=dtype)
+
+    element_type = values.GetType().GetElementType()
+    native_dtype = _NUMPY_DTYPE_BY_DOTNET_TYPE.get(element_type.FullName)
+    if native_dtype is None:
+        return numpy.array(list(values), dtype=dtype)
+
+    array = numpy.empty(values.Length, dtype=native_dtype)
+    if array.size:
+        _copy_pinned(
+            values, lambda address: ctypes.memmove(array.ctypes.data, address, array.nbytes)
+        )
+    if dtype is not None:
+        array = array.astype(dtype, copy=False)
+    return array
+
+
+def to_dotnet_array(array, element_type):
+    """Converts a NumPy array to a .NET array of primitive elements in a bulk copy.
+
+    Args:
+        array: {numpy.ndarray or sequence}
+        element_type: {System.Type} element type of the .NET array
+
+    Return:
+        System.Array
+
+    Raises:
+        ValueError: if the data are not integers or out of the range of an integer element type
+    """
+    import System
+
+    numpy = import_numpy()
+    array = _to_native_array(numpy, array, _NUMPY_DTYPE_BY_DOTNET_TYPE[element_type.FullName])
+    values = System.Array.CreateInstance(element_type, array.size)
+    if array.size:
+        _copy_pinned(
+            values, lambda address: ctypes.memmove(address, array.ctypes.data, array.nbytes)
+        )
+    return values
+
+
+def to_session_array(session, method_name, parameter_index, array):
+    """Converts a NumPy array to the array parameter of a backend session method.
+
+    For a .NET session the array is copied in bulk to a .NET array of the parameter element
+    type, for other sessions the array is converted to a list.
+
+    Args:
+        session: {object} backend session
+        method_name: {string}
+        parameter_index: {int}
+        array: {numpy.ndarray or sequence}
+
+    Return:
+        System.Array or list
+    """
+    if not is_dotnet_object(session):
+        return import_numpy().asarray(array).tolist()
+
+    element_type = get_parameter_element_type(session, method_name, parameter_index)
+    if element_type is None or element_type.FullName not in _NUMPY_DTYPE_BY_DOTNET_TYPE:
+        return import_numpy().asarray(array).tolist()
+    return to_dotnet_array(array, element_type)
+
+
+def to_session_string_array(session, values):
+    """Converts the strings to the string array parameter of a backend session method.
+
+    Args:
+        session: {object} backend session
+        values: {list of string}
+
+    Return:
+        System.Array or list
+    """
+    if not is_dotnet_object(session):
+        return list(values)
+
+    import System
+
+    return System.Array[System.String](list(values))
+
+
+def get_parameter_element_type(session, method_name, parameter_index):
+    """Gets the element type of an array parameter of a .NET session method.
+
+    Args:
+        session: {object} .NET session
+        method_name: {string}
+        parameter_index: {int}
+
+    Return:
+        System.Type {None if the parameter is not an array}
+    """
+    session_type = session.GetType()
+    key = (session_type.FullName, method_name, parameter_index)
+    if key not in _parameter_element_types:
+        parameter_type = (
+            session_type.GetMethod(method_name).GetParameters()[parameter_index].ParameterType
+        )
+        _parameter_element_types[key] = (
+            parameter_type.GetElementType() if parameter_type.IsArray else None
+        )
+    return _parameter_element_types[key]
+
+
+def _to_native_array(numpy, array, native_dtype):
+    array = numpy.asarray(array)
+    if numpy.issubdtype(native_dtype, numpy.integer):
+        if array.dtype.kind not in "biu":
+            raise ValueError(
+                "Expected integer data for {} elements, got {}".format(native_dtype, array.dtype)
+            )
+        if array.size:
+            limits = numpy.iinfo(native_dtype)
+            if int(array.min()) < limits.min or int(array.max()) > limits.max:
+                raise ValueError(
+                    "The data are out of the range of {} elements [{}, {}]".format(
+                        native_dtype, limits.min, limits.max
+                    )
+                )
+    return numpy.ascontiguousarray(array, dtype=native_dtype).ravel()
+
+
+def _copy_pinned(values, copy):
+    from System.Runtime.InteropServices import GCHandle, GCHandleType
+
+    handle = GCHandle.Alloc(values, GCHandleType.Pinned)
+    try:
+        copy(handle.AddrOfPinnedObject().ToInt64())
+    finally:
+        handle.Free()
@@ -0,0 +1,183 @@
+"""This file is used for the asyncio front-end of the Semi Device Control API.
+
+The .NET device control session is not free-threaded, so every call of a session runs on
+a dedicated executor thread of the session. The awaitable methods do not block the event
+loop while the device is accessed, and the calls of a session run one at a time, in order.
+"""
+import asyncio
+import concurrent.futures
+import functools
+
+from nisdc.nisemidevicecontrol import SemiconductorDeviceControl
+
+_ASYNC_METHOD_NAMES = (
+    # Setup and cleanup
+    "attach_to_existing_session",
+    "start",
+    "stop",
+    "destroy",
+    # Register device
+    "write_register_by_name_device",
+    "write_multi_register_by_name_device",
+    "write_register_by_address_device",
+    "write_multi_register_by_address_device",
+    "write_custom_register_by_address_device",
+    "read_register_by_name_device",
+    "read_multi_register_by_name_device",
+    "read_register_by_address_device",
+    "read_multi_register_by_address_device",
+    "read_custom_register_by_address_device",
+    "get_register_addresses",
+    "resolve_register_handles",
+    "write_register_by_handle_device",
+    "write_multi_register_by_handle_device",
+    "read_register_by_handle_device",
+    "read_multi_register_by_handle_device",
+    "read_multi_register_by_name_device_numpy",
+    "read_multi_register_by_address_device_numpy",
+    "write_multi_register_by_name_device_numpy",
+    "write_multi_register_by_address_device_numpy",
+    "prepare_register_batch",
+    "prepare_register_batch_by_address",
+    # Field device
+    "write_field_by_name_device",
+    "write_multi_field_by_name_device",
+    "write_field_by_value_definition_device",
+    "read_field_by_name_device",
+    "read_multi_field_by_name_device",
+    "get_field_definition_details",
+    "prepare_field_batch",
+    # Register and field cache
+    "write_register_by_name_cache",
+    "write_multi_register_by_name_cache",
+    "write_register_by_address_cache",
+    "write_multi_register_by_address_cache",
+    "read_register_by_name_cache",
+    "read_multi_register_by_name_cache",
+    "read_register_by_address_cache",
+    "read_multi_register_by_address_cache",
+    "write_field_by_name_cache",
+    "write_multi_field_by_name_cache",
+    "write_field_by_value_definition_cache",
+    "read_field_by_name_cache",
+    "read_multi_field_by_name_cache",
+    "write_from_cache_to_device",
+    "clear_cache",
+    "flush",
+    # DIO
+    "read_pin_state",
+    "write_pin_state",
+    "read_pin_states",
+    "write_pin_states",
+    # Scripts
+    "execute_script",
+    "execute_script_command",
+    "abort_script",
+    # Utils and settings
+    "get_logs",
+    "get_new_logs",
+    "reset_to_default_state",
+    "get_script_names",
+    "get_protocol_dynamic_setting",
+    "set_protocol_dynamic_setting",
+    "get_interface_dynamic_setting",
+    "set_interface_dynamic_setting",
+    "get_protocol_dynamic_settings",
+    "set_protocol_dynamic_settings",
+    "get_interface_dynamic_settings",
+    "set_interface_dynamic_settings",
+    "get_instrument_session",
+    "get_session_options",
+    "get_interface_details",
+    "get_script_string",
+    "generate_device_elements",
+)
+
+
+class AsyncSemiconductorDeviceControl:
+    """This class exposes awaitable versions of the SemiconductorDeviceControl methods.
+
+    The methods take the same arguments as the SemiconductorDeviceControl methods and run
+    them on the executor thread of the session. Use run to call any other function on the
+    session thread, for example the read and write of a prepared batch.
+    """
+
+    def __init__(self, semi_device_control=None):
+        """Creates the executor thread of the session.
+
+        Args:
+            semi_device_control: {SemiconductorDeviceControl} if not specified, use create
+                to create the device control session on the executor thread
+        """
+        self.semi_device_control = semi_device_control
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="nisdc-session"
+        )
+
+    @classmethod
+    async def create(cls, isconfigpath=None, semidevicecontrol_main=None):
+        """Creates the device control session on the executor thread of the session.
+
+        Args:
+            isconfigpath : the isconfig path
+            semidevicecontrol_main : the main object used to create the device control session
+
+        Returns:
+            AsyncSemiconductorDeviceControl
+        """
+        async_semi_device_control = cls()
+        try:
+            async_semi_device_control.semi_device_control = await async_semi_device_control.run(
+                SemiconductorDeviceControl, isconfigpath, semidevicecontrol_main
+            )
+        except Exception:
+            async_semi_device_control.close()
+            raise
+        return async_semi_device_control
+
+    async def run(self, function, *args, **kwargs):
+        """Runs a function on the executor thread of the session.
+
+        Args:
+            function: {callable}
+
+        Returns:
+            The result of the function
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, functools.partial(function, *args, **kwargs)
+        )
+
+    def close(self, wait=True):
+        """Shuts the executor thread of the session down, the session is not destroyed.
+
+        Args:
+            wait: {bool} if True, waits until the pending calls are complete
+        """
+        self._executor.shutdown(wait=wait)
+
+    async def __aenter__(self):
+        """Returns the session, the executor is closed on exit."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        """Closes the executor after the pending calls."""
+        # The pending calls run before this one, so the shutdown does not block the loop.
+        await self.run(lambda: None)
+        self.close()
+
+
+def _make_async_method(method_name):
+    async def async_method(self, *args, **kwargs):
+        return await self.run(getattr(self.semi_device_control, method_name), *args, **kwargs)
+
+    async_method.__name__ = method_name
+    async_method.__qualname__ = "AsyncSemiconductorDeviceControl." + method_name
+    async_method.__doc__ = getattr(SemiconductorDeviceControl, method_name).__doc__
+    return async_method
+
+
+for _method_name in _ASYNC_METHOD_NAMES:
+    setattr(AsyncSemiconductorDeviceControl, _method_name, _make_async_method(_method_name))
+del _method_name
@@ -0,0 +1,81 @@
+"""This file is used to resolve the backend of the Semi Device Control API.
+
+The .NET runtime and the Semi Device Control assemblies are not loaded when the package
+is imported. They are loaded on the first session creation, through the backend resolver.
+The default resolver loads the .NET assembly, a different resolver can be configured using
+set_backend_resolver, for example to use the simulated backend from nisdc.simulation.
+"""
+import importlib
+import os
+import sys
+import threading
+
+DEVICE_CONTROL_PATH = "C:\\Program Files\\National Instruments\\Semi Device Control"
+DEVICE_CONTROL_ASSEMBLY = "SemiconductorDeviceControl"
+I3C_ASSEMBLY = "SemiconductorDeviceControl.NIDigitalI3C.APISupport"
+
+_backend_lock = threading.Lock()
+_backend_resolver = None
+_backends = {}
+
+
+def load_dotnet_assembly(assembly_name):
+    """Loads the .NET runtime and the given Semi Device Control assembly.
+
+    This is the default backend resolver.
+
+    Args:
+        assembly_name: {string}
+
+    Return:
+        The .NET namespace of the assembly {module}
+    """
+    import clr
+
+    if DEVICE_CONTROL_PATH not in sys.path:
+        sys.path.append(os.path.dirname(os.getcwd()))
+        sys.path.append(DEVICE_CONTROL_PATH)
+
+    clr.AddReference(assembly_name)
+    return importlib.import_module(assembly_name)
+
+
+def set_backend_resolver(resolver):
+    """Sets the resolver used to load the backend of the Semi Device Control API.
+
+    The resolver is called with the assembly name (DEVICE_CONTROL_ASSEMBLY or I3C_ASSEMBLY)
+    and returns an object that provides the same classes as the .NET namespace of the assembly,
+    that is SemiDeviceControlMain and PinState for DEVICE_CONTROL_ASSEMBLY and
+    SemiconductorDeviceControlI3CSession for I3C_ASSEMBLY.
+
+    The backends already resolved are discarded. Sessions created before the call keep
+    using the backend they were created with.
+
+    Args:
+        resolver: {callable} if None, the default resolver loading the .NET assembly is used.
+    """
+    global _backend_resolver
+    with _backend_lock:
+        _backend_resolver = resolver
+        _backends.clear()
+
+
+def get_backend(assembly_name=DEVICE_CONTROL_ASSEMBLY):
+    """Gets the backend of the given assembly, resolving it on the first call.
+
+    Args:
+        assembly_name: {string}
+
+    Return:
+        The backend namespace of the assembly {object}
+    """
+    try:
+        return _backends[assembly_name]
+    except KeyError:
+        pass
+
+    with _backend_lock:
+        if assembly_name not in _backends:
+            resolver = _backend_resolver if _backend_resolver is not None else load_dotnet_assembly
+            _backends[assembly_name] = resolver(assembly_name)
+        return _backends[assembly_name]
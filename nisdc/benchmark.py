@@ -0,0 +1,585 @@
+"""This file is used to benchmark the latency of the Semi Device Control API.
+
+Every public method of SemiconductorDeviceControl and SemiDeviceControlI3CSession is called
+repeatedly, the multiple register and field methods at varying batch sizes, and the p50 and
+p99 latency and the calls per second are reported. The session of the device control is
+wrapped in a timing stand-in for the duration of the benchmark, which splits the latency of
+each call into the time spent in the backend session (including the pythonnet marshalling
+for the .NET session) and the time spent in the Python wrapper.
+
+The benchmark writes zero to the registers, fields and pins of the device. Only run it
+against the simulated device or a setup where that is safe.
+
+Run "python -m nisdc.benchmark --help" to benchmark the API against the simulated device.
+"""
+import argparse
+import collections
+import time
+
+BenchmarkResult = collections.namedtuple(
+    "BenchmarkResult",
+    [
+        "api",
+        "batch_size",
+        "calls",
+        "p50",
+        "p99",
+        "calls_per_second",
+        "backend_p50",
+        "wrapper_p50",
+        "error",
+    ],
+)
+BenchmarkResult.__doc__ = """Latency of an API at a batch size, the latencies are in seconds."""
+
+DEFAULT_BATCH_SIZES = (1, 16, 256)
+
+
+class _TimedSession:
+    """Stand-in session that accumulates the time spent in the wrapped backend session."""
+
+    def __init__(self, target):
+        self._target = target
+        self.backend_time = 0
+
+    def __getattr__(self, name):
+        attribute = getattr(self._target, name)
+        if not callable(attribute):
+            return attribute
+
+        def timed_call(*args):
+            start = time.perf_counter_ns()
+            try:
+                return attribute(*args)
+            finally:
+                self.backend_time += time.perf_counter_ns() - start
+
+        return timed_call
+
+
+def percentile(samples, fraction):
+    """Gets the percentile of the sorted samples using the nearest rank.
+
+    Args:
+        samples: {list of number} sorted in ascending order
+        fraction: {float} 0.5 for p50, 0.99 for p99
+
+    Return:
+        number
+    """
+    if not samples:
+        return 0
+    return samples[min(len(samples) - 1, int(round(fraction * (len(samples) - 1))))]
+
+
+def _repeat(values, count):
+    return [values[index % len(values)] for index in range(count)]
+
+
+def _stop_start(semi_device_control):
+    semi_device_control.stop()
+    semi_device_control.start()
+
+
+def _single_cases(semi_device_control, context):
+    register_uid = context["register_uids"][0]
+    ip_block_name = context["ip_block_names"][0]
+    register_address = context["register_addresses"][0]
+    cases = [
+        (
+            "write_register_by_name_device",
+            semi_device_control.write_register_by_name_device,
+            (register_uid, 0),
+        ),
+        (
+            "read_register_by_name_device",
+            semi_device_control.read_register_by_name_device,
+            (register_uid,),
+        ),
+        (
+            "write_register_by_address_device",
+            semi_device_control.write_register_by_address_device,
+            (ip_block_name, register_address, 0),
+        ),
+        (
+            "read_register_by_address_device",
+            semi_device_control.read_register_by_address_device,
+            (ip_block_name, register_address),
+        ),
+        (
+            "write_register_by_name_cache",
+            semi_device_control.write_register_by_name_cache,
+            (register_uid, 0),
+        ),
+        (
+            "read_register_by_name_cache",
+            semi_device_control.read_register_by_name_cache,
+            (register_uid,),
+        ),
+        (
+            "write_register_by_address_cache",
+            semi_device_control.write_register_by_address_cache,
+            (ip_block_name, register_address, 0),
+        ),
+        (
+            "read_register_by_address_cache",
+            semi_device_control.read_register_by_address_cache,
+            (ip_block_name, register_address),
+        ),
+        ("write_from_cache_to_device", semi_device_control.write_from_cache_to_device, ()),
+        ("clear_cache", semi_device_control.clear_cache, ()),
+        ("get_register_addresses", semi_device_control.get_register_addresses, ()),
+        ("get_logs", semi_device_control.get_logs, ()),
+        ("reset_to_default_state", semi_device_control.reset_to_default_state, ()),
+        ("get_script_names", semi_device_control.get_script_names, ()),
+        ("get_interface_details", semi_device_control.get_interface_details, ()),
+        ("abort_script", semi_device_control.abort_script, ()),
+        ("stop_start", _stop_start, (semi_device_control,)),
+    ]
+
+    if context["field_uids"]:
+        field_uid = context["field_uids"][0]
+        cases += [
+            (
+                "write_field_by_name_device",
+                semi_device_control.write_field_by_name_device,
+                (field_uid, 0),
+            ),
+            (
+                "read_field_by_name_device",
+                semi_device_control.read_field_by_name_device,
+                (field_uid,),
+            ),
+            (
+                "write_field_by_name_cache",
+                semi_device_control.write_field_by_name_cache,
+                (field_uid, 0),
+            ),
+            (
+                "read_field_by_name_cache",
+                semi_device_control.read_field_by_name_cache,
+                (field_uid,),
+            ),
+            (
+                "get_field_definition_details",
+                semi_device_control.get_field_definition_details,
+                (field_uid,),
+            ),
+        ]
+        if context["value_definition"] is not None:
+            cases += [
+                (
+                    "write_field_by_value_definition_device",
+                    semi_device_control.write_field_by_value_definition_device,
+                    (field_uid, context["value_definition"]),
+                ),
+                (
+                    "write_field_by_value_definition_cache",
+                    semi_device_control.write_field_by_value_definition_cache,
+                    (field_uid, context["value_definition"]),
+                ),
+            ]
+
+    for pin_name in context["pin_names"][:1]:
+        cases += [
+            ("write_pin_state", semi_device_control.write_pin_state, (pin_name, 0)),
+            ("read_pin_state", semi_device_control.read_pin_state, (pin_name,)),
+        ]
+
+    for script_name in context["script_names"][:1]:
+        cases += [
+            ("execute_script", semi_device_control.execute_script, (script_name, True)),
+            ("get_script_string", semi_device_control.get_script_string, (script_name,)),
+        ]
+    if context["script_command"]:
+        cases.append(
+            (
+                "execute_script_command",
+                semi_device_control.execute_script_command,
+                (context["script_command"], True),
+            )
+        )
+
+    for interface_name in context["interface_names"][:1]:
+        cases.append(
+            (
+                "get_instrument_session",
+                semi_device_control.get_instrument_session,
+                (interface_name,),
+            )
+        )
+        if context["setting_name"]:
+            cases += [
+                (
+                    "get_interface_dynamic_setting",
+                    semi_device_control.get_interface_dynamic_setting,
+                    (interface_name, context["setting_name"]),
+                ),
+                (
+                    "set_interface_dynamic_setting",
+                    semi_device_control.set_interface_dynamic_setting,
+                    (interface_name, context["setting_name"], context["setting_value"]),
+                ),
+            ]
+        for protocol_name in context["protocol_names"][:1]:
+            cases += [
+                (
+                    "write_custom_register_by_address_device",
+                    semi_device_control.write_custom_register_by_address_device,
+                    (register_address, 8, 0, 8, interface_name, protocol_name),
+                ),
+                (
+                    "read_custom_register_by_address_device",
+                    semi_device_control.read_custom_register_by_address_device,
+                    (register_address, 8, 8, interface_name, protocol_name),
+                ),
+            ]
+            if context["setting_name"]:
+                cases += [
+                    (
+                        "get_protocol_dynamic_setting",
+                        semi_device_control.get_protocol_dynamic_setting,
+                        (interface_name, protocol_name, context["setting_name"]),
+                    ),
+                    (
+                        "set_protocol_dynamic_setting",
+                        semi_device_control.set_protocol_dynamic_setting,
+                        (
+                            interface_name,
+                            protocol_name,
+                            context["setting_name"],
+                            context["setting_value"],
+                        ),
+                    ),
+                ]
+    return cases
+
+
+def _multi_cases(semi_device_control, context, batch_size):
+    register_uids = _repeat(context["register_uids"], batch_size)
+    ip_block_names = _repeat(context["ip_block_names"], batch_size)
+    register_addresses = _repeat(context["register_addresses"], batch_size)
+    data = [0] * batch_size
+    cases = [
+        (
+            "write_multi_register_by_name_device",
+            semi_device_control.write_multi_register_by_name_device,
+            (register_uids, data),
+        ),
+        (
+            "read_multi_register_by_name_device",
+            semi_device_control.read_multi_register_by_name_device,
+            (register_uids,),
+        ),
+        (
+            "write_multi_register_by_address_device",
+            semi_device_control.write_multi_register_by_address_device,
+            (ip_block_names, register_addresses, data),
+        ),
+        (
+            "read_multi_register_by_address_device",
+            semi_device_control.read_multi_register_by_address_device,
+            (ip_block_names, register_addresses),
+        ),
+        (
+            "write_multi_register_by_name_cache",
+            semi_device_control.write_multi_register_by_name_cache,
+            (register_uids, data),
+        ),
+        (
+            "read_multi_register_by_name_cache",
+            semi_device_control.read_multi_register_by_name_cache,
+            (register_uids,),
+        ),
+        (
+            "write_multi_register_by_address_cache",
+            semi_device_control.write_multi_register_by_address_cache,
+            (ip_block_names, register_addresses, data),
+        ),
+        (
+            "read_multi_register_by_address_cache",
+            semi_device_control.read_multi_register_by_address_cache,
+            (ip_block_names, register_addresses),
+        ),
+    ]
+    if context["field_uids"]:
+        field_uids = _repeat(context["field_uids"], batch_size)
+        cases += [
+            (
+                "write_multi_field_by_name_device",
+                semi_device_control.write_multi_field_by_name_device,
+                (field_uids, data),
+            ),
+            (
+                "read_multi_field_by_name_device",
+                semi_device_control.read_multi_field_by_name_device,
+                (field_uids,),
+            ),
+            (
+                "write_multi_field_by_name_cache",
+                semi_device_control.write_multi_field_by_name_cache,
+                (field_uids, data),
+            ),
+            (
+                "read_multi_field_by_name_cache",
+                semi_device_control.read_multi_field_by_name_cache,
+                (field_uids,),
+            ),
+        ]
+    return cases
+
+
+def _i3c_cases(i3c_session, context):
+    ccc_type, command_id = context["i3c_ccc_type"], context["i3c_command_id"]
+    return [
+        (
+            "execute_dynamic_addressing_ccc",
+            i3c_session.execute_dynamic_addressing_ccc,
+            (ccc_type, command_id),
+        ),
+        (
+            "execute_dynamic_addressing_ccc_with_read",
+            i3c_session.execute_dynamic_addressing_ccc_with_read,
+            (ccc_type, command_id),
+        ),
+        (
+            "execute_sdr_ccc_write",
+            i3c_session.execute_sdr_ccc_write,
+            (ccc_type, command_id, -1, [0]),
+        ),
+        ("execute_sdr_ccc_read", i3c_session.execute_sdr_ccc_read, (ccc_type, command_id, -1, 1)),
+    ]
+
+
+def _measure(api, batch_size, function, args, timed_sessions, iterations, warmup_iterations):
+    try:
+        for _ in range(warmup_iterations):
+            function(*args)
+
+        latencies = []
+        backend_latencies = []
+        for _ in range(iterations):
+            backend_start = sum(session.backend_time for session in timed_sessions)
+            start = time.perf_counter_ns()
+            function(*args)
+            latencies.append(time.perf_counter_ns() - start)
+            backend_latencies.append(
+                sum(session.backend_time for session in timed_sessions) - backend_start
+            )
+
+    except Exception as e:
+        return BenchmarkResult(api, batch_size, 0, 0.0, 0.0, 0.0, 0.0, 0.0, str(e))
+
+    wrapper_latencies = sorted(
+        latency - backend_latency for latency, backend_latency in zip(latencies, backend_latencies)
+    )
+    total_time = sum(latencies)
+    latencies.sort()
+    backend_latencies.sort()
+    return BenchmarkResult(
+        api,
+        batch_size,
+        iterations,
+        percentile(latencies, 0.5) / 1e9,
+        percentile(latencies, 0.99) / 1e9,
+        iterations / (total_time / 1e9) if total_time else 0.0,
+        percentile(backend_latencies, 0.5) / 1e9,
+        percentile(wrapper_latencies, 0.5) / 1e9,
+        None,
+    )
+
+
+def run_benchmark_suite(
+    semi_device_control,
+    i3c_session=None,
+    batch_sizes=DEFAULT_BATCH_SIZES,
+    iterations=1000,
+    warmup_iterations=10,
+    pin_names=(),
+    protocol_names=(),
+    setting_name=None,
+    setting_value="",
+    script_command=None,
+    i3c_ccc_type=0,
+    i3c_command_id=0,
+):
+    """Benchmarks every public method of the device control and I3C session.
+
+    The device control session must be started. The register, field, script and interface
+    names used by the benchmark are queried from the session, the pins, protocols and settings
+    are not available from the session and have to be passed in.
+
+    Args:
+        semi_device_control: {SemiconductorDeviceControl}
+        i3c_session: {SemiDeviceControlI3CSession} if not specified, I3C is not benchmarked
+        batch_sizes: {list of int} batch sizes of the multiple register and field methods
+        iterations: {int} number of measured calls per method and batch size
+        warmup_iterations: {int} number of calls per method before the measurement
+        pin_names: {list of string}
+        protocol_names: {list of string}
+        setting_name: {string} dynamic setting used for the settings methods
+        setting_value: {string}
+        script_command: {string} script string used for execute_script_command
+        i3c_ccc_type: {int}
+        i3c_command_id: {int}
+
+    Return:
+        results {list of BenchmarkResult}
+    """
+    register_uids, register_addresses = semi_device_control.get_register_addresses()
+    device_state_keys = semi_device_control.semidevicecontrol_session.GetDeviceStateKeys()
+    field_uids = list(device_state_keys.FieldUIDs)
+    value_definition = None
+    if field_uids:
+        display_values = semi_device_control.get_field_definition_details(field_uids[0])[0]
+        value_definition = display_values[0] if display_values else None
+    interface_names = semi_device_control.get_interface_details()[0]
+    context = {
+        "register_uids": list(register_uids),
+        "register_addresses": list(register_addresses),
+        "ip_block_names": [register_uid.split("-", 1)[0] for register_uid in register_uids],
+        "field_uids": field_uids,
+        "value_definition": value_definition,
+        "pin_names": list(pin_names),
+        "script_names": list(semi_device_control.get_script_names()),
+        "script_command": script_command,
+        "interface_names": list(interface_names),
+        "protocol_names": list(protocol_names),
+        "setting_name": setting_name,
+        "setting_value": setting_value,
+        "i3c_ccc_type": i3c_ccc_type,
+        "i3c_command_id": i3c_command_id,
+    }
+
+    session = semi_device_control.semidevicecontrol_session
+    timed_sessions = [_TimedSession(session)]
+    semi_device_control.semidevicecontrol_session = timed_sessions[0]
+    if i3c_session is not None:
+        timed_sessions.append(_TimedSession(i3c_session.i3c_session))
+        i3c_session.i3c_session = timed_sessions[1]
+
+    results = []
+    try:
+        cases = [
+            (api, 1, function, args)
+            for api, function, args in _single_cases(semi_device_control, context)
+        ]
+        for batch_size in batch_sizes:
+            cases += [
+                (api, batch_size, function, args)
+                for api, function, args in _multi_cases(semi_device_control, context, batch_size)
+            ]
+        if i3c_session is not None:
+            cases += [
+                (api, 1, function, args) for api, function, args in _i3c_cases(i3c_session, context)
+            ]
+        for api, batch_size, function, args in cases:
+            results.append(
+                _measure(
+                    api, batch_size, function, args, timed_sessions, iterations, warmup_iterations
+                )
+            )
+
+    finally:
+        semi_device_control.semidevicecontrol_session = session
+        if i3c_session is not None:
+            i3c_session.i3c_session = timed_sessions[1]._target
+
+    return results
+
+
+def format_results(results):
+    """Formats the benchmark results as a table, the latencies are in microseconds.
+
+    Args:
+        results: {list of BenchmarkResult}
+
+    Return:
+        string
+    """
+    lines = [
+        "{:<42} {:>6} {:>11} {:>11} {:>12} {:>11} {:>11}".format(
+            "API", "batch", "p50 (us)", "p99 (us)", "calls/s", "backend", "wrapper"
+        )
+    ]
+    for result in results:
+        if result.error is not None:
+            lines.append(
+                "{:<42} {:>6} failed: {}".format(result.api, result.batch_size, result.error)
+            )
+            continue
+        lines.append(
+            "{:<42} {:>6} {:>11.2f} {:>11.2f} {:>12.0f} {:>11.2f} {:>11.2f}".format(
+                result.api,
+                result.batch_size,
+                result.p50 * 1e6,
+                result.p99 * 1e6,
+                result.calls_per_second,
+                result.backend_p50 * 1e6,
+                result.wrapper_p50 * 1e6,
+            )
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Benchmarks the Semi Device Control API against the simulated device."""
+    from nisdc.backend import set_backend_resolver
+    from nisdc.nisemidevicecontrol import SemiconductorDeviceControl
+    from nisdc.simulation import (
+        LatencyModel,
+        SimulatedBackend,
+        generate_register_map_description,
+    )
+    from nisdc_i3c.nisdc_i3c import SemiDeviceControlI3CSession
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=list(DEFAULT_BATCH_SIZES))
+    parser.add_argument("--register-count", type=int, default=1024)
+    parser.add_argument(
+        "--call-latency", type=float, default=0.0, help="simulated latency of every call in seconds"
+    )
+    parser.add_argument(
+        "--element-latency",
+        type=float,
+        default=0.0,
+        help="simulated latency per register or field in seconds",
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="sleep for the simulated latency instead of only accumulating it",
+    )
+    arguments = parser.parse_args(argv)
+
+    register_map = generate_register_map_description(arguments.register_count)
+    latency_model = LatencyModel(
+        arguments.call_latency, arguments.element_latency, arguments.realtime
+    )
+    set_backend_resolver(SimulatedBackend(register_map, latency_model, log_transactions=False))
+    semi_device_control = SemiconductorDeviceControl("simulation")
+    semi_device_control.start()
+    try:
+        i3c_session = SemiDeviceControlI3CSession(semi_device_control, "Simulation1", "I3C")
+        results = run_benchmark_suite(
+            semi_device_control,
+            i3c_session,
+            batch_sizes=arguments.batch_sizes,
+            iterations=arguments.iterations,
+            pin_names=list(register_map["pins"]),
+            protocol_names=["SIM1"],
+            setting_name="Clock",
+            setting_value="1000000",
+            script_command="writedio P0 High",
+        )
+        print(format_results(results))
+
+    finally:
+        semi_device_control.stop()
+        semi_device_control.destroy()
+        set_backend_resolver(None)
+
+
+if __name__ == "__main__":
+    main()
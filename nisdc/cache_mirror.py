@@ -0,0 +1,85 @@
+"""This file is used to mirror the register cache of the Semi Device Control session.
+
+The register writes to the cache are mirrored in Python, so that the cache can be written to
+the device with the minimal number of register writes: the repeated writes to a register are
+collapsed to the final value, and the writes of the value already on the device are dropped.
+"""
+import collections
+
+CacheFlushResult = collections.namedtuple(
+    "CacheFlushResult", ["cached_writes", "register_writes", "transactions_saved"]
+)
+CacheFlushResult.__doc__ = """Result of a write from cache to device.
+
+cached_writes is the number of register and field writes to the cache since the last flush,
+register_writes the number of registers written to the device and transactions_saved the
+number of register writes saved compared to writing every cached write.
+"""
+
+
+class CacheMirror:
+    """This class mirrors the register writes to the cache, in the cache order."""
+
+    def __init__(self):
+        """Creates the empty cache mirror."""
+        self.register_data = collections.OrderedDict()
+        self.write_count = 0
+        self.complete = True
+
+    def record(self, register_uid_list, register_data_list):
+        """Records register writes to the cache.
+
+        A repeated write to a register replaces the previous write and moves the register to
+        the end of the cache order, so the minimal diff write writes it after the registers
+        first written after it. This changes the write order of the registers with ordering
+        dependencies, write them to the device instead of the cache.
+
+        Args:
+            register_uid_list: {list of string}
+            register_data_list: {list of int}
+        """
+        register_data = self.register_data
+        for register_uid, data in zip(register_uid_list, register_data_list):
+            register_data.pop(register_uid, None)
+            register_data[register_uid] = data
+            self.write_count += 1
+
+    def record_unknown(self, write_count=1):
+        """Records cache writes that cannot be mirrored, for example field writes.
+
+        The mirror is incomplete until it is cleared, and the cache has to be written
+        to the device by the session.
+
+        Args:
+            write_count: {int}
+        """
+        self.write_count += write_count
+        self.complete = False
+
+    def clear(self, complete=True):
+        """Clears the mirror.
+
+        Args:
+            complete: {bool} False if the cache of the session is not known to be empty
+        """
+        self.register_data = collections.OrderedDict()
+        self.write_count = 0
+        self.complete = complete
+
+    def plan(self, get_device_value):
+        """Plans the minimal register writes of the mirrored cache.
+
+        Args:
+            get_device_value: {callable} returns the value known to be on the device for a
+                register UID, or None if the value is not known
+
+        Return:
+            Tuple {list of string - register UIDs to write, list of int - register data}
+        """
+        register_uid_list = []
+        register_data_list = []
+        for register_uid, register_data in self.register_data.items():
+            if get_device_value(register_uid) != register_data:
+                register_uid_list.append(register_uid)
+                register_data_list.append(register_data)
+        return register_uid_list, register_data_list
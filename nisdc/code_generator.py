@@ -0,0 +1,210 @@
+"""This file is used to generate the device elements package of the Semi Device Control API.
+
+The register and field UIDs are written to one submodule per IP block, line by line, and the
+package __init__ imports a submodule only when one of its elements is first accessed:
+
+    from nisdc_device_elements import Register, Field
+
+    Register.LPS22HH.Control_Register.CTRL_REG1
+
+The hash of the register map is stored in the package __init__, and the package is not
+generated again as long as the register map does not change.
+"""
+import collections
+import hashlib
+import os
+import re
+
+GENERATOR_VERSION = "1"
+DEFAULT_PACKAGE_NAME = "nisdc_device_elements"
+GENERATED_FILE_HEADER = "# Generated by nisdc, do not edit.\n"
+
+_HASH_PATTERN = re.compile(r'^REGISTER_MAP_HASH = "([0-9a-f]*)"$', re.MULTILINE)
+_INVALID_IDENTIFIER_CHARACTERS = re.compile(r"\W")
+
+_INIT_TEMPLATE = '''"""This package contains the registers and fields info, one submodule per IP block."""
+# flake8: noqa
+{header}import importlib
+
+REGISTER_MAP_HASH = "{register_map_hash}"
+
+# IP block name: submodule name
+IP_BLOCKS = {{
+{ip_blocks}}}
+
+
+class _DeviceElements:
+    """This class imports the elements of an IP block on first access."""
+
+    def __init__(self, element_type):
+        self._element_type = element_type
+
+    def __getattr__(self, ip_block_name):
+        if ip_block_name not in IP_BLOCKS:
+            raise AttributeError(ip_block_name)
+        elements = getattr(_import_ip_block(ip_block_name), self._element_type)
+        setattr(self, ip_block_name, elements)
+        return elements
+
+    def __dir__(self):
+        return list(IP_BLOCKS)
+
+
+def _import_ip_block(ip_block_name):
+    return importlib.import_module("." + IP_BLOCKS[ip_block_name], __name__)
+
+
+def __getattr__(name):
+    if name in IP_BLOCKS:
+        return _import_ip_block(name)
+    raise AttributeError("module {{!r}} has no attribute {{!r}}".format(__name__, name))
+
+
+Register = _DeviceElements("Register")
+Field = _DeviceElements("Field")
+'''
+
+
+def get_register_map_hash(register_uid_list, field_uid_list):
+    """Gets the hash of the device elements of a register map.
+
+    Args:
+        register_uid_list: {list of string}
+        field_uid_list: {list of string}
+
+    Return:
+        string - hexadecimal SHA-256 hash
+    """
+    register_map_hash = hashlib.sha256(GENERATOR_VERSION.encode())
+    for element_type, uid_list in (("Register", register_uid_list), ("Field", field_uid_list)):
+        register_map_hash.update(element_type.encode())
+        for uid in uid_list:
+            register_map_hash.update(b"\n")
+            register_map_hash.update(uid.encode())
+    return register_map_hash.hexdigest()
+
+
+def read_package_hash(package_directory):
+    """Reads the register map hash of a generated device elements package.
+
+    Args:
+        package_directory: {string}
+
+    Return:
+        string - None if the package is not generated
+    """
+    try:
+        with open(os.path.join(package_directory, "__init__.py")) as init_file:
+            match = _HASH_PATTERN.search(init_file.read())
+    except OSError:
+        return None
+    return match.group(1) if match else None
+
+
+def generate_device_element_package(
+    register_uid_list, field_uid_list, directory, package_name=DEFAULT_PACKAGE_NAME, force=False
+):
+    """Generates the device elements package, one submodule per IP block.
+
+    Args:
+        register_uid_list: {list of string}
+        field_uid_list: {list of string}
+        directory: {string} directory of the package
+        package_name: {string}
+        force: {bool} if True, the package is generated even if the register map is unchanged
+
+    Return:
+        Tuple {string - the path of the package, bool - True if the package was generated}
+    """
+    package_directory = os.path.join(directory, package_name)
+    register_map_hash = get_register_map_hash(register_uid_list, field_uid_list)
+    if not force and read_package_hash(package_directory) == register_map_hash:
+        return package_directory, False
+
+    elements_by_ip_block = collections.OrderedDict()
+    for element_type, uid_list in (("Register", register_uid_list), ("Field", field_uid_list)):
+        for uid in uid_list:
+            ip_block_name, register_group, element_name = uid.split("-", 2)
+            elements = elements_by_ip_block.get(ip_block_name)
+            if elements is None:
+                elements = elements_by_ip_block[ip_block_name] = {
+                    "Register": collections.OrderedDict(),
+                    "Field": collections.OrderedDict(),
+                }
+            elements[element_type].setdefault(register_group, []).append((element_name, uid))
+
+    os.makedirs(package_directory, exist_ok=True)
+    module_names = collections.OrderedDict()
+    for ip_block_name, elements in elements_by_ip_block.items():
+        module_name = _get_module_name(ip_block_name, module_names.values())
+        module_names[ip_block_name] = module_name
+        _write_file(
+            os.path.join(package_directory, module_name + ".py"),
+            _generate_ip_block_lines(ip_block_name, elements),
+        )
+    _remove_stale_modules(package_directory, set(module_names.values()))
+
+    # The __init__ holding the hash is written last, so an interrupted generation is redone.
+    _write_file(
+        os.path.join(package_directory, "__init__.py"),
+        [
+            _INIT_TEMPLATE.format(
+                header=GENERATED_FILE_HEADER,
+                register_map_hash=register_map_hash,
+                ip_blocks="".join(
+                    "    {!r}: {!r},\n".format(ip_block_name, module_name)
+                    for ip_block_name, module_name in module_names.items()
+                ),
+            )
+        ],
+    )
+    return package_directory, True
+
+
+def _generate_ip_block_lines(ip_block_name, elements):
+    yield '"""This module contains the registers and fields info of {}."""\n'.format(ip_block_name)
+    yield "# flake8: noqa\n"
+    yield GENERATED_FILE_HEADER
+    for element_type in ("Register", "Field"):
+        yield "\n\nclass {}:\n".format(element_type)
+        if not elements[element_type]:
+            yield "    pass\n"
+        for register_group, group_elements in elements[element_type].items():
+            yield "    class {}:\n".format(register_group)
+            for element_name, uid in group_elements:
+                yield '        {} = "{}"\n'.format(element_name, uid)
+
+
+def _get_module_name(ip_block_name, used_module_names):
+    module_name = _INVALID_IDENTIFIER_CHARACTERS.sub("_", ip_block_name)
+    if not module_name or module_name[0].isdigit() or module_name == "__init__":
+        module_name = "_" + module_name
+    unique_module_name = module_name
+    suffix = 1
+    while unique_module_name in used_module_names:
+        suffix += 1
+        unique_module_name = "{}_{}".format(module_name, suffix)
+    return unique_module_name
+
+
+def _write_file(path, lines):
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w") as generated_file:
+        generated_file.writelines(lines)
+    os.replace(temporary_path, path)
+
+
+def _remove_stale_modules(package_directory, module_names):
+    for file_name in os.listdir(package_directory):
+        module_name, extension = os.path.splitext(file_name)
+        if extension != ".py" or module_name == "__init__" or module_name in module_names:
+            continue
+        path = os.path.join(package_directory, file_name)
+        with open(path) as module_file:
+            is_generated = GENERATED_FILE_HEADER in (
+                module_file.readline(),
+                module_file.readline(),
+                module_file.readline(),
+            )
+        if is_generated:
+            os.remove(path)
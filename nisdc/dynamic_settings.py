@@ -0,0 +1,72 @@
+"""This file is used for the dynamic settings tracker of the Semi Device Control API.
+
+The last known value of every interface and protocol dynamic setting is tracked, so a batch
+of settings is compared with the current values and only the changed settings are set on
+the session, and the batch getters only query the settings with no known value. The values
+are recorded and compared as strings, as the session returns them.
+"""
+
+
+class DynamicSettingsTracker:
+    """This class holds the current values of the dynamic settings by setting key.
+
+    The interface settings are keyed by (interface name, setting name) and the protocol
+    settings by (interface name, protocol name, setting name).
+    """
+
+    def __init__(self):
+        """Creates the tracker with no known setting values."""
+        self._setting_values = {}
+
+    def __len__(self):
+        """Gets the number of settings with a known value."""
+        return len(self._setting_values)
+
+    def get(self, setting_key):
+        """Gets the known value of a setting.
+
+        Args:
+            setting_key: {tuple}
+
+        Return:
+            setting_value {string} None if the value is not known
+        """
+        return self._setting_values.get(setting_key)
+
+    def set(self, setting_key, setting_value):
+        """Records the current value of a setting.
+
+        Args:
+            setting_key: {tuple}
+            setting_value: {object} recorded as a string
+        """
+        self._setting_values[setting_key] = str(setting_value)
+
+    def discard(self, setting_key):
+        """Forgets the value of a setting, for example when setting it failed.
+
+        Args:
+            setting_key: {tuple}
+        """
+        self._setting_values.pop(setting_key, None)
+
+    def get_changed(self, setting_key_prefix, settings):
+        """Gets the settings of a batch that differ from the known values.
+
+        Args:
+            setting_key_prefix: {tuple} (interface name,) or (interface name, protocol name)
+            settings: {dict of setting name: setting value}
+
+        Return:
+            list of tuple {(setting name, setting value)} in the order of the batch
+        """
+        setting_values = self._setting_values
+        return [
+            (setting_name, setting_value)
+            for setting_name, setting_value in settings.items()
+            if setting_values.get(setting_key_prefix + (setting_name,)) != str(setting_value)
+        ]
+
+    def clear(self):
+        """Discards the known values of all the settings."""
+        self._setting_values = {}
@@ -0,0 +1,137 @@
+"""This file is used for the field layout of the Semi Device Control API.
+
+The field layout holds the parent register, bit offset and bit width of the fields, which
+the device control session does not expose. With the field layout, the fields are read by
+reading each distinct parent register once and extracting the fields in Python, and the
+field writes are merged into one register write per register.
+"""
+import collections
+
+FieldLayout = collections.namedtuple("FieldLayout", ["register_uid", "offset", "width"])
+FieldLayout.__doc__ = """Parent register UID, bit offset and bit width of a field."""
+
+
+class FieldLayoutTable:
+    """This class maps the field UIDs to their field layout."""
+
+    def __init__(self, field_layouts=None):
+        """Creates the field layout table.
+
+        Args:
+            field_layouts: {dict of field UID: FieldLayout}
+        """
+        self._field_layouts = dict(field_layouts or {})
+
+    @classmethod
+    def from_register_map_description(cls, register_map):
+        """Creates the field layout table from a register map description.
+
+        Args:
+            register_map: {dict} register map description, refer nisdc.simulation
+
+        Returns:
+            FieldLayoutTable
+        """
+        return cls(
+            {
+                field_description["uid"]: FieldLayout(
+                    register_description["uid"],
+                    field_description["offset"],
+                    field_description["width"],
+                )
+                for register_description in register_map.get("registers", [])
+                for field_description in register_description.get("fields", [])
+            }
+        )
+
+    def __len__(self):
+        """Gets the number of fields of the table."""
+        return len(self._field_layouts)
+
+    def __contains__(self, field_uid):
+        """Checks whether the layout of the field is known."""
+        return field_uid in self._field_layouts
+
+    def add(self, field_uid, register_uid, offset, width):
+        """Adds the layout of a field.
+
+        Args:
+            field_uid: {string}
+            register_uid: {string}
+            offset: {int} bit offset of the field in the register
+            width: {int} bit width of the field
+        """
+        self._field_layouts[field_uid] = FieldLayout(register_uid, offset, width)
+
+    def get(self, field_uid):
+        """Gets the layout of a field.
+
+        Args:
+            field_uid: {string}
+
+        Return:
+            FieldLayout {None if the layout of the field is not known}
+        """
+        return self._field_layouts.get(field_uid)
+
+    def group_by_register(self, field_uid_list):
+        """Groups the fields by parent register.
+
+        Args:
+            field_uid_list: {list of string} fields with a known layout
+
+        Return:
+            Tuple {list of string - distinct register UIDs in the order of the fields,
+            list of tuple - (register index, offset, mask) per field}
+        """
+        register_uid_list = []
+        register_indices = {}
+        extractions = []
+        for field_uid in field_uid_list:
+            register_uid, offset, width = self._field_layouts[field_uid]
+            register_index = register_indices.get(register_uid)
+            if register_index is None:
+                register_index = register_indices[register_uid] = len(register_uid_list)
+                register_uid_list.append(register_uid)
+            extractions.append((register_index, offset, (1 << width) - 1))
+        return register_uid_list, extractions
+
+    def insert(self, field_uid, register_data, field_data):
+        """Inserts the field data in the register data.
+
+        Args:
+            field_uid: {string} field with a known layout
+            register_data: {int}
+            field_data: {int}
+
+        Return:
+            register_data {int}
+
+        Raises:
+            ValueError: if the field data does not fit in the field
+        """
+        offset, width = self._field_layouts[field_uid][1:]
+        mask = (1 << width) - 1
+        if not 0 <= field_data <= mask:
+            raise ValueError(
+                "Field data {} does not fit in the {} bit field {}".format(
+                    field_data, width, field_uid
+                )
+            )
+        return (register_data & ~(mask << offset)) | (field_data << offset)
+
+
+def extract_fields(register_data_list, extractions):
+    """Extracts the fields from the register data.
+
+    Args:
+        register_data_list: {list of int} data of the registers from group_by_register
+        extractions: {list of tuple} extractions from group_by_register
+
+    Return:
+        field_data_list {list of int}
+    """
+    return [
+        (int(register_data_list[register_index]) >> offset) & mask
+        for register_index, offset, mask in extractions
+    ]
@@ -0,0 +1,98 @@
+"""This file is used for the field metadata cache of the Semi Device Control API.
+
+The field definition details of the session (display values, values and size of a field)
+are converted once per field and kept for the life of the session, with a lookup table from
+the display value to the field value. The field value definition writes are then resolved in
+Python and written as numeric field writes.
+"""
+import collections
+
+FieldMetadata = collections.namedtuple(
+    "FieldMetadata", ["display_values", "values", "size", "value_by_display_value"]
+)
+FieldMetadata.__doc__ = """Field definition details of a field.
+
+The display_values and values are tuples, value_by_display_value maps each display value
+to its field value.
+"""
+
+
+class FieldMetadataCache:
+    """This class holds the field metadata of the fields of a session by field UID."""
+
+    def __init__(self):
+        """Creates the empty field metadata cache."""
+        self._field_metadata = {}
+
+    def __len__(self):
+        """Gets the number of fields with cached metadata."""
+        return len(self._field_metadata)
+
+    def get(self, session, field_uid):
+        """Gets the metadata of a field, from the session on first use.
+
+        Args:
+            session: {object} backend session
+            field_uid: {string}
+
+        Return:
+            FieldMetadata
+        """
+        field_metadata = self._field_metadata.get(field_uid)
+        if field_metadata is None:
+            field_definition = session.GetFieldDefinitionDetails(field_uid)
+            field_metadata = self.add(
+                field_uid,
+                field_definition.DisplayValues,
+                field_definition.Values,
+                field_definition.Size,
+            )
+        return field_metadata
+
+    def add(self, field_uid, display_values, values, size):
+        """Adds the metadata of a field.
+
+        Args:
+            field_uid: {string}
+            display_values: {list of string}
+            values: {list of int}
+            size: {int}
+
+        Return:
+            FieldMetadata
+        """
+        display_values = tuple(str(display_value) for display_value in display_values)
+        values = tuple(int(value) for value in values)
+        field_metadata = self._field_metadata[field_uid] = FieldMetadata(
+            display_values, values, int(size), dict(zip(display_values, values))
+        )
+        return field_metadata
+
+    def get_value(self, session, field_uid, value_definition):
+        """Gets the field value of a value definition.
+
+        Args:
+            session: {object} backend session
+            field_uid: {string}
+            value_definition: {string} display value of the field
+
+        Return:
+            field_data {int} None if the value definition is not defined for the field
+        """
+        return self.get(session, field_uid).value_by_display_value.get(value_definition)
+
+    def preload(self, session, field_uid_list=None):
+        """Loads the metadata of the fields up front.
+
+        Args:
+            session: {object} backend session
+            field_uid_list: {list of string} if not specified, all the fields of the session
+        """
+        if field_uid_list is None:
+            field_uid_list = list(session.GetDeviceStateKeys().FieldUIDs)
+        for field_uid in field_uid_list:
+            self.get(session, field_uid)
+
+    def clear(self):
+        """Discards the metadata of all the fields."""
+        self._field_metadata = {}
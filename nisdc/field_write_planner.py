@@ -0,0 +1,98 @@
+"""This file is used for the field write planner of the Semi Device Control API.
+
+The field writes are grouped by parent register, so the fields of a register are merged in
+a single register value and written with one register write, instead of one read-modify-write
+on the bus per field. The merge needs the current register value: the fields of the registers
+with no known value are written as fields.
+"""
+import collections
+
+
+class FieldWritePlanner:
+    """This class merges the pending field writes into register values, per register."""
+
+    def __init__(self, field_layouts):
+        """Creates the planner with no pending field writes.
+
+        Args:
+            field_layouts: {FieldLayoutTable} parent register, offset and width of the fields
+        """
+        self.field_layouts = field_layouts
+        self._field_writes = collections.OrderedDict()
+
+    def __len__(self):
+        """Gets the number of pending field writes."""
+        return sum(len(field_writes) for field_writes in self._field_writes.values())
+
+    def can_plan(self, field_uid_list):
+        """Checks whether the layout of all the fields is known.
+
+        Args:
+            field_uid_list: {list of string}
+
+        Return:
+            bool
+        """
+        field_layouts = self.field_layouts
+        return all(field_uid in field_layouts for field_uid in field_uid_list)
+
+    def queue(self, field_uid_list, field_data_list):
+        """Queues field writes, the layout of the fields must be known.
+
+        Args:
+            field_uid_list: {list of string}
+            field_data_list: {list of int}
+        """
+        for field_uid, field_data in zip(field_uid_list, field_data_list):
+            register_uid = self.field_layouts.get(field_uid).register_uid
+            self._field_writes.setdefault(register_uid, []).append((field_uid, field_data))
+
+    def get_register_uids(self):
+        """Gets the registers of the pending field writes, in the order of the first write.
+
+        Return:
+            list of string
+        """
+        return list(self._field_writes)
+
+    def take(self, register_uid_list):
+        """Removes the pending field writes of registers, to write them without merging.
+
+        Args:
+            register_uid_list: {list of string}
+
+        Return:
+            Tuple {list of string - field UIDs, list of int - field data}
+        """
+        field_uid_list = []
+        field_data_list = []
+        for register_uid in register_uid_list:
+            for field_uid, field_data in self._field_writes.pop(register_uid, ()):
+                field_uid_list.append(field_uid)
+                field_data_list.append(field_data)
+        return field_uid_list, field_data_list
+
+    def plan(self, register_data_by_uid):
+        """Merges the pending field writes into the current register values.
+
+        Args:
+            register_data_by_uid: {dict of register UID: int} current value of every register
+                of get_register_uids
+
+        Return:
+            Tuple {list of string - register UIDs, list of int - merged register data}
+        """
+        insert = self.field_layouts.insert
+        register_uid_list = []
+        register_data_list = []
+        for register_uid, field_writes in self._field_writes.items():
+            register_data = int(register_data_by_uid[register_uid])
+            for field_uid, field_data in field_writes:
+                register_data = insert(field_uid, register_data, field_data)
+            register_uid_list.append(register_uid)
+            register_data_list.append(register_data)
+        return register_uid_list, register_data_list
+
+    def clear(self):
+        """Discards the pending field writes."""
+        self._field_writes = collections.OrderedDict()
@@ -0,0 +1,108 @@
+"""This file is used for the gRPC channel pool of the Semi Device Control API.
+
+The channels to the instrument gRPC device servers are created once per address and port and
+reused by all the interfaces and calls, instead of opening a new connection for every
+instrument session. The channels of the pool are closed explicitly when the device control
+session is stopped or destroyed. The pool hands out SharedGrpcChannel wrappers, so a holder
+closing its channel does not close it for the other holders.
+"""
+import threading
+
+
+class GrpcChannelPool:
+    """This class holds the gRPC channels of the device servers by address and port."""
+
+    def __init__(
+        self,
+        keepalive_time_ms=None,
+        keepalive_timeout_ms=None,
+        max_message_length=None,
+        options=None,
+    ):
+        """Creates the empty channel pool.
+
+        Args:
+            keepalive_time_ms: {int} interval of the keepalive pings, if not specified, the
+                gRPC default is used
+            keepalive_timeout_ms: {int} timeout of the keepalive pings, if not specified, the
+                gRPC default is used
+            max_message_length: {int} maximum size of the sent and received messages in bytes,
+                -1 for unlimited, if not specified, the gRPC default is used
+            options: {list of tuple} additional gRPC channel options (name, value)
+        """
+        channel_options = []
+        if keepalive_time_ms is not None:
+            channel_options.append(("grpc.keepalive_time_ms", keepalive_time_ms))
+        if keepalive_timeout_ms is not None:
+            channel_options.append(("grpc.keepalive_timeout_ms", keepalive_timeout_ms))
+        if max_message_length is not None:
+            channel_options.append(("grpc.max_send_message_length", max_message_length))
+            channel_options.append(("grpc.max_receive_message_length", max_message_length))
+        channel_options.extend(options or [])
+        self.options = channel_options
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Gets the number of open channels."""
+        return len(self._channels)
+
+    def get_channel(self, address, port):
+        """Gets the channel of a device server, creates it on first use.
+
+        Args:
+            address: {string}
+            port: {int}
+
+        Return:
+            SharedGrpcChannel
+        """
+        target = "{}:{}".format(address, port)
+        with self._lock:
+            channel = self._channels.get(target)
+            if channel is None:
+                import grpc
+
+                channel = self._channels[target] = SharedGrpcChannel(
+                    grpc.insecure_channel(target, options=self.options)
+                )
+            return channel
+
+    def close(self):
+        """Closes all the channels of the pool."""
+        with self._lock:
+            channels = list(self._channels.values())
+            self._channels = {}
+        for channel in channels:
+            channel.channel.close()
+
+
+class SharedGrpcChannel:
+    """This class wraps a pooled gRPC channel, the close by a holder of the channel is ignored.
+
+    All the other attributes are the ones of the grpc.Channel. The channel is closed by the
+    pool, when the device control session is stopped or destroyed.
+    """
+
+    def __init__(self, channel):
+        """Wraps the pooled channel.
+
+        Args:
+            channel: {grpc.Channel}
+        """
+        self.channel = channel
+
+    def __getattr__(self, name):
+        """Gets the attribute of the pooled channel."""
+        return getattr(self.channel, name)
+
+    def __enter__(self):
+        """Returns the shared channel, it stays open on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Keeps the pooled channel open."""
+        return False
+
+    def close(self):
+        """Keeps the pooled channel open, it is closed by the pool."""
@@ -0,0 +1,226 @@
+"""This file is used for the instrumentation of the Semi Device Control session calls.
+
+The backend session of SemiconductorDeviceControl is wrapped in an InstrumentedSession,
+which reports every call made on the backend session to the session observers. When no
+observer is configured the backend session is not wrapped, so the instrumentation has no
+overhead when it is disabled. An observer failure is reported as a warning, it never changes
+the result or the exception of the call.
+"""
+import bisect
+import collections
+import threading
+import time
+import warnings
+
+# Upper bounds of the latency histogram buckets in seconds, the last bucket is unbounded.
+HISTOGRAM_BUCKET_BOUNDS = (
+    1e-6,
+    2e-6,
+    5e-6,
+    1e-5,
+    2e-5,
+    5e-5,
+    1e-4,
+    2e-4,
+    5e-4,
+    1e-3,
+    2e-3,
+    5e-3,
+    1e-2,
+    2e-2,
+    5e-2,
+    1e-1,
+    2e-1,
+    5e-1,
+    1.0,
+    2.0,
+    5.0,
+    10.0,
+)
+_HISTOGRAM_BUCKET_BOUNDS_NS = tuple(int(bound * 1e9) for bound in HISTOGRAM_BUCKET_BOUNDS)
+
+MethodStatistics = collections.namedtuple(
+    "MethodStatistics",
+    ["calls", "total_time", "min_time", "max_time", "histogram", "elements", "exceptions"],
+)
+MethodStatistics.__doc__ = """Statistics of a backend session method, the times are in seconds.
+
+The histogram is a tuple of call counts, one per bucket of HISTOGRAM_BUCKET_BOUNDS plus
+one for the calls slower than the last bound. The elements are the number of registers,
+fields or data values transferred by the calls.
+"""
+
+
+def element_count(value):
+    """Gets the number of elements transferred by a call argument or result.
+
+    Args:
+        value: {object}
+
+    Return:
+        int
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (str, bytes)):
+        return 1
+    if isinstance(value, (list, tuple)):
+        return len(value)
+    length = getattr(value, "Length", None)
+    if isinstance(length, int):
+        return length
+    return 1
+
+
+def unwrap_session(session):
+    """Gets the backend session wrapped by the InstrumentedSession, if any.
+
+    Args:
+        session: {object}
+
+    Return:
+        The backend session {object}
+    """
+    while isinstance(session, InstrumentedSession):
+        session = session.target
+    return session
+
+
+class InstrumentedSession:
+    """This class wraps a backend session and reports every call to the session observers.
+
+    An observer provides the method on_call(method_name, args, result, start_time,
+    elapsed_time, exception), the times are in nanoseconds from time.perf_counter_ns.
+    """
+
+    def __init__(self, target, observers):
+        """Wraps the backend session.
+
+        Args:
+            target: {object} backend session
+            observers: {list of observer}
+        """
+        self.target = target
+        self.observers = tuple(observers)
+
+    def __getattr__(self, name):
+        """Gets the attribute of the backend session, its methods report their calls."""
+        attribute = getattr(self.target, name)
+        if not callable(attribute):
+            return attribute
+
+        observers = self.observers
+
+        def observed_call(*args):
+            start_time = time.perf_counter_ns()
+            try:
+                result = attribute(*args)
+            except Exception as e:
+                elapsed_time = time.perf_counter_ns() - start_time
+                _notify_observers(observers, name, args, None, start_time, elapsed_time, e)
+                raise
+            elapsed_time = time.perf_counter_ns() - start_time
+            _notify_observers(observers, name, args, result, start_time, elapsed_time, None)
+            return result
+
+        self.__dict__[name] = observed_call
+        return observed_call
+
+
+def _notify_observers(observers, *call):
+    for observer in observers:
+        try:
+            observer.on_call(*call)
+        except Exception as e:
+            warnings.warn(
+                "Session observer {} failed on {}: {}: {}".format(
+                    type(observer).__name__, call[0], type(e).__name__, e
+                ),
+                RuntimeWarning,
+                stacklevel=3,
+            )
+
+
+class _MethodCounters:
+    __slots__ = (
+        "calls",
+        "total_time",
+        "min_time",
+        "max_time",
+        "histogram",
+        "elements",
+        "exceptions",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.total_time = 0
+        self.min_time = None
+        self.max_time = 0
+        self.histogram = [0] * (len(HISTOGRAM_BUCKET_BOUNDS) + 1)
+        self.elements = 0
+        self.exceptions = 0
+
+
+class Instrumentation:
+    """This class records the call counts, latencies and transferred elements per method."""
+
+    def __init__(self):
+        """Creates the instrumentation with no recorded calls."""
+        self._lock = threading.Lock()
+        self._counters = {}
+
+    def on_call(self, method_name, args, result, start_time, elapsed_time, exception):
+        """Records a call of the backend session.
+
+        Args:
+            method_name: {string}
+            args: {tuple}
+            result: {object}
+            start_time: {int} in nanoseconds
+            elapsed_time: {int} in nanoseconds
+            exception: {Exception} None if the call succeeded
+        """
+        elements = element_count(result) if exception is None else 0
+        for arg in args:
+            elements = max(elements, element_count(arg))
+
+        with self._lock:
+            counters = self._counters.get(method_name)
+            if counters is None:
+                counters = self._counters[method_name] = _MethodCounters()
+            counters.calls += 1
+            counters.total_time += elapsed_time
+            if counters.min_time is None or elapsed_time < counters.min_time:
+                counters.min_time = elapsed_time
+            if elapsed_time > counters.max_time:
+                counters.max_time = elapsed_time
+            counters.histogram[bisect.bisect_left(_HISTOGRAM_BUCKET_BOUNDS_NS, elapsed_time)] += 1
+            counters.elements += elements
+            if exception is not None:
+                counters.exceptions += 1
+
+    def snapshot(self):
+        """Gets the statistics recorded since the creation or the last reset.
+
+        Return:
+            {dict of method name: MethodStatistics}
+        """
+        with self._lock:
+            return {
+                method_name: MethodStatistics(
+                    counters.calls,
+                    counters.total_time / 1e9,
+                    (counters.min_time or 0) / 1e9,
+                    counters.max_time / 1e9,
+                    tuple(counters.histogram),
+                    counters.elements,
+                    counters.exceptions,
+                )
+                for method_name, counters in self._counters.items()
+            }
+
+    def reset(self):
+        """Clears the recorded statistics."""
+        with self._lock:
+            self._counters = {}
@@ -0,0 +1,91 @@
+"""This file is used for the interface metadata cache of the Semi Device Control API.
+
+The interface details, instrument session IDs and gRPC session options of the session are
+read from the session once and kept until the session is stopped, destroyed or attached
+again, so the per test step lookups do not query the session.
+"""
+import collections
+
+GrpcSessionDetails = collections.namedtuple(
+    "GrpcSessionDetails", ["session_name", "resource_name", "address", "port"]
+)
+GrpcSessionDetails.__doc__ = """gRPC session options of an interface, without the channel."""
+
+
+class InterfaceMetadataCache:
+    """This class holds the interface metadata of a session."""
+
+    def __init__(self):
+        """Creates the empty interface metadata cache."""
+        self.clear()
+
+    def get_interface_details(self, session):
+        """Gets the names and types of the interfaces, from the session on first use.
+
+        Args:
+            session: {object} backend session
+
+        Return:
+            Tuple {tuple of string - interface names, tuple of string - interface types}
+        """
+        if self.interface_details is None:
+            interface_names = []
+            interface_types = []
+            for interface in session.GetInterfaceDetails():
+                interface_names.append(interface.Name)
+                interface_types.append(interface.Type)
+            self.set_interface_details(interface_names, interface_types)
+        return self.interface_details
+
+    def set_interface_details(self, interface_names, interface_types):
+        """Sets the names and types of the interfaces.
+
+        Args:
+            interface_names: {list of string}
+            interface_types: {list of string}
+        """
+        self.interface_details = (tuple(interface_names), tuple(interface_types))
+
+    def get_session_id(self, session, interface_name):
+        """Gets the instrument session ID of an interface, from the session on first use.
+
+        Args:
+            session: {object} backend session
+            interface_name: {string}
+
+        Return:
+            int {session ID}
+        """
+        session_id = self._session_ids.get(interface_name)
+        if session_id is None:
+            session_id = self._session_ids[interface_name] = session.GetInterfaceSessionID(
+                interface_name
+            )
+        return session_id
+
+    def get_grpc_session_details(self, session, interface_name):
+        """Gets the gRPC session options of an interface, from the session on first use.
+
+        Args:
+            session: {object} backend session
+            interface_name: {string}
+
+        Return:
+            GrpcSessionDetails
+        """
+        grpc_session_details = self._grpc_session_details.get(interface_name)
+        if grpc_session_details is None:
+            grpc_session_options = session.GetGrpcSessionOptions(interface_name)
+            grpc_session_details = self._grpc_session_details[interface_name] = GrpcSessionDetails(
+                grpc_session_options.SessionName,
+                grpc_session_options.ResourceName,
+                grpc_session_options.Address,
+                grpc_session_options.Port,
+            )
+        return grpc_session_details
+
+    def clear(self):
+        """Discards the metadata of all the interfaces."""
+        self.interface_details = None
+        self._session_ids = {}
+        self._grpc_session_details = {}
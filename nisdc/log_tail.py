@@ -0,0 +1,100 @@
+"""This file is used for the incremental log tail of the Semi Device Control API.
+
+The log of the session is read with a cursor: only the rows added since the last read are
+converted to Python, and the converted rows are kept in a bounded ring buffer. If the log of
+the session is cleared or drops its oldest rows, the cursor is moved after the last rows seen.
+
+The session does not expose the total number of rows logged, so the last rows seen are found
+by content: the last LOG_MATCH_WINDOW rows read must match, searched back from the cursor,
+which costs about one row conversion per row dropped from the log since the last read. If
+the log repeats the same LOG_MATCH_WINDOW rows, for example the same transaction logged over
+and over, and drops rows at the same time, the cursor can be moved to a later repetition and
+rows are missed.
+"""
+import collections
+
+DEFAULT_LOG_CAPACITY = 10000
+LOG_MATCH_WINDOW = 4
+
+
+def _get_row_count(logs):
+    if getattr(logs, "Rank", 1) == 2:
+        return logs.GetLength(0)
+    return len(logs)
+
+
+def _get_row(logs, row_index):
+    if getattr(logs, "Rank", 1) == 2:
+        return [str(logs[row_index, column]) for column in range(logs.GetLength(1))]
+    return [str(value) for value in logs[row_index]]
+
+
+class LogTail:
+    """This class holds the cursor of the session log and the last rows read."""
+
+    def __init__(self, capacity=DEFAULT_LOG_CAPACITY):
+        """Creates the log tail at the start of the log.
+
+        Args:
+            capacity: {int} maximum number of rows kept in the ring buffer
+        """
+        self.entries = collections.deque(maxlen=capacity)
+        self.cursor = 0
+        self.total_entries = 0
+        self._last_entries = collections.deque(maxlen=LOG_MATCH_WINDOW)
+
+    def update(self, logs):
+        """Converts the rows of the log added since the last update.
+
+        Args:
+            logs: {2d array of strings} log of the session
+
+        Return:
+            new_entries {list of list of string}
+        """
+        row_count = _get_row_count(logs)
+        start = self._get_start(logs, row_count)
+        new_entries = [_get_row(logs, row_index) for row_index in range(start, row_count)]
+        if new_entries:
+            self.entries.extend(new_entries)
+            self.total_entries += len(new_entries)
+            self._last_entries.extend(new_entries[-LOG_MATCH_WINDOW:])
+        self.cursor = row_count
+        return new_entries
+
+    def set_capacity(self, capacity):
+        """Sets the maximum number of rows kept in the ring buffer, keeping the last rows.
+
+        Args:
+            capacity: {int}
+        """
+        self.entries = collections.deque(self.entries, maxlen=capacity)
+
+    def clear(self):
+        """Moves the cursor to the start of the log and discards the rows read."""
+        self.entries.clear()
+        self.cursor = 0
+        self.total_entries = 0
+        self._last_entries.clear()
+
+    def _get_start(self, logs, row_count):
+        last_entries = list(reversed(self._last_entries))
+        if not last_entries:
+            return 0
+        rows = {}
+
+        def get_row(row_index):
+            row = rows.get(row_index)
+            if row is None:
+                row = rows[row_index] = _get_row(logs, row_index)
+            return row
+
+        # The log may have dropped its oldest rows or been cleared since the last read, the
+        # last rows seen end at the cursor or before it.
+        for end in range(min(self.cursor, row_count), 0, -1):
+            if all(
+                get_row(end - 1 - offset) == last_entry
+                for offset, last_entry in enumerate(last_entries[:end])
+            ):
+                return end
+        return 0
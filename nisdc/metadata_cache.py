@@ -0,0 +1,192 @@
+"""This file is used for the on-disk metadata cache of the Semi Device Control API.
+
+The metadata of a session (register and field UIDs, register addresses, interface details
+and field definitions) is stored in a binary file keyed by the hash of the contents of the
+sdconfig file and of its register map. A new process loads the metadata from the file
+instead of reading it from the session and converting it again.
+"""
+import collections
+import hashlib
+import marshal
+import os
+import tempfile
+
+from nisdc.register_map_index import get_register_map_path
+
+_FILE_MAGIC = b"NISDCMD1"
+_FILE_HEADER_SIZE = len(_FILE_MAGIC) + 1
+
+DeviceStateKeys = collections.namedtuple("DeviceStateKeys", ["RegisterUIDs", "FieldUIDs"])
+DeviceStateKeys.__doc__ = """Register and field UIDs, like the device state keys of the session."""
+
+SessionMetadata = collections.namedtuple(
+    "SessionMetadata",
+    [
+        "register_uids",
+        "field_uids",
+        "register_addresses",
+        "interface_names",
+        "interface_types",
+        "field_definitions",
+    ],
+)
+SessionMetadata.__doc__ = """Metadata of a device control session.
+
+The register_addresses are in the order of the register_uids. The field_definitions map
+the field UIDs to (display values, values, size), it is empty if the field definitions are
+not cached.
+"""
+
+
+def get_default_cache_directory():
+    """Gets the default directory of the metadata cache files.
+
+    The NISDC_METADATA_CACHE_DIR environment variable overrides the default directory.
+
+    Return:
+        string
+    """
+    directory = os.environ.get("NISDC_METADATA_CACHE_DIR")
+    if directory:
+        return directory
+    base_directory = os.environ.get("LOCALAPPDATA") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    if not os.path.isdir(base_directory):
+        base_directory = tempfile.gettempdir()
+    return os.path.join(base_directory, "nisdc", "metadata")
+
+
+def get_metadata_cache_key(sdconfig_path):
+    """Gets the cache key of the metadata of an sdconfig.
+
+    The key is the hash of the contents of the sdconfig file and of its register map file.
+    The metadata must not be cached if the register map file is not found, as a change of
+    the register map would not change the key.
+
+    Args:
+        sdconfig_path: {string}
+
+    Return:
+        string - hexadecimal SHA-256 hash, None if the register map file is not found or
+            cannot be read
+    """
+    metadata_hash = hashlib.sha256(_FILE_MAGIC)
+    try:
+        paths = [sdconfig_path, get_register_map_path(sdconfig_path)]
+    except (OSError, KeyError, ValueError):
+        return None
+    for path in paths:
+        try:
+            with open(path, "rb") as hashed_file:
+                for chunk in iter(lambda: hashed_file.read(1 << 20), b""):
+                    metadata_hash.update(chunk)
+        except OSError:
+            return None
+    return metadata_hash.hexdigest()
+
+
+def read_session_metadata(session, include_field_definitions=True):
+    """Reads the metadata of a device control session.
+
+    Args:
+        session: {object} backend session
+        include_field_definitions: {bool} if True, the definition of every field is read
+
+    Return:
+        SessionMetadata
+    """
+    device_state_keys = session.GetDeviceStateKeys()
+    register_details = session.GetRegisterAddresses()
+    register_address_by_uid = {
+        str(register.UniqueID): int(register.Address) for register in register_details
+    }
+    register_uids = [str(register_uid) for register_uid in device_state_keys.RegisterUIDs]
+    field_uids = [str(field_uid) for field_uid in device_state_keys.FieldUIDs]
+    interface_details = list(session.GetInterfaceDetails())
+
+    field_definitions = {}
+    if include_field_definitions:
+        for field_uid in field_uids:
+            field_definition = session.GetFieldDefinitionDetails(field_uid)
+            field_definitions[field_uid] = (
+                [str(display_value) for display_value in field_definition.DisplayValues],
+                [int(value) for value in field_definition.Values],
+                int(field_definition.Size),
+            )
+
+    return SessionMetadata(
+        register_uids,
+        field_uids,
+        [register_address_by_uid[register_uid] for register_uid in register_uids],
+        [str(interface.Name) for interface in interface_details],
+        [str(interface.Type) for interface in interface_details],
+        field_definitions,
+    )
+
+
+class MetadataCache:
+    """This class stores the session metadata in files of a cache directory, by cache key."""
+
+    def __init__(self, directory=None):
+        """Creates the metadata cache.
+
+        Args:
+            directory: {string} if not specified, get_default_cache_directory is used
+        """
+        self.directory = directory or get_default_cache_directory()
+
+    def get_path(self, key):
+        """Gets the path of the cache file of a key.
+
+        Args:
+            key: {string}
+
+        Return:
+            string
+        """
+        return os.path.join(self.directory, key + ".nisdcmeta")
+
+    def load(self, key):
+        """Loads the metadata of a key.
+
+        Args:
+            key: {string}
+
+        Return:
+            SessionMetadata {None if the metadata is not cached or the file is not valid}
+        """
+        try:
+            with open(self.get_path(key), "rb") as cache_file:
+                header = cache_file.read(_FILE_HEADER_SIZE)
+                if header != _FILE_MAGIC + bytes((marshal.version,)):
+                    return None
+                return SessionMetadata(*marshal.load(cache_file))
+        except (OSError, ValueError, EOFError, TypeError, IndexError):
+            return None
+
+    def store(self, key, metadata):
+        """Stores the metadata of a key, replacing the cache file atomically.
+
+        Args:
+            key: {string}
+            metadata: {SessionMetadata}
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.get_path(key)
+        temporary_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(temporary_path, "wb") as cache_file:
+            cache_file.write(_FILE_MAGIC)
+            cache_file.write(bytes((marshal.version,)))
+            cache_file.write(marshal.dumps(tuple(metadata)))
+        os.replace(temporary_path, path)
+
+    def clear(self):
+        """Removes all the cache files."""
+        try:
+            file_names = os.listdir(self.directory)
+        except OSError:
+            return
+        for file_name in file_names:
+            if file_name.endswith(".nisdcmeta"):
+                os.remove(os.path.join(self.directory, file_name))
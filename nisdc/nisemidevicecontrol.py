@@ -1,31 +1,52 @@
 """This file is used for Semi Device Control API."""
+import contextlib
 import os
-import sys
-import grpc
+import time
+
+from nisdc.array_conversion import to_numpy_array, to_session_array
+from nisdc.backend import get_backend
+from nisdc.cache_mirror import CacheFlushResult, CacheMirror
+from nisdc.code_generator import DEFAULT_PACKAGE_NAME, generate_device_element_package
+from nisdc.dynamic_settings import DynamicSettingsTracker
+from nisdc.field_layout import extract_fields
+from nisdc.field_metadata import FieldMetadataCache
+from nisdc.field_write_planner import FieldWritePlanner
+from nisdc.grpc_channels import GrpcChannelPool
+from nisdc.interface_cache import InterfaceMetadataCache
+from nisdc.log_tail import DEFAULT_LOG_CAPACITY, LogTail
+from nisdc.metadata_cache import (
+    DeviceStateKeys,
+    MetadataCache,
+    get_metadata_cache_key,
+    read_session_metadata,
+)
+from nisdc.instrumentation import Instrumentation, InstrumentedSession, unwrap_session
+from nisdc.pin_states import PinStateShadow, get_write_pin_states_script
+from nisdc.prepared_batch import PreparedFieldBatch, PreparedRegisterBatch
+from nisdc.register_handles import RegisterHandleTable
+from nisdc.shadow_cache import ShadowRegisterCache
+from nisdc.trace import DEFAULT_TRACE_CAPACITY, TraceRecorder
+from nisdc.write_coalescing import (
+    DEFAULT_FLUSH_THRESHOLD,
+    WRITE_BY_ADDRESS,
+    WRITE_BY_NAME,
+    WriteCoalescer,
+)
 
-import clr
 # flake8: noqa
-device_control_path = (
-    "C:\\Program Files\\National Instruments\\" + "Semi Device Control")
 
-sys.path.append(os.path.dirname(os.getcwd()))
-sys.path.append(device_control_path)
 
-clr.AddReference("SemiconductorDeviceControl")
-from SemiconductorDeviceControl import SemiDeviceControlMain  # noqa:E402
-from SemiconductorDeviceControl import PinState  # noqa:E402
-
-def generate_class_string(element_type, device_element_list): 
+def generate_class_string(element_type, device_element_list):
     """This method generates the class string to be written to the auto generated file."""
     """Arguments: element_type {string},device_element_list {list}"""
     """Return: string - The entire string generated for the class """
     ipblock = ""
     registergroup = ""
-    class_content = ""
+    class_content = []
     class_string = "class "
     hyphen_delimiter = "-"
 
-    class_content += class_string + element_type + "():\n"
+    class_content.append(class_string + element_type + "():\n")
     for device_element in device_element_list:
         device_element_details = device_element.split(hyphen_delimiter)
         current_ipblock = device_element_details[0]
@@ -33,46 +54,89 @@ def generate_class_string(element_type, device_element_list):
         current_device_element = device_element_details[2]
 
         if current_ipblock != ipblock:
-            class_content += str.format(
-                "\t" + class_string + "{}():\n", current_ipblock
-            )
+            class_content.append(str.format("\t" + class_string + "{}():\n", current_ipblock))
             ipblock = current_ipblock
 
         if current_register_group != registergroup:
-            class_content += str.format(
-                "\t\t" + class_string + "{}():\n", current_register_group
+            class_content.append(
+                str.format("\t\t" + class_string + "{}():\n", current_register_group)
             )
             registergroup = current_register_group
 
-        class_content += str.format(
-            '\t\t\t{} = "{}"\n', current_device_element, device_element
+        class_content.append(
+            str.format('\t\t\t{} = "{}"\n', current_device_element, device_element)
         )
-    class_content += "\n\n"
-    return class_content
+    class_content.append("\n\n")
+    return "".join(class_content)
+
+
+# Scopes of _invalidate_session_state, each scope includes the previous ones.
+# A power supply pin of the device was written, the device registers may have been reset.
+_DEVICE_POWER = 0
+# The device registers, pins or settings may have changed, for example by a script.
+_DEVICE_STATE = 1
+# The device and the cache of the session were reset to the default state.
+_DEVICE_RESET = 2
+# The instrument sessions were started or stopped.
+_INSTRUMENT_SESSIONS = 3
+# The device control session was replaced or destroyed.
+_SESSION = 4
+
 
 class GrpcSessionOptions:
-    def __init__(self, session_name, resource_name, grpc_channel) :
+    def __init__(self, session_name, resource_name, grpc_channel):
         self.session_name = session_name
         self.resource_name = resource_name
         self.grpc_channel = grpc_channel
 
+
 class SemiconductorDeviceControl:
     """This class is used for Instrument Studio export configuration."""
 
-    def __init__(self, isconfigpath=None):
+    def __init__(self, isconfigpath=None, semidevicecontrol_main=None):
         """Create and return device control session using Instrument Studio export configuration.
 
         IS export configuration contains the register map and hardware configuration
         for Device Control.
 
         Args:
-            isconfigpath : the isconfig path. if not specified, the device control session will not be created.
+            isconfigpath : the isconfig path. if not specified, the device control session
+                will not be created.
+            semidevicecontrol_main : the main object used to create the device control session,
+                for example the SimulatedSemiDeviceControlMain from nisdc.simulation.
+                if not specified, the .NET SemiDeviceControlMain is used.
         """
         self.semidevicecontrol_main = None
         self.semidevicecontrol_session = None
+        self.isconfigpath = isconfigpath
+        self.session_metadata = None
+        self._pin_state_type = None
+        self._session_observers = []
+        self._instrumentation = None
+        self.trace_recorder = None
+        self.shadow_cache = None
+        self.register_map_index = None
+        self._register_handle_table = None
+        self._write_coalescer = None
+        self._cache_mirror = CacheMirror()
+        self.field_metadata = None
+        self.field_layouts = None
+        self._grouped_field_reads = False
+        self._field_write_merging = False
+        self._field_write_planner = None
+        self.grpc_channel_pool = GrpcChannelPool()
+        self.interface_metadata = InterfaceMetadataCache()
+        self.dynamic_settings = DynamicSettingsTracker()
+        self.pin_states = PinStateShadow()
+        self._power_pin_names = frozenset()
+        self.log_tail = LogTail()
 
         try:
-            self.semidevicecontrol_main = SemiDeviceControlMain()
+            if semidevicecontrol_main is None:
+                backend = get_backend()
+                semidevicecontrol_main = backend.SemiDeviceControlMain()
+                self._pin_state_type = backend.PinState
+            self.semidevicecontrol_main = semidevicecontrol_main
             if isconfigpath:
                 self.semidevicecontrol_session = (
                     self.semidevicecontrol_main.CreateSemiDeviceControlSession(isconfigpath)
@@ -81,34 +145,48 @@ class SemiconductorDeviceControl:
         except Exception as e:
             print("Exception in accessing conf: {}".format(e))
             raise e
-        
+
     def attach_to_existing_session(self):
-        """Returns the instantiated device control session if any
-        """
+        """Returns the instantiated device control session if any"""
         try:
-            self.semidevicecontrol_session = self.semidevicecontrol_main.AttachToExistingSession()
+            self._invalidate_session_state(_SESSION)
+            self.semidevicecontrol_session = self._observe_session(
+                self.semidevicecontrol_main.AttachToExistingSession()
+            )
             return self
-        
+
         except Exception as e:
-            print("Error occurred while attaching to the instantiated semi device control session: {}".foramat(e))
+            print(
+                "Error occurred while attaching to the instantiated semi device control session: "
+                "{}".format(e)
+            )
             raise e
 
     def start(self):
         """Description:.
 
         Starts the Instrument/Hardware sessions configured for the device control
-        through the IS export configuration.
+        through the IS export configuration. The register cache is cleared.
         """
         try:
+            self._invalidate_session_state(_INSTRUMENT_SESSIONS)
             self.semidevicecontrol_session.Start()
+            self.semidevicecontrol_session.ClearCache()
+            self._cache_mirror.clear()
 
         except Exception as e:
             print("Exception in start(): {}".format(e))
             raise e
 
     def stop(self):
-        """Stops the Instrument/Hardware sessions configured for the device control."""
+        """Stops the Instrument/Hardware sessions configured for the device control.
+
+        The register cache is cleared.
+        """
         try:
+            self._invalidate_session_state(_INSTRUMENT_SESSIONS)
+            self.semidevicecontrol_session.ClearCache()
+            self._cache_mirror.clear()
             self.semidevicecontrol_session.Stop()
 
         except Exception as e:
@@ -121,8 +199,9 @@ class SemiconductorDeviceControl:
         Deallocates the reserved reference and data in memory.
         """
         try:
+            self._invalidate_session_state(_SESSION)
             self.semidevicecontrol_main.DestroySemiDeviceControlSession(
-                self.semidevicecontrol_session
+                unwrap_session(self.semidevicecontrol_session)
             )
 
         except Exception as e:
@@ -144,17 +223,20 @@ class SemiconductorDeviceControl:
 
         """
         try:
-            self.semidevicecontrol_session.WriteRegisterByName_Device(
-                register_uid, register_data
-            )
+            if self._write_coalescer is not None:
+                self._queue_register_writes_by_name([register_uid], [register_data])
+                return
+
+            self._flush_queued_writes()
+            self.semidevicecontrol_session.WriteRegisterByName_Device(register_uid, register_data)
+            if self.shadow_cache is not None:
+                self.shadow_cache.update(register_uid, register_data)
 
         except Exception as e:
             print("")
             raise e
 
-    def write_multi_register_by_name_device(
-        self, register_uid_list, register_data_list
-    ):
+    def write_multi_register_by_name_device(self, register_uid_list, register_data_list):
         """Writes data to multiple registers on the device using the register unique name.
 
         Register UID: Unique name for the register in the format.
@@ -168,17 +250,22 @@ class SemiconductorDeviceControl:
             register_data_list: {list of int}
         """
         try:
+            if self._write_coalescer is not None:
+                self._queue_register_writes_by_name(register_uid_list, register_data_list)
+                return
+
+            self._flush_queued_writes()
             self.semidevicecontrol_session.WriteMultipleRegistersByName_Device(
                 register_uid_list, register_data_list
             )
+            if self.shadow_cache is not None:
+                self.shadow_cache.update_multiple(register_uid_list, register_data_list)
 
         except Exception as e:
             print("")
             raise e
 
-    def write_register_by_address_device(
-        self, ip_block_name, register_address, register_data
-    ):
+    def write_register_by_address_device(self, ip_block_name, register_address, register_data):
         """Writes the data to the device using the register address and IP block name.
 
         Register address: Address of the register from register map.
@@ -191,9 +278,20 @@ class SemiconductorDeviceControl:
             register_data: {int} register data
         """
         try:
+            if self._write_coalescer is not None:
+                self._queue_register_writes_by_address(
+                    [ip_block_name], [register_address], [register_data]
+                )
+                return
+
+            self._flush_queued_writes()
             self.semidevicecontrol_session.WriteRegisterByAddress_Device(
                 ip_block_name, register_address, register_data
             )
+            if self.shadow_cache is not None:
+                self._update_shadow_cache_by_address(
+                    [ip_block_name], [register_address], [register_data]
+                )
 
         except Exception as e:
             print("")
@@ -219,9 +317,20 @@ class SemiconductorDeviceControl:
             register_data_list: list of int
         """
         try:
+            if self._write_coalescer is not None:
+                self._queue_register_writes_by_address(
+                    ip_block_name_list, register_address_list, register_data_list
+                )
+                return
+
+            self._flush_queued_writes()
             self.semidevicecontrol_session.WriteMultipleRegistersByAddress_Device(
                 ip_block_name_list, register_address_list, register_data_list
             )
+            if self.shadow_cache is not None:
+                self._update_shadow_cache_by_address(
+                    ip_block_name_list, register_address_list, register_data_list
+                )
 
         except Exception as e:
             print("")
@@ -259,6 +368,8 @@ class SemiconductorDeviceControl:
             protocol_name: {string}
         """
         try:
+            self._flush_queued_writes()
+            self._invalidate_shadow_cache()
             self.semidevicecontrol_session.WriteCustomRegisterByAddress_Device(
                 register_address,
                 address_size,
@@ -285,9 +396,15 @@ class SemiconductorDeviceControl:
             register_data : {int}
         """
         try:
-            register_data = self.semidevicecontrol_session.ReadRegisterByName_Device(
-                register_uid
-            )
+            self._flush_queued_writes()
+            if self.shadow_cache is not None:
+                register_data = self.shadow_cache.get(register_uid)
+                if register_data is not None:
+                    return register_data
+
+            register_data = self.semidevicecontrol_session.ReadRegisterByName_Device(register_uid)
+            if self.shadow_cache is not None:
+                self.shadow_cache.update(register_uid, register_data)
             return register_data
 
         except Exception as e:
@@ -311,10 +428,12 @@ class SemiconductorDeviceControl:
             register_data_list : {list of int}
         """
         try:
-            register_data_list = (
-                self.semidevicecontrol_session.ReadMultipleRegistersByName_Device(
-                    register_uid_list
-                )
+            self._flush_queued_writes()
+            if self.shadow_cache is not None:
+                return self._read_multi_register_through_shadow_cache(register_uid_list)
+
+            register_data_list = self.semidevicecontrol_session.ReadMultipleRegistersByName_Device(
+                register_uid_list
             )
             return register_data_list
 
@@ -337,18 +456,27 @@ class SemiconductorDeviceControl:
             register_data : {int}
         """
         try:
+            self._flush_queued_writes()
+            register_uid = None
+            if self.shadow_cache is not None:
+                register_uid = self._find_register_uid(ip_block_name, register_address)
+            if register_uid is not None:
+                register_data = self.shadow_cache.get(register_uid)
+                if register_data is not None:
+                    return register_data
+
             register_data = self.semidevicecontrol_session.ReadRegisterByAddress_Device(
                 ip_block_name, register_address
             )
+            if register_uid is not None:
+                self.shadow_cache.update(register_uid, register_data)
             return register_data
 
         except Exception as e:
             print("")
             raise e
 
-    def read_multi_register_by_address_device(
-        self, ip_block_name_list, register_address_list
-    ):
+    def read_multi_register_by_address_device(self, ip_block_name_list, register_address_list):
         """Reads data from multiple registers on the device.
 
         Using the register address and IP block name.
@@ -369,6 +497,14 @@ class SemiconductorDeviceControl:
             register_data_list : {list of int}
         """
         try:
+            self._flush_queued_writes()
+            if self.shadow_cache is not None:
+                register_uid_list = list(
+                    map(self._find_register_uid, ip_block_name_list, register_address_list)
+                )
+                if None not in register_uid_list:
+                    return self._read_multi_register_through_shadow_cache(register_uid_list)
+
             register_data_list = (
                 self.semidevicecontrol_session.ReadMultipleRegistersByAddress_Device(
                     ip_block_name_list, register_address_list
@@ -413,14 +549,13 @@ class SemiconductorDeviceControl:
             register_data: {int}
         """
         try:
-            register_data = (
-                self.semidevicecontrol_session.ReadCustomRegisterByAddress_Device(
-                    register_address,
-                    address_size,
-                    register_size,
-                    interface_name,
-                    protocol_name,
-                )
+            self._flush_queued_writes()
+            register_data = self.semidevicecontrol_session.ReadCustomRegisterByAddress_Device(
+                register_address,
+                address_size,
+                register_size,
+                interface_name,
+                protocol_name,
             )
             return register_data
 
@@ -436,11 +571,15 @@ class SemiconductorDeviceControl:
             register_address_list: {list of int
         """
         try:
+            if self.session_metadata is not None:
+                return (
+                    list(self.session_metadata.register_uids),
+                    list(self.session_metadata.register_addresses),
+                )
+
             register_details = self.semidevicecontrol_session.GetRegisterAddresses()
             register_uid_list = list(register.UniqueID for register in register_details)
-            register_address_list = list(
-                register.Address for register in register_details
-            )
+            register_address_list = list(register.Address for register in register_details)
             return register_uid_list, register_address_list
 
         except Exception as e:
@@ -461,9 +600,14 @@ class SemiconductorDeviceControl:
             field_data :{int}
         """
         try:
-            self.semidevicecontrol_session.WriteFieldByName_Device(
-                field_uid, field_data
-            )
+            if self._can_merge_field_writes((field_uid,)):
+                self._write_fields_merged([field_uid], [field_data])
+                return
+
+            self._flush_queued_writes()
+            self.semidevicecontrol_session.WriteFieldByName_Device(field_uid, field_data)
+            if self.shadow_cache is not None:
+                self.shadow_cache.invalidate_register_group(field_uid)
 
         except Exception as e:
             print("")
@@ -485,9 +629,17 @@ class SemiconductorDeviceControl:
             field_data_list: {list of int}
         """
         try:
+            if self._can_merge_field_writes(field_uid_list):
+                self._write_fields_merged(field_uid_list, field_data_list)
+                return
+
+            self._flush_queued_writes()
             self.semidevicecontrol_session.WriteMultipleFieldsByName_Device(
                 field_uid_list, field_data_list
             )
+            if self.shadow_cache is not None:
+                for field_uid in field_uid_list:
+                    self.shadow_cache.invalidate_register_group(field_uid)
 
         except Exception as e:
             print("")
@@ -513,9 +665,17 @@ class SemiconductorDeviceControl:
             value_definition: {string}
         """
         try:
+            field_data = self._get_field_value(field_uid, value_definition)
+            if field_data is not None:
+                self.write_field_by_name_device(field_uid, field_data)
+                return
+
+            self._flush_queued_writes()
             self.semidevicecontrol_session.WriteFieldByValueDefinition_Device(
                 field_uid, value_definition
             )
+            if self.shadow_cache is not None:
+                self.shadow_cache.invalidate_register_group(field_uid)
 
         except Exception as e:
             print("")
@@ -535,9 +695,8 @@ class SemiconductorDeviceControl:
             field_data: {int}
         """
         try:
-            field_data = self.semidevicecontrol_session.ReadFieldByName_Device(
-                field_uid
-            )
+            self._flush_queued_writes()
+            field_data = self.semidevicecontrol_session.ReadFieldByName_Device(field_uid)
             return field_data
 
         except Exception as e:
@@ -561,10 +720,12 @@ class SemiconductorDeviceControl:
             field_data_list: {list of int}
         """
         try:
-            field_data_list = (
-                self.semidevicecontrol_session.ReadMultipleFieldsByName_Device(
-                    field_uid_list
-                )
+            self._flush_queued_writes()
+            if self._grouped_field_reads:
+                return self._read_multi_field_by_register(field_uid_list)
+
+            field_data_list = self.semidevicecontrol_session.ReadMultipleFieldsByName_Device(
+                field_uid_list
             )
             return field_data_list
 
@@ -584,9 +745,15 @@ class SemiconductorDeviceControl:
             field_size {int}
         """
         try:
-            field_definition = self.semidevicecontrol_session.GetFieldDefinitionDetails(
-                field_uid
-            )
+            if self.field_metadata is not None:
+                field_metadata = self.field_metadata.get(self.semidevicecontrol_session, field_uid)
+                return (
+                    list(field_metadata.display_values),
+                    list(field_metadata.values),
+                    field_metadata.size,
+                )
+
+            field_definition = self.semidevicecontrol_session.GetFieldDefinitionDetails(field_uid)
             return (
                 list(field_definition.DisplayValues),
                 list(field_definition.Values),
@@ -611,9 +778,8 @@ class SemiconductorDeviceControl:
             register_data: {int}
         """
         try:
-            self.semidevicecontrol_session.WriteRegisterByName_Cache(
-                register_uid, register_data
-            )
+            self.semidevicecontrol_session.WriteRegisterByName_Cache(register_uid, register_data)
+            self._cache_mirror.record((register_uid,), (register_data,))
 
         except Exception as e:
             print("")
@@ -638,14 +804,13 @@ class SemiconductorDeviceControl:
             self.semidevicecontrol_session.WriteMultipleRegistersByName_Cache(
                 register_uid_list, register_data_list
             )
+            self._cache_mirror.record(register_uid_list, register_data_list)
 
         except Exception as e:
             print("")
             raise e
 
-    def write_register_by_address_cache(
-        self, ip_block_name, register_address, register_data
-    ):
+    def write_register_by_address_cache(self, ip_block_name, register_address, register_data):
         """Writes the data to the cache using the register address and IP block name.
 
         Register address: Address of the register from register map.
@@ -661,6 +826,9 @@ class SemiconductorDeviceControl:
             self.semidevicecontrol_session.WriteRegisterByAddress_Cache(
                 ip_block_name, register_address, register_data
             )
+            self._record_cache_writes_by_address(
+                (ip_block_name,), (register_address,), (register_data,)
+            )
 
         except Exception as e:
             print("")
@@ -690,6 +858,9 @@ class SemiconductorDeviceControl:
             self.semidevicecontrol_session.WriteMultipleRegistersByAddress_Cache(
                 ip_block_name_list, register_address_list, register_data_list
             )
+            self._record_cache_writes_by_address(
+                ip_block_name_list, register_address_list, register_data_list
+            )
 
         except Exception as e:
             print("")
@@ -709,9 +880,7 @@ class SemiconductorDeviceControl:
             register_data :{int}
         """
         try:
-            register_data = self.semidevicecontrol_session.ReadRegisterByName_Cache(
-                register_uid
-            )
+            register_data = self.semidevicecontrol_session.ReadRegisterByName_Cache(register_uid)
             return register_data
 
         except Exception as e:
@@ -735,10 +904,8 @@ class SemiconductorDeviceControl:
             register_data_list: {list of int}
         """
         try:
-            register_data_list = (
-                self.semidevicecontrol_session.ReadMultipleRegistersByName_Cache(
-                    register_uid_list
-                )
+            register_data_list = self.semidevicecontrol_session.ReadMultipleRegistersByName_Cache(
+                register_uid_list
             )
             return register_data_list
 
@@ -770,9 +937,7 @@ class SemiconductorDeviceControl:
             print("")
             raise e
 
-    def read_multi_register_by_address_cache(
-        self, ip_block_name_list, register_address_list
-    ):
+    def read_multi_register_by_address_cache(self, ip_block_name_list, register_address_list):
         """Reads data from multiple registers on the cache.
 
         Using the register address and IP block name.
@@ -793,10 +958,8 @@ class SemiconductorDeviceControl:
             register_data_list: {list of int}
         """
         try:
-            register_data_list = (
-                self.semidevicecontrol_session.ReadMultipleRegistersByAddress(
-                    ip_block_name_list, register_address_list
-                )
+            register_data_list = self.semidevicecontrol_session.ReadMultipleRegistersByAddress(
+                ip_block_name_list, register_address_list
             )
             return register_data_list
 
@@ -821,6 +984,7 @@ class SemiconductorDeviceControl:
         """
         try:
             self.semidevicecontrol_session.WriteFieldByName_Cache(field_uid, field_data)
+            self._cache_mirror.record_unknown()
 
         except Exception as e:
             print("")
@@ -845,6 +1009,7 @@ class SemiconductorDeviceControl:
             self.semidevicecontrol_session.WriteMultipleFieldsByName_Cache(
                 field_uid_list, field_data_list
             )
+            self._cache_mirror.record_unknown(len(field_uid_list))
 
         except Exception as e:
             print("")
@@ -870,9 +1035,15 @@ class SemiconductorDeviceControl:
             value_definition: {string}
         """
         try:
+            field_data = self._get_field_value(field_uid, value_definition)
+            if field_data is not None:
+                self.write_field_by_name_cache(field_uid, field_data)
+                return
+
             self.semidevicecontrol_session.WriteFieldByValueDefinition_Cache(
                 field_uid, value_definition
             )
+            self._cache_mirror.record_unknown()
 
         except Exception as e:
             print("")
@@ -917,10 +1088,8 @@ class SemiconductorDeviceControl:
             field_data_list: {list of int}
         """
         try:
-            field_data_list = (
-                self.semidevicecontrol_session.ReadMultipleFieldsByName_Cache(
-                    field_uid_list
-                )
+            field_data_list = self.semidevicecontrol_session.ReadMultipleFieldsByName_Cache(
+                field_uid_list
             )
             return field_data_list
 
@@ -931,15 +1100,64 @@ class SemiconductorDeviceControl:
     # ----------------------------- Field Cache -----------------------------
 
     # -------------------------------- Cache --------------------------------
-    def write_from_cache_to_device(self):
+    def write_from_cache_to_device(self, minimal_diff=False):
         """Writes all the cache register data to the device, in the order.
 
         It is stored in the cache memory. The cache will be auto cleared.
 
         After this operation.
+
+        If minimal_diff is True, the repeated writes to a register are collapsed to the
+        final value, and the writes of the value already on the device are dropped. The value
+        on the device is only known from the shadow cache: without enable_shadow_cache, or for
+        the volatile registers, every register of the cache is written, even if its value did
+        not change since the last write from cache to device. If the cache contains field
+        writes, the cache is written to the device as is.
+
+        Args:
+            minimal_diff: {bool}
+
+        Returns:
+            CacheFlushResult {cached_writes, register_writes, transactions_saved}
         """
         try:
-            self.semidevicecontrol_session.WriteFromCacheToDevice()
+            self._flush_queued_writes()
+            cache_mirror = self._cache_mirror
+            if minimal_diff and cache_mirror.complete:
+                register_uid_list, register_data_list = cache_mirror.plan(
+                    self.shadow_cache.get
+                    if self.shadow_cache is not None
+                    else lambda register_uid: None
+                )
+                if register_uid_list:
+                    self.semidevicecontrol_session.WriteMultipleRegistersByName_Device(
+                        register_uid_list, register_data_list
+                    )
+                self.semidevicecontrol_session.ClearCache()
+                register_writes = len(register_uid_list)
+            else:
+                self.semidevicecontrol_session.WriteFromCacheToDevice()
+                if cache_mirror.complete:
+                    # The cache holds the last value of every register written to it.
+                    register_writes = len(cache_mirror.register_data)
+                else:
+                    register_writes = cache_mirror.write_count
+
+            if self.shadow_cache is not None:
+                if cache_mirror.complete:
+                    self.shadow_cache.update_multiple(
+                        cache_mirror.register_data.keys(), cache_mirror.register_data.values()
+                    )
+                else:
+                    self.shadow_cache.invalidate()
+
+            cache_flush_result = CacheFlushResult(
+                cache_mirror.write_count,
+                register_writes,
+                cache_mirror.write_count - register_writes,
+            )
+            cache_mirror.clear()
+            return cache_flush_result
 
         except Exception as e:
             print("Exception in writing software cache to hardware")
@@ -949,6 +1167,7 @@ class SemiconductorDeviceControl:
         """Clears all the cache register data from the device control session."""
         try:
             self.semidevicecontrol_session.ClearCache()
+            self._cache_mirror.clear()
 
         except Exception as e:
             print("Exception in flush software cache")
@@ -969,8 +1188,10 @@ class SemiconductorDeviceControl:
             pin_state: {int}
         """
         try:
-            pin_state = self.semidevicecontrol_session.ReadPinState(pin_name)
-            return int(pin_state)
+            self._flush_queued_writes()
+            pin_state = int(self.semidevicecontrol_session.ReadPinState(pin_name))
+            self.pin_states.set(pin_name, pin_state)
+            return pin_state
 
         except Exception as e:
             print("Exception occured at read pin state")
@@ -990,12 +1211,79 @@ class SemiconductorDeviceControl:
             2-Terminate, 1=High, 0-Low.
         """
         try:
-            self.semidevicecontrol_session.WritePinState(pin_name, PinState(pin_state))
+            if self._pin_state_type is None:
+                self._pin_state_type = (
+                    getattr(self.semidevicecontrol_main, "PinState", None) or get_backend().PinState
+                )
+            self._prepare_pin_writes((pin_name,))
+            self.pin_states.discard(pin_name)
+            self.semidevicecontrol_session.WritePinState(pin_name, self._pin_state_type(pin_state))
+            self.pin_states.set(pin_name, int(pin_state))
 
         except Exception as e:
             print("Exception occured at write pin state")
             raise e
 
+    def read_pin_states(self, pin_names):
+        """Reads the pin states (High / Low / Terminate) of several pins.
+
+        Pin State corresponding int values.2-Terminate, 1=High, 0-Low.
+
+        Args:
+            pin_names: {list of string}
+
+        Return:
+            pin_states: {list of int}
+        """
+        try:
+            self._flush_queued_writes()
+            session = self.semidevicecontrol_session
+            pin_states = [int(session.ReadPinState(pin_name)) for pin_name in pin_names]
+            for pin_name, pin_state in zip(pin_names, pin_states):
+                self.pin_states.set(pin_name, pin_state)
+            return pin_states
+
+        except Exception as e:
+            print("Exception occured at read pin states")
+            raise e
+
+    def write_pin_states(self, pin_states):
+        """Puts several pins to High / Low / Terminate state.
+
+        The pin states are compared with the last known states and only the changed pins are
+        written, in the order of the dict. Several changed pins are written with one script
+        command of writedio lines. Writing a power pin given to enable_shadow_cache discards
+        the shadow register cache.
+
+        Args:
+            pin_states: {dict of pin name: pin state {int}}
+
+            Pin State corresponding int values.
+
+            2-Terminate, 1=High, 0-Low.
+
+        Return:
+            changed_pin_names {list of string}
+        """
+        try:
+            changed_pin_states = self.pin_states.get_changed(pin_states)
+            if len(changed_pin_states) == 1:
+                self.write_pin_state(*changed_pin_states[0])
+            elif changed_pin_states:
+                self._prepare_pin_writes([pin_name for pin_name, _ in changed_pin_states])
+                for pin_name, _ in changed_pin_states:
+                    self.pin_states.discard(pin_name)
+                self.semidevicecontrol_session.ExecuteScriptCommand(
+                    get_write_pin_states_script(changed_pin_states), True
+                )
+                for pin_name, pin_state in changed_pin_states:
+                    self.pin_states.set(pin_name, pin_state)
+            return [pin_name for pin_name, _ in changed_pin_states]
+
+        except Exception as e:
+            print("Exception occured at write pin states")
+            raise e
+
     # -------------------------------- SCRIPTS ------------------------------
     def execute_script(self, file_name, wait_until_complete=True):
         """Executes the script using the Script Name provided as a input.
@@ -1018,9 +1306,8 @@ class SemiconductorDeviceControl:
             Executed from the script in JSON format {list of string}
         """
         try:
-            return self.semidevicecontrol_session.ExecuteScript(
-                file_name, wait_until_complete
-            )
+            self._invalidate_session_state(_DEVICE_STATE)
+            return self.semidevicecontrol_session.ExecuteScript(file_name, wait_until_complete)
 
         except Exception as e:
             print("Exception occured at execute script")
@@ -1043,6 +1330,7 @@ class SemiconductorDeviceControl:
             Executed from the script in JSON format {list of string}.
         """
         try:
+            self._invalidate_session_state(_DEVICE_STATE)
             return self.semidevicecontrol_session.ExecuteScriptCommand(
                 script_string, wait_until_complete
             )
@@ -1054,6 +1342,7 @@ class SemiconductorDeviceControl:
     def abort_script(self):
         """Abort Script will abort the current running script on the semi device control session."""
         try:
+            self._invalidate_session_state(_DEVICE_STATE)
             self.semidevicecontrol_session.AbortScript()
 
         except Exception as e:
@@ -1068,6 +1357,7 @@ class SemiconductorDeviceControl:
             logs {2d array of strings}
         """
         try:
+            self._flush_queued_writes()
             logs = self.semidevicecontrol_session.GetLogs()
             return logs
 
@@ -1075,9 +1365,67 @@ class SemiconductorDeviceControl:
             print("Exception occured at log function")
             raise e
 
+    def get_new_logs(self):
+        """Gets the log entries added since the last call.
+
+        Only the new rows are converted, the rows are also kept in the ring buffer of
+        log_tail, refer get_recent_logs.
+
+        Returns:
+            logs {list of list of strings}
+        """
+        try:
+            self._flush_queued_writes()
+            return self.log_tail.update(self.semidevicecontrol_session.GetLogs())
+
+        except Exception as e:
+            print("Exception occured at get new logs")
+            raise e
+
+    def get_recent_logs(self):
+        """Gets the last log entries read by get_new_logs, up to the log tail capacity.
+
+        Returns:
+            logs {list of list of strings}
+        """
+        return list(self.log_tail.entries)
+
+    def set_log_tail_capacity(self, capacity=DEFAULT_LOG_CAPACITY):
+        """Sets the number of log entries kept in the ring buffer.
+
+        The log entries already read are kept, up to the new capacity.
+
+        Args:
+            capacity: {int}
+        """
+        self.log_tail.set_capacity(capacity)
+
+    def tail_logs(self, poll_interval=1.0, stop_event=None):
+        """Yields the log entries as they are added to the log.
+
+        The log is polled with get_new_logs until the stop_event is set.
+
+        Args:
+            poll_interval: {float} seconds between the polls of the log
+            stop_event: {threading.Event} if not specified, the generator never stops
+
+        Yields:
+            log entry {list of strings}
+        """
+        while True:
+            for log_entry in self.get_new_logs():
+                yield log_entry
+            if stop_event is None:
+                time.sleep(poll_interval)
+            elif stop_event.wait(poll_interval):
+                for log_entry in self.get_new_logs():
+                    yield log_entry
+                return
+
     def reset_to_default_state(self):
         """Reset the device software register values and dio states to default."""
         try:
+            self._invalidate_session_state(_DEVICE_RESET)
             self.semidevicecontrol_session.ResetToDefaultState()
 
         except Exception as e:
@@ -1110,9 +1458,11 @@ class SemiconductorDeviceControl:
             setting_value {string}
         """
         try:
-            return self.semidevicecontrol_session.GetProtocolDynamicSetting(
+            setting_value = self.semidevicecontrol_session.GetProtocolDynamicSetting(
                 interface_name, protocol_name, setting_name
             )
+            self.dynamic_settings.set((interface_name, protocol_name, setting_name), setting_value)
+            return setting_value
 
         except Exception as e:
             print("Exception occured at get protocol settings")
@@ -1130,9 +1480,71 @@ class SemiconductorDeviceControl:
             setting_value: {string}
         """
         try:
+            self._flush_queued_writes()
+            setting_key = (interface_name, protocol_name, setting_name)
+            self.dynamic_settings.discard(setting_key)
             self.semidevicecontrol_session.SetProtocolDynamicSetting(
                 interface_name, protocol_name, setting_name, setting_value
             )
+            self.dynamic_settings.set(setting_key, setting_value)
+
+        except Exception as e:
+            print("Exception occured at update dynamic protocol settings")
+            raise e
+
+    def get_protocol_dynamic_settings(self, interface_name, protocol_name, setting_names):
+        """Gets the values of several dynamic protocol settings of the protocol.
+
+        The values set or read before are returned without querying the session.
+
+        Args:
+            interface_name: {string}
+            protocol_name: {string}
+            setting_names: {list of string}
+
+        Return:
+            settings {dict of setting name: setting value}
+        """
+        try:
+            settings = {}
+            for setting_name in setting_names:
+                setting_value = self.dynamic_settings.get(
+                    (interface_name, protocol_name, setting_name)
+                )
+                if setting_value is None:
+                    setting_value = self.get_protocol_dynamic_setting(
+                        interface_name, protocol_name, setting_name
+                    )
+                settings[setting_name] = setting_value
+            return settings
+
+        except Exception as e:
+            print("Exception occured at get protocol settings")
+            raise e
+
+    def set_protocol_dynamic_settings(self, interface_name, protocol_name, settings):
+        """Updates several dynamic protocol settings of the protocol.
+
+        The settings are compared with their current values and only the changed settings
+        are set.
+
+        Args:
+            interface_name: {string}
+            protocol_name: {string}
+            settings: {dict of setting name: setting value}
+
+        Return:
+            changed_setting_names {list of string}
+        """
+        try:
+            changed_settings = self.dynamic_settings.get_changed(
+                (interface_name, protocol_name), settings
+            )
+            for setting_name, setting_value in changed_settings:
+                self.set_protocol_dynamic_setting(
+                    interface_name, protocol_name, setting_name, setting_value
+                )
+            return [setting_name for setting_name, _ in changed_settings]
 
         except Exception as e:
             print("Exception occured at update dynamic protocol settings")
@@ -1149,17 +1561,17 @@ class SemiconductorDeviceControl:
             setting_value: {string}
         """
         try:
-            return self.semidevicecontrol_session.GetInterfaceDynamicSetting(
+            setting_value = self.semidevicecontrol_session.GetInterfaceDynamicSetting(
                 interface_name, setting_name
             )
+            self.dynamic_settings.set((interface_name, setting_name), setting_value)
+            return setting_value
 
         except Exception as e:
             print("Exception occured at get interface settings")
             raise e
 
-    def set_interface_dynamic_setting(
-        self, interface_name, setting_name, setting_value
-    ):
+    def set_interface_dynamic_setting(self, interface_name, setting_name, setting_value):
         """Updates the dynamic interface setting value of the interface setting.
 
         Args:
@@ -1168,9 +1580,61 @@ class SemiconductorDeviceControl:
             setting_value: {string}
         """
         try:
+            self._flush_queued_writes()
+            setting_key = (interface_name, setting_name)
+            self.dynamic_settings.discard(setting_key)
             self.semidevicecontrol_session.SetInterfaceDynamicSetting(
                 interface_name, setting_name, setting_value
             )
+            self.dynamic_settings.set(setting_key, setting_value)
+
+        except Exception as e:
+            print("Exception occured at update dynamic interface settings")
+            raise e
+
+    def get_interface_dynamic_settings(self, interface_name, setting_names):
+        """Gets the values of several dynamic interface settings of the interface.
+
+        The values set or read before are returned without querying the session.
+
+        Args:
+            interface_name: {string}
+            setting_names: {list of string}
+
+        Return:
+            settings {dict of setting name: setting value}
+        """
+        try:
+            settings = {}
+            for setting_name in setting_names:
+                setting_value = self.dynamic_settings.get((interface_name, setting_name))
+                if setting_value is None:
+                    setting_value = self.get_interface_dynamic_setting(interface_name, setting_name)
+                settings[setting_name] = setting_value
+            return settings
+
+        except Exception as e:
+            print("Exception occured at get interface settings")
+            raise e
+
+    def set_interface_dynamic_settings(self, interface_name, settings):
+        """Updates several dynamic interface settings of the interface.
+
+        The settings are compared with their current values and only the changed settings
+        are set.
+
+        Args:
+            interface_name: {string}
+            settings: {dict of setting name: setting value}
+
+        Return:
+            changed_setting_names {list of string}
+        """
+        try:
+            changed_settings = self.dynamic_settings.get_changed((interface_name,), settings)
+            for setting_name, setting_value in changed_settings:
+                self.set_interface_dynamic_setting(interface_name, setting_name, setting_value)
+            return [setting_name for setting_name, _ in changed_settings]
 
         except Exception as e:
             print("Exception occured at update dynamic interface settings")
@@ -1179,49 +1643,96 @@ class SemiconductorDeviceControl:
     def get_instrument_session(self, interface_name):
         """Gets the session ID of the instrument.
 
+        The session ID is read from the session once and cached until the session is stopped.
+
         Return:
             int {session ID}
         """
         try:
-            return self.semidevicecontrol_session.GetInterfaceSessionID(interface_name)
+            return self.interface_metadata.get_session_id(
+                self.semidevicecontrol_session, interface_name
+            )
 
         except Exception as e:
             print("Exception occured at get instrument session")
             raise e
-        
+
     def get_session_options(self, interface_name):
         """Gets the grpc options for the instrument session.
-           Creates service server channel using the grpc options.
 
-            Return:
-                grpc_session_options {Object contains the session_name {string} and device_server_channel {grpc.Channel}}
-        """
+        The device server channel of the grpc options comes from the channel pool of the
+        session: it is shared by all the callers and the interfaces of the same server, and
+        owned by the pool. Closing it has no effect, the pool closes it on start, stop and
+        destroy, call get_session_options again after these calls.
 
+        Args:
+            interface_name: {string}
+
+        Returns:
+            grpc_session_options: {GrpcSessionOptions} session_name {string}, resource_name
+                {string} and grpc_channel {SharedGrpcChannel}
+        """
         try:
-            grpc_session_options = self.semidevicecontrol_session.GetGrpcSessionOptions(interface_name)
-            device_server_channel = grpc.insecure_channel(grpc_session_options.Address + ":" + str(grpc_session_options.Port))
-            return GrpcSessionOptions(grpc_session_options.SessionName, grpc_session_options.ResourceName, device_server_channel)
-        
+            grpc_session_details = self.interface_metadata.get_grpc_session_details(
+                self.semidevicecontrol_session, interface_name
+            )
+            device_server_channel = self.grpc_channel_pool.get_channel(
+                grpc_session_details.address, grpc_session_details.port
+            )
+            return GrpcSessionOptions(
+                grpc_session_details.session_name,
+                grpc_session_details.resource_name,
+                device_server_channel,
+            )
+
         except Exception as e:
             print("Exception occured at get grpc session options")
             raise e
 
+    def configure_grpc_channels(
+        self,
+        keepalive_time_ms=None,
+        keepalive_timeout_ms=None,
+        max_message_length=None,
+        options=None,
+    ):
+        """Configures the options of the pooled grpc channels.
+
+        The channels already in the pool are closed.
+
+        Args:
+            keepalive_time_ms: {int} interval of the keepalive pings
+            keepalive_timeout_ms: {int} timeout of the keepalive pings
+            max_message_length: {int} maximum message size in bytes, -1 for unlimited
+            options: {list of tuple} additional grpc channel options (name, value)
+        """
+        try:
+            self.grpc_channel_pool.close()
+            self.grpc_channel_pool = GrpcChannelPool(
+                keepalive_time_ms, keepalive_timeout_ms, max_message_length, options
+            )
+
+        except Exception as e:
+            print("Exception occured at configure grpc channels: {}".format(e))
+            raise e
+
     def get_interface_details(self):
         """Gets the list of interface name and interface type.
 
+        The interface details are read from the session once and cached until the session is
+        stopped.
+
         Return:
-            interface_name_list {list of string}
-            interface_type_list {list of string}
+            interface_name_list {tuple of string}
+            interface_type_list {tuple of string}
         """
         try:
-            interface_details = self.semidevicecontrol_session.GetInterfaceDetails()
-            interface_name_list = list(
-                interface.Name for interface in interface_details
-            )
-            interface_type_list = list(
-                interface.Type for interface in interface_details
-            )
-            return interface_name_list, interface_type_list
+            interface_metadata = self.interface_metadata
+            if interface_metadata.interface_details is None and self.session_metadata is not None:
+                interface_metadata.set_interface_details(
+                    self.session_metadata.interface_names, self.session_metadata.interface_types
+                )
+            return interface_metadata.get_interface_details(self.semidevicecontrol_session)
 
         except Exception as e:
             print("Exception occured at get interface details")
@@ -1265,18 +1776,1071 @@ class SemiconductorDeviceControl:
             elif not (os.path.exists(directory)):
                 raise "Invalid path to generate the class file"
             directory += "\\nisdc_device_elements.py"
-            device_state_keys = self.semidevicecontrol_session.GetDeviceStateKeys()
+            device_state_keys = self._get_device_state_keys()
 
             with open(directory, "w+") as class_file:
                 class_file.write(
-                    generate_class_string(
-                        "Register", list(device_state_keys.RegisterUIDs)
-                    )
-                )
-                class_file.write(
-                    generate_class_string("Field", list(device_state_keys.FieldUIDs))
+                    generate_class_string("Register", list(device_state_keys.RegisterUIDs))
                 )
+                class_file.write(generate_class_string("Field", list(device_state_keys.FieldUIDs)))
             return directory
         except Exception as e:
             print("Exception occured at generate device elements")
             raise e
+
+    def generate_device_element_package(
+        self, directory="", package_name=DEFAULT_PACKAGE_NAME, force=False
+    ):
+        """This API generates a package in the specified directory.
+
+        That contains the register and field elements from the register map configured in
+        the sdcconfig file, in one submodule per IP block. The package imports the submodule
+        of an IP block on the first access to its elements, so a test program only loads the
+        IP blocks it uses. The package is not generated again if the register map is unchanged.
+        If the directory provided is empty, the package will be created in the working directory.
+
+        Args:
+            directory: {string}
+            package_name: {string}
+            force: {bool} if True, the package is generated even if the register map is unchanged
+
+        Return:
+            string - The path where the package is created
+        """
+        try:
+            if directory == "":
+                directory = os.getcwd()
+            elif not os.path.exists(directory):
+                raise ValueError("Invalid path to generate the device element package")
+            device_state_keys = self._get_device_state_keys()
+            package_directory, _ = generate_device_element_package(
+                list(device_state_keys.RegisterUIDs),
+                list(device_state_keys.FieldUIDs),
+                directory,
+                package_name,
+                force,
+            )
+            return package_directory
+
+        except Exception as e:
+            print("Exception occured at generate device element package")
+            raise e
+
+    # ---------------------------- SESSION METADATA ----------------------------
+    def load_session_metadata(self, cache_directory=None, include_field_definitions=True):
+        """Loads the metadata of the session from the on-disk metadata cache.
+
+        The metadata (register and field UIDs, register addresses, interface details and
+        field definitions) is cached in a file keyed by the hash of the sdconfig file and of
+        its register map file. On a cache miss the metadata is read from the session and
+        stored in the cache. If the register map file is not found, the metadata is read from
+        the session and not cached. The register addresses, interface details, device state
+        keys and field definitions are then served from the metadata until the session is
+        destroyed.
+
+        Args:
+            cache_directory: {string} if not specified, the default cache directory is used,
+                refer nisdc.metadata_cache
+            include_field_definitions: {bool} if True, the field definitions are cached too
+
+        Return:
+            SessionMetadata
+        """
+        try:
+            metadata_cache = MetadataCache(cache_directory)
+            key = get_metadata_cache_key(self.isconfigpath)
+            session_metadata = None if key is None else metadata_cache.load(key)
+            if session_metadata is None or (
+                include_field_definitions
+                and session_metadata.field_uids
+                and not session_metadata.field_definitions
+            ):
+                session_metadata = read_session_metadata(
+                    self.semidevicecontrol_session, include_field_definitions
+                )
+                if key is not None:
+                    metadata_cache.store(key, session_metadata)
+
+            self.session_metadata = session_metadata
+            if session_metadata.field_definitions:
+                self.enable_field_metadata_cache()
+                for field_uid, field_definition in session_metadata.field_definitions.items():
+                    self.field_metadata.add(field_uid, *field_definition)
+            return session_metadata
+
+        except Exception as e:
+            print("Exception occured at load of the session metadata: {}".format(e))
+            raise e
+
+    def _get_device_state_keys(self):
+        """Gets the device state keys from the session metadata, if any, or from the session."""
+        if self.session_metadata is not None:
+            return DeviceStateKeys(
+                self.session_metadata.register_uids, self.session_metadata.field_uids
+            )
+        return self.semidevicecontrol_session.GetDeviceStateKeys()
+
+    # --------------------------- REGISTER MAP INDEX ---------------------------
+    def use_register_map_index(self, register_map_index):
+        """Uses the offline register map index of the session register map.
+
+        The register handles and the address lookups of the shadow cache are built from the
+        index, and the field layouts of the index are used by the grouped field reads and the
+        field write merging, if no field layouts are set. The index is checked against the
+        register addresses and field definitions of the session and rejected on any mismatch,
+        as wrong field layouts would corrupt the neighbouring fields of merged field writes.
+        The register handles already resolved stay valid, they keep their register in the new
+        handle table.
+
+        Args:
+            register_map_index: {RegisterMapIndex} refer nisdc.register_map_index
+
+        Raises:
+            ValueError: if the index does not match the register map of the session
+        """
+        try:
+            field_definitions = {
+                str(field_uid): self.get_field_definition_details(str(field_uid))
+                for field_uid in self._get_device_state_keys().FieldUIDs
+            }
+            mismatches = register_map_index.get_mismatches(
+                *self.get_register_addresses(), field_definitions
+            )
+            if mismatches:
+                raise ValueError(
+                    "The register map index does not match the session register map: {}".format(
+                        "; ".join(mismatches)
+                    )
+                )
+
+            register_uid_list = ()
+            if self._register_handle_table is not None:
+                register_uid_list = self._register_handle_table.register_uids
+            self._register_handle_table = register_map_index.to_register_handle_table(
+                register_uid_list
+            )
+            self.register_map_index = register_map_index
+            if self.field_layouts is None:
+                self.field_layouts = register_map_index.to_field_layout_table()
+
+        except Exception as e:
+            print("Exception occured at use of the register map index: {}".format(e))
+            raise e
+
+    # ---------------------------- REGISTER HANDLES ----------------------------
+    def resolve_register_handles(self, register_uid_list):
+        """Resolves the register UIDs to integer handles for the handle based calls.
+
+        The handles are built once from the register addresses of the session. The handle
+        based calls do not marshal nor look up the register UID strings on every call, use
+        them in the loops of many register accesses.
+
+        Args:
+            register_uid_list: {list of string}
+
+        Returns:
+            register_handle_list: {list of int}
+        """
+        try:
+            return self._get_register_handle_table().resolve(register_uid_list)
+
+        except Exception as e:
+            print("Exception occured at resolve of the register handles: {}".format(e))
+            raise e
+
+    def write_register_by_handle_device(self, register_handle, register_data):
+        """Writes the data to the device using the register handle.
+
+        Args:
+            register_handle: {int} handle from resolve_register_handles
+            register_data: {int} register data
+        """
+        try:
+            table = self._register_handle_table
+            ip_block_name = table.ip_block_names[register_handle]
+            register_address = table.register_addresses[register_handle]
+            if self._write_coalescer is not None:
+                self._queue_register_writes_by_address(
+                    [ip_block_name], [register_address], [register_data]
+                )
+                return
+
+            self._flush_queued_writes()
+            self.semidevicecontrol_session.WriteRegisterByAddress_Device(
+                ip_block_name, register_address, register_data
+            )
+            if self.shadow_cache is not None:
+                self.shadow_cache.update(table.register_uids[register_handle], register_data)
+
+        except Exception as e:
+            print("")
+            raise e
+
+    def write_multi_register_by_handle_device(self, register_handle_list, register_data_list):
+        """Write data to multiple registers on the device, using the register handles.
+
+        Args:
+            register_handle_list: {list of int} handles from resolve_register_handles
+            register_data_list: {list of int}
+        """
+        try:
+            table = self._register_handle_table
+            ip_block_name_list, register_address_list = table.get_addresses(register_handle_list)
+            if self._write_coalescer is not None:
+                self._queue_register_writes_by_address(
+                    ip_block_name_list, register_address_list, register_data_list
+                )
+                return
+
+            self._flush_queued_writes()
+            self.semidevicecontrol_session.WriteMultipleRegistersByAddress_Device(
+                ip_block_name_list, register_address_list, register_data_list
+            )
+            if self.shadow_cache is not None:
+                self.shadow_cache.update_multiple(
+                    table.get_register_uids(register_handle_list), register_data_list
+                )
+
+        except Exception as e:
+            print("")
+            raise e
+
+    def read_register_by_handle_device(self, register_handle):
+        """Reads the data from the device using the register handle.
+
+        Args:
+            register_handle: {int} handle from resolve_register_handles
+
+        Returns:
+            register_data : {int}
+        """
+        try:
+            self._flush_queued_writes()
+            table = self._register_handle_table
+            if self.shadow_cache is not None:
+                register_uid = table.register_uids[register_handle]
+                register_data = self.shadow_cache.get(register_uid)
+                if register_data is not None:
+                    return register_data
+
+            register_data = self.semidevicecontrol_session.ReadRegisterByAddress_Device(
+                table.ip_block_names[register_handle], table.register_addresses[register_handle]
+            )
+            if self.shadow_cache is not None:
+                self.shadow_cache.update(register_uid, register_data)
+            return register_data
+
+        except Exception as e:
+            print("")
+            raise e
+
+    def read_multi_register_by_handle_device(self, register_handle_list):
+        """Reads data from multiple registers on the device, using the register handles.
+
+        Args:
+            register_handle_list: {list of int} handles from resolve_register_handles
+
+        Returns:
+            register_data_list : {list of int}
+        """
+        try:
+            self._flush_queued_writes()
+            table = self._register_handle_table
+            if self.shadow_cache is not None:
+                return self._read_multi_register_through_shadow_cache(
+                    table.get_register_uids(register_handle_list)
+                )
+
+            ip_block_name_list, register_address_list = table.get_addresses(register_handle_list)
+            register_data_list = (
+                self.semidevicecontrol_session.ReadMultipleRegistersByAddress_Device(
+                    ip_block_name_list, register_address_list
+                )
+            )
+            return register_data_list
+
+        except Exception as e:
+            print("")
+            raise e
+
+    def _get_register_handle_table(self):
+        """Gets the register handle table, built on first use from the register addresses."""
+        if self._register_handle_table is None:
+            self._register_handle_table = RegisterHandleTable(*self.get_register_addresses())
+        return self._register_handle_table
+
+    # ----------------------------- NUMPY ARRAYS -----------------------------
+    def read_multi_register_by_name_device_numpy(self, register_uid_list, dtype=None):
+        """Reads data from multiple registers on the device into a NumPy array.
+
+        The .NET array returned by the session is copied to the NumPy array in bulk.
+        NumPy must be installed.
+
+        Args:
+            register_uid_list: {list of string}
+            dtype: {numpy dtype} if not specified, the dtype of the .NET register data is used
+
+        Returns:
+            register_data_array: {numpy.ndarray}
+        """
+        try:
+            if self.shadow_cache is not None:
+                return to_numpy_array(
+                    self.read_multi_register_by_name_device(register_uid_list), dtype
+                )
+
+            self._flush_queued_writes()
+            register_data_list = self.semidevicecontrol_session.ReadMultipleRegistersByName_Device(
+                register_uid_list
+            )
+            return to_numpy_array(register_data_list, dtype)
+
+        except Exception as e:
+            print("")
+            raise e
+
+    def read_multi_register_by_address_device_numpy(
+        self, ip_block_name_list, register_address_list, dtype=None
+    ):
+        """Reads data from multiple registers on the device into a NumPy array.
+
+        Using the register address and IP block name. The .NET array returned by the session
+        is copied to the NumPy array in bulk. NumPy must be installed.
+
+        Args:
+            ip_block_name_list : {list of string}
+            register_address_list : {list of int or numpy.ndarray}
+            dtype: {numpy dtype} if not specified, the dtype of the .NET register data is used
+
+        Returns:
+            register_data_array: {numpy.ndarray}
+        """
+        try:
+            if self.shadow_cache is not None:
+                return to_numpy_array(
+                    self.read_multi_register_by_address_device(
+                        ip_block_name_list, list(register_address_list)
+                    ),
+                    dtype,
+                )
+
+            self._flush_queued_writes()
+            register_data_list = (
+                self.semidevicecontrol_session.ReadMultipleRegistersByAddress_Device(
+                    ip_block_name_list,
+                    to_session_array(
+                        unwrap_session(self.semidevicecontrol_session),
+                        "ReadMultipleRegistersByAddress_Device",
+                        1,
+                        register_address_list,
+                    ),
+                )
+            )
+            return to_numpy_array(register_data_list, dtype)
+
+        except Exception as e:
+            print("")
+            raise e
+
+    def write_multi_register_by_name_device_numpy(self, register_uid_list, register_data_array):
+        """Write the data of a NumPy array to multiple registers on the device.
+
+        The NumPy array is copied to the .NET array passed to the session in bulk.
+        NumPy must be installed.
+
+        Args:
+            register_uid_list: {list of string}
+            register_data_array: {numpy.ndarray}
+        """
+        try:
+            if self.shadow_cache is not None or self._write_coalescer is not None:
+                self.write_multi_register_by_name_device(
+                    register_uid_list, register_data_array.tolist()
+                )
+                return
+
+            self._flush_queued_writes()
+            self.semidevicecontrol_session.WriteMultipleRegistersByName_Device(
+                register_uid_list,
+                to_session_array(
+                    unwrap_session(self.semidevicecontrol_session),
+                    "WriteMultipleRegistersByName_Device",
+                    1,
+                    register_data_array,
+                ),
+            )
+
+        except Exception as e:
+            print("")
+            raise e
+
+    def write_multi_register_by_address_device_numpy(
+        self, ip_block_name_list, register_address_list, register_data_array
+    ):
+        """Write the data of a NumPy array to multiple registers on the device.
+
+        Using the register address and IP block name. The NumPy arrays are copied to the .NET
+        arrays passed to the session in bulk. NumPy must be installed.
+
+        Args:
+            ip_block_name_list: {list of string}
+            register_address_list: {list of int or numpy.ndarray}
+            register_data_array: {numpy.ndarray}
+        """
+        try:
+            if self.shadow_cache is not None or self._write_coalescer is not None:
+                self.write_multi_register_by_address_device(
+                    ip_block_name_list, list(register_address_list), register_data_array.tolist()
+                )
+                return
+
+            self._flush_queued_writes()
+            session = unwrap_session(self.semidevicecontrol_session)
+            self.semidevicecontrol_session.WriteMultipleRegistersByAddress_Device(
+                ip_block_name_list,
+                to_session_array(
+                    session, "WriteMultipleRegistersByAddress_Device", 1, register_address_list
+                ),
+                to_session_array(
+                    session, "WriteMultipleRegistersByAddress_Device", 2, register_data_array
+                ),
+            )
+
+        except Exception as e:
+            print("")
+            raise e
+
+    # ---------------------------- PREPARED BATCHES ----------------------------
+    def prepare_register_batch(self, register_uid_list):
+        """Prepares a batch of registers to be read and written repeatedly by register UID.
+
+        The register UIDs are validated and converted to the session arguments once.
+
+        Args:
+            register_uid_list: {list of string}
+
+        Returns:
+            PreparedRegisterBatch
+        """
+        try:
+            table = self._get_register_handle_table()
+            unknown_register_uids = [
+                register_uid for register_uid in register_uid_list if register_uid not in table
+            ]
+            if unknown_register_uids:
+                raise ValueError("Unknown register UIDs: {}".format(unknown_register_uids))
+            return PreparedRegisterBatch(self, register_uid_list)
+
+        except Exception as e:
+            print("Exception occured at prepare of the register batch: {}".format(e))
+            raise e
+
+    def prepare_register_batch_by_address(self, ip_block_name_list, register_address_list):
+        """Prepares a batch of registers to be read and written repeatedly by register address.
+
+        The register addresses are validated and converted to the session arguments once.
+
+        Args:
+            ip_block_name_list: {list of string}
+            register_address_list: {list of int}
+
+        Returns:
+            PreparedRegisterBatch
+        """
+        try:
+            if len(ip_block_name_list) != len(register_address_list):
+                raise ValueError("The IP block names and register addresses differ in length")
+            register_uid_list = []
+            for ip_block_name, register_address in zip(ip_block_name_list, register_address_list):
+                try:
+                    register_uid_list.append(
+                        self._get_register_uid(ip_block_name, register_address)
+                    )
+                except KeyError:
+                    raise ValueError(
+                        "Unknown register address {} in IP block {}".format(
+                            register_address, ip_block_name
+                        )
+                    )
+            return PreparedRegisterBatch(
+                self, register_uid_list, ip_block_name_list, register_address_list
+            )
+
+        except Exception as e:
+            print("Exception occured at prepare of the register batch: {}".format(e))
+            raise e
+
+    def prepare_field_batch(self, field_uid_list):
+        """Prepares a batch of fields to be read and written repeatedly by field UID.
+
+        The field UIDs are validated and converted to the session arguments once. The batch
+        is read and written like read_multi_field_by_name_device and
+        write_multi_field_by_name_device, with the grouped field reads, the field write
+        merging and the shadow cache if enabled.
+
+        Args:
+            field_uid_list: {list of string}
+
+        Returns:
+            PreparedFieldBatch
+        """
+        try:
+            device_state_keys = self._get_device_state_keys()
+            field_uids = set(device_state_keys.FieldUIDs)
+            unknown_field_uids = [
+                field_uid for field_uid in field_uid_list if field_uid not in field_uids
+            ]
+            if unknown_field_uids:
+                raise ValueError("Unknown field UIDs: {}".format(unknown_field_uids))
+            return PreparedFieldBatch(self, field_uid_list)
+
+        except Exception as e:
+            print("Exception occured at prepare of the field batch: {}".format(e))
+            raise e
+
+    # ----------------------------- FIELD METADATA -----------------------------
+    def enable_field_metadata_cache(self, preload=False):
+        """Enables the cache of the field definition details of the session.
+
+        The field definition details are converted once per field and kept until the session
+        is destroyed. The field value definition writes are resolved from the cache and
+        written as field writes by name, the value definitions not defined for the field are
+        written by the session.
+
+        Args:
+            preload: {bool or list of string} True to load the metadata of all the fields
+                up front, or the field UIDs to load up front
+        """
+        try:
+            if self.field_metadata is None:
+                self.field_metadata = FieldMetadataCache()
+            if preload:
+                self.field_metadata.preload(
+                    self.semidevicecontrol_session, None if preload is True else preload
+                )
+
+        except Exception as e:
+            print("Exception occured at load of the field metadata: {}".format(e))
+            raise e
+
+    def disable_field_metadata_cache(self):
+        """Disables the cache of the field definition details."""
+        self.field_metadata = None
+
+    def _get_field_value(self, field_uid, value_definition):
+        """Gets the field value of the value definition from the field metadata cache, if any."""
+        if self.field_metadata is None:
+            return None
+        return self.field_metadata.get_value(
+            self.semidevicecontrol_session, field_uid, value_definition
+        )
+
+    # ------------------------------ FIELD LAYOUT ------------------------------
+    def enable_grouped_field_reads(self, field_layouts):
+        """Enables the read of the fields by parent register.
+
+        The multiple field reads on the device read each distinct parent register of the
+        fields once and extract the fields from the register data. The fields without a
+        layout in the field layout table are read by the session.
+
+        Args:
+            field_layouts: {FieldLayoutTable} parent register, offset and width of the fields
+        """
+        self.field_layouts = field_layouts
+        self._grouped_field_reads = True
+
+    def disable_grouped_field_reads(self):
+        """Disables the read of the fields by parent register."""
+        self._grouped_field_reads = False
+
+    def enable_field_write_merging(self, field_layouts=None):
+        """Enables the merge of the field writes on the device into register writes.
+
+        The fields written by a write field by name call (single or multiple) are grouped
+        by parent register, merged into the current register value and written with one
+        register write per register. The current register value comes from the shadow
+        register cache, the fields of the registers with no shadow value (volatile, not cached
+        yet or shadow cache disabled) are written as fields in a single call. The calls with
+        fields without a layout are written by the session. Use coalesce_field_writes to merge
+        the field writes of several calls.
+
+        Args:
+            field_layouts: {FieldLayoutTable} if not specified, the field layouts given to
+                enable_grouped_field_reads are used
+        """
+        if field_layouts is not None:
+            self.field_layouts = field_layouts
+        if self.field_layouts is None:
+            raise ValueError("The field layouts are required to merge the field writes")
+        self._field_write_merging = True
+
+    def disable_field_write_merging(self):
+        """Writes the pending field writes and disables the merge of the field writes."""
+        try:
+            self.flush_field_writes()
+
+        finally:
+            self._field_write_merging = False
+
+    @contextlib.contextmanager
+    def coalesce_field_writes(self):
+        """Context manager merging the field writes of several calls, written at exit.
+
+        The field writes on the device are queued, merged per register and written before
+        any other device operation, on flush_field_writes and at exit.
+        """
+        if self._field_write_planner is not None:
+            yield self
+            self.flush_field_writes()
+            return
+
+        already_enabled = self._field_write_merging
+        self.enable_field_write_merging()
+        self._field_write_planner = FieldWritePlanner(self.field_layouts)
+        try:
+            yield self
+
+        finally:
+            try:
+                self.flush_field_writes()
+            finally:
+                self._field_write_planner = None
+                self._field_write_merging = already_enabled
+
+    def flush_field_writes(self):
+        """Writes the queued field writes to the device, one register write per register."""
+        if not self._field_write_planner:
+            return
+
+        try:
+            self._write_planned_fields(self._field_write_planner)
+
+        except Exception as e:
+            print("Exception occured at flush of the queued field writes")
+            raise e
+
+        finally:
+            self._field_write_planner.clear()
+
+    def _can_merge_field_writes(self, field_uid_list):
+        return self._field_write_merging and all(
+            field_uid in self.field_layouts for field_uid in field_uid_list
+        )
+
+    def _write_fields_merged(self, field_uid_list, field_data_list):
+        if self._field_write_planner is not None:
+            if self._write_coalescer:
+                self.flush()
+            self._field_write_planner.queue(field_uid_list, field_data_list)
+            return
+
+        self._flush_queued_writes()
+        field_write_planner = FieldWritePlanner(self.field_layouts)
+        field_write_planner.queue(field_uid_list, field_data_list)
+        self._write_planned_fields(field_write_planner)
+
+    def _write_planned_fields(self, field_write_planner):
+        """Merges the fields of the registers with a shadow value and writes the registers.
+
+        The fields of the registers with no shadow value are written as fields, so a field write
+        is never turned into a register read and a register write.
+        """
+        register_data_by_uid = {}
+        missing_register_uids = []
+        for register_uid in field_write_planner.get_register_uids():
+            register_data = None
+            if self.shadow_cache is not None:
+                register_data = self.shadow_cache.get(register_uid)
+            if register_data is None:
+                missing_register_uids.append(register_uid)
+            else:
+                register_data_by_uid[register_uid] = register_data
+        if missing_register_uids:
+            field_uid_list, field_data_list = field_write_planner.take(missing_register_uids)
+            if len(field_uid_list) == 1:
+                self.semidevicecontrol_session.WriteFieldByName_Device(
+                    field_uid_list[0], field_data_list[0]
+                )
+            else:
+                self.semidevicecontrol_session.WriteMultipleFieldsByName_Device(
+                    field_uid_list, field_data_list
+                )
+            if self.shadow_cache is not None:
+                for register_uid in missing_register_uids:
+                    self.shadow_cache.invalidate(register_uid)
+
+        register_uid_list, register_data_list = field_write_planner.plan(register_data_by_uid)
+        if not register_uid_list:
+            return
+        if len(register_uid_list) == 1:
+            self.semidevicecontrol_session.WriteRegisterByName_Device(
+                register_uid_list[0], register_data_list[0]
+            )
+        else:
+            self.semidevicecontrol_session.WriteMultipleRegistersByName_Device(
+                register_uid_list, register_data_list
+            )
+        if self.shadow_cache is not None:
+            self.shadow_cache.update_multiple(register_uid_list, register_data_list)
+
+    def _read_multi_field_by_register(self, field_uid_list):
+        """Reads the fields by reading their parent registers once and extracting them."""
+        field_layouts = self.field_layouts
+        grouped_field_uids = [
+            field_uid for field_uid in field_uid_list if field_uid in field_layouts
+        ]
+        register_uid_list, extractions = field_layouts.group_by_register(grouped_field_uids)
+        if self.shadow_cache is not None:
+            register_data_list = self._read_multi_register_through_shadow_cache(register_uid_list)
+        elif register_uid_list:
+            register_data_list = self.semidevicecontrol_session.ReadMultipleRegistersByName_Device(
+                register_uid_list
+            )
+        else:
+            register_data_list = []
+        grouped_field_data = extract_fields(register_data_list, extractions)
+        if len(grouped_field_uids) == len(field_uid_list):
+            return grouped_field_data
+
+        other_field_data = iter(
+            self.semidevicecontrol_session.ReadMultipleFieldsByName_Device(
+                [field_uid for field_uid in field_uid_list if field_uid not in field_layouts]
+            )
+        )
+        grouped_field_data = iter(grouped_field_data)
+        return [
+            next(grouped_field_data) if field_uid in field_layouts else next(other_field_data)
+            for field_uid in field_uid_list
+        ]
+
+    # ----------------------------- SHADOW CACHE -----------------------------
+    def enable_shadow_cache(
+        self,
+        non_volatile_register_uids=(),
+        volatile_register_uids=(),
+        default_non_volatile=False,
+        power_pin_names=(),
+    ):
+        """Enables the shadow cache of the last known register values on the device.
+
+        The register writes on the device update the shadow cache, and the register reads of
+        the non-volatile registers are served from the shadow cache without a bus transaction.
+        The volatile registers are always read from the device. Use shadow_cache.mark_volatile
+        and shadow_cache.mark_non_volatile to change the volatility of the registers.
+
+        The shadow cache is invalidated on start, stop, reset to default state, script
+        execution, custom register writes, write from cache to device and pin writes of the
+        power pins. The field writes invalidate the registers of the field register group. If a
+        script is executed without waiting until it is complete, call invalidate_shadow_cache
+        once the script is complete.
+
+        Args:
+            non_volatile_register_uids: {list of string}
+            volatile_register_uids: {list of string}
+            default_non_volatile: {bool} if True, every register that is not marked volatile
+                is served from the shadow cache
+            power_pin_names: {list of string} pins powering the device, for example Vdd, a
+                write of these pins may reset the device registers
+        """
+        self.shadow_cache = ShadowRegisterCache(
+            non_volatile_register_uids, volatile_register_uids, default_non_volatile
+        )
+        self._power_pin_names = frozenset(power_pin_names)
+
+    def disable_shadow_cache(self):
+        """Disables the shadow cache, all the register reads go to the device."""
+        self.shadow_cache = None
+
+    def invalidate_shadow_cache(self, register_uid=None):
+        """Discards the shadow values, the next reads of the registers go to the device.
+
+        Args:
+            register_uid: {string} if not specified, all the shadow values are discarded
+        """
+        if self.shadow_cache is not None:
+            self.shadow_cache.invalidate(register_uid)
+
+    def _record_cache_writes_by_address(
+        self, ip_block_name_list, register_address_list, register_data_list
+    ):
+        try:
+            register_uid_list = list(
+                map(self._get_register_uid, ip_block_name_list, register_address_list)
+            )
+        except KeyError:
+            self._cache_mirror.record_unknown(len(register_data_list))
+            return
+        self._cache_mirror.record(register_uid_list, register_data_list)
+
+    def _invalidate_shadow_cache(self):
+        if self.shadow_cache is not None:
+            self.shadow_cache.invalidate()
+
+    def _prepare_pin_writes(self, pin_names):
+        """Flushes the queued writes, and discards the shadow cache if a power pin is written."""
+        if self._power_pin_names.intersection(pin_names):
+            self._invalidate_session_state(_DEVICE_POWER)
+        else:
+            self._flush_queued_writes()
+
+    def _invalidate_session_state(self, scope):
+        """Flushes the queued writes and discards the state tracked in Python for the session.
+
+        Called before an operation that changes the state of the device or of the session.
+
+        Args:
+            scope: {int} _DEVICE_POWER, _DEVICE_STATE, _DEVICE_RESET, _INSTRUMENT_SESSIONS or
+                _SESSION
+        """
+        self._flush_queued_writes()
+        self._invalidate_shadow_cache()
+        if scope >= _DEVICE_STATE:
+            self.dynamic_settings.clear()
+            self.pin_states.clear()
+        if scope >= _DEVICE_RESET:
+            self._cache_mirror.clear(complete=False)
+        if scope >= _INSTRUMENT_SESSIONS:
+            self.interface_metadata.clear()
+            self.grpc_channel_pool.close()
+        if scope >= _SESSION:
+            if self.field_metadata is not None:
+                self.field_metadata.clear()
+            self.session_metadata = None
+            self.log_tail.clear()
+
+    def _get_register_uid(self, ip_block_name, register_address):
+        """Gets the register UID of the register address using the session register addresses."""
+        return self._get_register_handle_table().get_register_uid(ip_block_name, register_address)
+
+    def _find_register_uid(self, ip_block_name, register_address):
+        """Gets the register UID of the register address, None if the address is not known."""
+        try:
+            return self._get_register_uid(ip_block_name, register_address)
+        except KeyError:
+            return None
+
+    def _update_shadow_cache_by_address(
+        self, ip_block_name_list, register_address_list, register_data_list
+    ):
+        """Updates the shadow values of the written registers, or discards them all.
+
+        All the shadow values are discarded if a register address is not known.
+        """
+        register_uid_list = list(
+            map(self._find_register_uid, ip_block_name_list, register_address_list)
+        )
+        if None in register_uid_list:
+            self.shadow_cache.invalidate()
+        else:
+            self.shadow_cache.update_multiple(register_uid_list, register_data_list)
+
+    def _read_multi_register_through_shadow_cache(self, register_uid_list):
+        """Reads the registers missing from the shadow cache from the device in a single call."""
+        register_data_list = [
+            self.shadow_cache.get(register_uid) for register_uid in register_uid_list
+        ]
+        missing_indices = [
+            index for index, register_data in enumerate(register_data_list) if register_data is None
+        ]
+        if missing_indices:
+            missing_register_uids = [register_uid_list[index] for index in missing_indices]
+            missing_register_data = (
+                self.semidevicecontrol_session.ReadMultipleRegistersByName_Device(
+                    missing_register_uids
+                )
+            )
+            for index, register_uid, register_data in zip(
+                missing_indices, missing_register_uids, missing_register_data
+            ):
+                register_data_list[index] = register_data
+                self.shadow_cache.update(register_uid, register_data)
+        return register_data_list
+
+    # ---------------------------- WRITE COALESCING ----------------------------
+    def enable_write_coalescing(self, flush_threshold=DEFAULT_FLUSH_THRESHOLD):
+        """Enables the write-behind mode of the register writes on the device.
+
+        The consecutive write register by name and by address calls (single and multiple)
+        are queued and written to the device in a single multiple register write.
+        The queued writes are flushed before any other device operation (reads, field writes,
+        pins, scripts, settings, stop and destroy), when the number of queued writes reaches
+        the flush threshold and on flush.
+
+        Args:
+            flush_threshold: {int}
+        """
+        if self._write_coalescer is None:
+            self._write_coalescer = WriteCoalescer(flush_threshold)
+        else:
+            self._write_coalescer.flush_threshold = flush_threshold
+
+    def disable_write_coalescing(self):
+        """Flushes the queued writes and disables the write-behind mode."""
+        try:
+            self.flush()
+
+        finally:
+            self._write_coalescer = None
+
+    @contextlib.contextmanager
+    def coalesce_writes(self, flush_threshold=DEFAULT_FLUSH_THRESHOLD):
+        """Context manager enabling the write-behind mode, the queued writes are flushed at exit.
+
+        Args:
+            flush_threshold: {int}
+        """
+        already_enabled = self._write_coalescer is not None
+        self.enable_write_coalescing(flush_threshold)
+        try:
+            yield self
+
+        finally:
+            if already_enabled:
+                self.flush()
+            else:
+                self.disable_write_coalescing()
+
+    def flush(self):
+        """Writes the queued register writes to the device in a single transaction."""
+        if not self._write_coalescer:
+            return
+
+        try:
+            kind, arguments = self._write_coalescer.take()
+            if kind == WRITE_BY_NAME:
+                register_uid_list, register_data_list = arguments
+                if len(register_data_list) == 1:
+                    self.semidevicecontrol_session.WriteRegisterByName_Device(
+                        register_uid_list[0], register_data_list[0]
+                    )
+                else:
+                    self.semidevicecontrol_session.WriteMultipleRegistersByName_Device(
+                        register_uid_list, register_data_list
+                    )
+                if self.shadow_cache is not None:
+                    self.shadow_cache.update_multiple(register_uid_list, register_data_list)
+
+            elif kind == WRITE_BY_ADDRESS:
+                ip_block_name_list, register_address_list, register_data_list = arguments
+                if len(register_data_list) == 1:
+                    self.semidevicecontrol_session.WriteRegisterByAddress_Device(
+                        ip_block_name_list[0], register_address_list[0], register_data_list[0]
+                    )
+                else:
+                    self.semidevicecontrol_session.WriteMultipleRegistersByAddress_Device(
+                        ip_block_name_list, register_address_list, register_data_list
+                    )
+                if self.shadow_cache is not None:
+                    self._update_shadow_cache_by_address(
+                        ip_block_name_list, register_address_list, register_data_list
+                    )
+
+        except Exception as e:
+            print("Exception occured at flush of the queued register writes")
+            raise e
+
+    def _flush_queued_writes(self):
+        if self._write_coalescer:
+            self.flush()
+        if self._field_write_planner:
+            self.flush_field_writes()
+
+    def _queue_register_writes_by_name(self, register_uid_list, register_data_list):
+        if self._field_write_planner:
+            self.flush_field_writes()
+        if self._write_coalescer.kind == WRITE_BY_ADDRESS:
+            self.flush()
+        self._write_coalescer.queue_by_name(register_uid_list, register_data_list)
+        if self._write_coalescer.is_full():
+            self.flush()
+
+    def _queue_register_writes_by_address(
+        self, ip_block_name_list, register_address_list, register_data_list
+    ):
+        if self._field_write_planner:
+            self.flush_field_writes()
+        if self._write_coalescer.kind == WRITE_BY_NAME:
+            self.flush()
+        self._write_coalescer.queue_by_address(
+            ip_block_name_list, register_address_list, register_data_list
+        )
+        if self._write_coalescer.is_full():
+            self.flush()
+
+    # ---------------------------- INSTRUMENTATION ----------------------------
+    def _observe_session(self, session):
+        """Wraps the backend session to report its calls to the session observers, if any."""
+        session = unwrap_session(session)
+        if session is not None and self._session_observers:
+            return InstrumentedSession(session, self._session_observers)
+        return session
+
+    def enable_instrumentation(self):
+        """Starts recording the call count, latency histogram, transferred elements.
+
+        And exception count of every call made on the device control session.
+        The statistics are recorded per .NET session method, for example
+        ReadMultipleRegistersByName_Device for read_multi_register_by_name_device.
+        When the instrumentation is disabled, the session calls have no overhead.
+        """
+        if self._instrumentation is None:
+            self._instrumentation = Instrumentation()
+            self._session_observers.append(self._instrumentation)
+            self.semidevicecontrol_session = self._observe_session(self.semidevicecontrol_session)
+
+    def disable_instrumentation(self):
+        """Stops recording the session calls and discards the recorded statistics."""
+        if self._instrumentation is not None:
+            self._session_observers.remove(self._instrumentation)
+            self._instrumentation = None
+            self.semidevicecontrol_session = self._observe_session(self.semidevicecontrol_session)
+
+    def get_instrumentation_snapshot(self):
+        """Gets the statistics recorded since the instrumentation was enabled or last reset.
+
+        Return:
+            {dict of method name: nisdc.instrumentation.MethodStatistics}
+            empty if the instrumentation is disabled.
+        """
+        if self._instrumentation is None:
+            return {}
+        return self._instrumentation.snapshot()
+
+    def reset_instrumentation(self):
+        """Clears the recorded statistics, for example after logging them for a DUT."""
+        if self._instrumentation is not None:
+            self._instrumentation.reset()
+
+    def start_trace(self, path, capacity=DEFAULT_TRACE_CAPACITY):
+        """Starts recording the device calls of the session in a binary trace file.
+
+        Every register, field, pin, script and setting call made on the device control
+        session is appended to the memory mapped trace file with its names, addresses,
+        data and timestamps, refer nisdc.trace. Pass the trace_recorder to
+        SemiDeviceControlI3CSession.start_trace to record the I3C calls in the same trace.
+
+        Args:
+            path: {string} trace file, replaced if it exists
+            capacity: {int} initial number of records of the file
+
+        Return:
+            TraceRecorder
+        """
+        try:
+            self.stop_trace()
+            self.trace_recorder = TraceRecorder(path, capacity)
+            self._session_observers.append(self.trace_recorder)
+            self.semidevicecontrol_session = self._observe_session(self.semidevicecontrol_session)
+            return self.trace_recorder
+
+        except Exception as e:
+            print("Exception occured at start trace: {}".format(e))
+            raise e
+
+    def stop_trace(self):
+        """Stops recording the device calls and closes the trace file."""
+        if self.trace_recorder is not None:
+            self._session_observers.remove(self.trace_recorder)
+            self.trace_recorder.close()
+            self.trace_recorder = None
+            self.semidevicecontrol_session = self._observe_session(self.semidevicecontrol_session)
@@ -0,0 +1,83 @@
+"""This file is used for the pin state shadow of the Semi Device Control API.
+
+The last known state of every pin is tracked, so a batch of pin state writes only changes
+the pins that are not already in the requested state. The changed pins are written with a
+single script command of writedio lines instead of one pin state write per pin.
+"""
+
+PIN_STATE_NAMES = ("Low", "High", "Terminate")
+
+
+def get_write_pin_states_script(pin_states):
+    """Gets the script that writes the states of several pins.
+
+    Args:
+        pin_states: {list of tuple} (pin name, pin state {int} 2-Terminate, 1=High, 0-Low)
+
+    Return:
+        script_string {string}
+    """
+    return "\n".join(
+        "writedio {} {}".format(pin_name, PIN_STATE_NAMES[pin_state])
+        for pin_name, pin_state in pin_states
+    )
+
+
+class PinStateShadow:
+    """This class holds the last known state of the pins by pin name."""
+
+    def __init__(self):
+        """Creates the shadow with no known pin states."""
+        self._pin_states = {}
+
+    def __len__(self):
+        """Gets the number of pins with a known state."""
+        return len(self._pin_states)
+
+    def get(self, pin_name):
+        """Gets the known state of a pin.
+
+        Args:
+            pin_name: {string}
+
+        Return:
+            pin_state {int} None if the state is not known
+        """
+        return self._pin_states.get(pin_name)
+
+    def set(self, pin_name, pin_state):
+        """Records the current state of a pin.
+
+        Args:
+            pin_name: {string}
+            pin_state: {int}
+        """
+        self._pin_states[pin_name] = pin_state
+
+    def discard(self, pin_name):
+        """Forgets the state of a pin.
+
+        Args:
+            pin_name: {string}
+        """
+        self._pin_states.pop(pin_name, None)
+
+    def get_changed(self, pin_states):
+        """Gets the pin states of a batch that differ from the known states.
+
+        Args:
+            pin_states: {dict of pin name: pin state {int}}
+
+        Return:
+            list of tuple {(pin name, pin state {int})} in the order of the batch
+        """
+        known_pin_states = self._pin_states
+        return [
+            (pin_name, int(pin_state))
+            for pin_name, pin_state in pin_states.items()
+            if known_pin_states.get(pin_name) != int(pin_state)
+        ]
+
+    def clear(self):
+        """Discards the known states of all the pins."""
+        self._pin_states = {}
@@ -0,0 +1,167 @@
+"""This file is used for the prepared batches of the Semi Device Control API.
+
+A prepared batch holds a fixed list of registers or fields, validated against the register
+map once, and the session arguments of the list already converted to .NET arrays. The batch
+is read or written over and over without converting nor validating the list again.
+"""
+from nisdc.array_conversion import to_session_array, to_session_string_array
+from nisdc.instrumentation import unwrap_session
+
+
+class PreparedRegisterBatch:
+    """This class reads and writes a fixed list of registers on the device."""
+
+    def __init__(
+        self,
+        semi_device_control,
+        register_uid_list,
+        ip_block_name_list=None,
+        register_address_list=None,
+    ):
+        """Prepares the register batch, use SemiconductorDeviceControl.prepare_register_batch.
+
+        If the IP block names and register addresses are specified the registers are read and
+        written by address, otherwise by register UID.
+
+        Args:
+            semi_device_control: {SemiconductorDeviceControl}
+            register_uid_list: {list of string} validated register UIDs
+            ip_block_name_list: {list of string}
+            register_address_list: {list of int}
+        """
+        self.semi_device_control = semi_device_control
+        self.register_uid_list = list(register_uid_list)
+        session = unwrap_session(semi_device_control.semidevicecontrol_session)
+        if ip_block_name_list is None:
+            self._by_address = False
+            self._arguments = (to_session_string_array(session, self.register_uid_list),)
+        else:
+            self._by_address = True
+            self._arguments = (
+                to_session_string_array(session, ip_block_name_list),
+                _to_session_int_array(
+                    session, "ReadMultipleRegistersByAddress_Device", 1, register_address_list
+                ),
+            )
+
+    def __len__(self):
+        """Gets the number of elements of the batch."""
+        return len(self.register_uid_list)
+
+    def read(self):
+        """Reads the registers of the batch from the device.
+
+        Returns:
+            register_data_list : {list of int}
+        """
+        semi_device_control = self.semi_device_control
+        semi_device_control._flush_queued_writes()
+        if semi_device_control.shadow_cache is not None:
+            return semi_device_control._read_multi_register_through_shadow_cache(
+                self.register_uid_list
+            )
+
+        session = semi_device_control.semidevicecontrol_session
+        if self._by_address:
+            return session.ReadMultipleRegistersByAddress_Device(*self._arguments)
+        return session.ReadMultipleRegistersByName_Device(*self._arguments)
+
+    def write(self, register_data_list):
+        """Writes the data to the registers of the batch on the device.
+
+        Args:
+            register_data_list: {list of int} one element per register of the batch
+        """
+        if len(register_data_list) != len(self.register_uid_list):
+            raise ValueError(
+                "Expected {} register data, got {}".format(
+                    len(self.register_uid_list), len(register_data_list)
+                )
+            )
+
+        semi_device_control = self.semi_device_control
+        if semi_device_control._write_coalescer is not None:
+            semi_device_control._queue_register_writes_by_name(
+                self.register_uid_list, list(register_data_list)
+            )
+            return
+
+        semi_device_control._flush_queued_writes()
+        session = semi_device_control.semidevicecontrol_session
+        if self._by_address:
+            session.WriteMultipleRegistersByAddress_Device(*self._arguments, register_data_list)
+        else:
+            session.WriteMultipleRegistersByName_Device(*self._arguments, register_data_list)
+        if semi_device_control.shadow_cache is not None:
+            semi_device_control.shadow_cache.update_multiple(
+                self.register_uid_list, register_data_list
+            )
+
+
+class PreparedFieldBatch:
+    """This class reads and writes a fixed list of fields on the device."""
+
+    def __init__(self, semi_device_control, field_uid_list):
+        """Prepares the field batch, use SemiconductorDeviceControl.prepare_field_batch.
+
+        Args:
+            semi_device_control: {SemiconductorDeviceControl}
+            field_uid_list: {list of string} validated field UIDs
+        """
+        self.semi_device_control = semi_device_control
+        self.field_uid_list = list(field_uid_list)
+        session = unwrap_session(semi_device_control.semidevicecontrol_session)
+        self._field_uids = to_session_string_array(session, self.field_uid_list)
+
+    def __len__(self):
+        """Gets the number of elements of the batch."""
+        return len(self.field_uid_list)
+
+    def read(self):
+        """Reads the fields of the batch from the device.
+
+        Returns:
+            field_data_list : {list of int}
+        """
+        semi_device_control = self.semi_device_control
+        semi_device_control._flush_queued_writes()
+        if semi_device_control._grouped_field_reads:
+            return semi_device_control._read_multi_field_by_register(self.field_uid_list)
+
+        return semi_device_control.semidevicecontrol_session.ReadMultipleFieldsByName_Device(
+            self._field_uids
+        )
+
+    def write(self, field_data_list):
+        """Writes the data to the fields of the batch on the device.
+
+        Args:
+            field_data_list: {list of int} one element per field of the batch
+        """
+        if len(field_data_list) != len(self.field_uid_list):
+            raise ValueError(
+                "Expected {} field data, got {}".format(
+                    len(self.field_uid_list), len(field_data_list)
+                )
+            )
+
+        semi_device_control = self.semi_device_control
+        if semi_device_control._can_merge_field_writes(self.field_uid_list):
+            semi_device_control._write_fields_merged(self.field_uid_list, list(field_data_list))
+            return
+
+        semi_device_control._flush_queued_writes()
+        semi_device_control.semidevicecontrol_session.WriteMultipleFieldsByName_Device(
+            self._field_uids, field_data_list
+        )
+        if semi_device_control.shadow_cache is not None:
+            for field_uid in self.field_uid_list:
+                semi_device_control.shadow_cache.invalidate_register_group(field_uid)
+
+
+def _to_session_int_array(session, method_name, parameter_index, values):
+    try:
+        return to_session_array(session, method_name, parameter_index, values)
+    except ImportError:
+        # Without NumPy the list is converted by pythonnet on every call.
+        return list(values)
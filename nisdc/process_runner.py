@@ -0,0 +1,346 @@
+"""This file is used for the multi-site process runner of the Semi Device Control API.
+
+Every site runs in its own worker process, with its own .NET runtime and its own device
+control session, so the sites do not share the GIL. The commands are sent to the workers as
+small pickled tuples over a pipe, and the results of the bulk reads come back through a
+shared memory block of the site instead of the pipe.
+
+The runner can be benchmarked without the Semi Device Control addon with a stand-in backend,
+for example nisdc.simulation.SimulatedBackend:
+
+    python -m nisdc.process_runner --sites 4
+"""
+import argparse
+import array
+import multiprocessing
+import time
+
+from nisdc.session_pool import MultiSiteError
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python 3.7, the bulk read results are sent over the pipe.
+    shared_memory = None
+
+DEFAULT_RESULT_CAPACITY = 65536
+
+_BULK_READ_METHOD_NAMES = frozenset(
+    (
+        "read_multi_register_by_name_device",
+        "read_multi_register_by_address_device",
+        "read_multi_register_by_handle_device",
+        "read_multi_field_by_name_device",
+        "read_multi_register_by_name_cache",
+        "read_multi_register_by_address_cache",
+        "read_multi_field_by_name_cache",
+    )
+)
+
+_RESULT = 0
+_SHARED_RESULT = 1
+_ERROR = 2
+
+
+class ProcessSiteRunner:
+    """This class runs one device control session per site, each in its own worker process.
+
+    The methods mirror the SessionPool methods: call, call_per_site, start, stop and destroy
+    return the list of the results per site and raise MultiSiteError if any site failed.
+    """
+
+    def __init__(
+        self, isconfigpaths, backend_resolver=None, result_capacity=DEFAULT_RESULT_CAPACITY
+    ):
+        """Starts the worker processes and creates the device control session of each site.
+
+        Args:
+            isconfigpaths: {list of string} isconfig path per site
+            backend_resolver: {callable} picklable backend resolver set in the workers with
+                nisdc.backend.set_backend_resolver, if not specified the .NET backend is used
+            result_capacity: {int} number of values of the shared memory block of a site
+        """
+        context = multiprocessing.get_context("spawn")
+        self._connections = []
+        self._processes = []
+        self._shared_memories = []
+        try:
+            for site, isconfigpath in enumerate(isconfigpaths):
+                shared_memory_block = None
+                if shared_memory is not None and result_capacity:
+                    shared_memory_block = shared_memory.SharedMemory(
+                        create=True, size=result_capacity * 8
+                    )
+                self._shared_memories.append(shared_memory_block)
+
+                connection, worker_connection = context.Pipe()
+                process = context.Process(
+                    target=_run_worker,
+                    args=(
+                        worker_connection,
+                        isconfigpath,
+                        backend_resolver,
+                        shared_memory_block.name if shared_memory_block else None,
+                        result_capacity,
+                    ),
+                    name="nisdc-site{}".format(site),
+                    daemon=True,
+                )
+                process.start()
+                worker_connection.close()
+                self._connections.append(connection)
+                self._processes.append(process)
+
+            self._collect(self.sites)
+        except Exception:
+            self.close()
+            raise
+
+    @property
+    def sites(self):
+        """Gets the sites of the runner.
+
+        Returns:
+            {range of int}
+        """
+        return range(len(self._connections))
+
+    def __len__(self):
+        """Gets the number of sites."""
+        return len(self._connections)
+
+    def call(self, method_name, *args, sites=None):
+        """Calls a SemiconductorDeviceControl method with the same arguments on every site.
+
+        Args:
+            method_name: {string}
+            sites: {list of int} if not specified, all the sites
+
+        Returns:
+            {list} result per site, in the order of the sites
+        """
+        if sites is None:
+            sites = self.sites
+        for site in sites:
+            self._connections[site].send((method_name, args))
+        return self._collect(sites)
+
+    def call_per_site(self, method_name, site_args):
+        """Calls a SemiconductorDeviceControl method with different arguments per site.
+
+        Args:
+            method_name: {string}
+            site_args: {dict of site: tuple of arguments} the sites to call
+
+        Returns:
+            {list} result per site, in the order of the site_args
+        """
+        for site, args in site_args.items():
+            self._connections[site].send((method_name, tuple(args)))
+        return self._collect(list(site_args))
+
+    def start(self, sites=None):
+        """Starts the sessions of the sites in parallel.
+
+        Args:
+            sites: {list of int} if not specified, all the sites
+        """
+        self.call("start", sites=sites)
+
+    def stop(self, sites=None):
+        """Stops the sessions of the sites in parallel.
+
+        Args:
+            sites: {list of int} if not specified, all the sites
+        """
+        self.call("stop", sites=sites)
+
+    def destroy(self):
+        """Destroys the sessions of all the sites and stops the worker processes."""
+        try:
+            self.call("destroy")
+        finally:
+            self.close()
+
+    def close(self):
+        """Stops the worker processes and releases the shared memory blocks."""
+        for connection in self._connections:
+            try:
+                connection.send(None)
+            except (OSError, ValueError):
+                pass
+        for process in self._processes:
+            process.join(timeout=10)
+            if process.is_alive():
+                process.terminate()
+        for connection in self._connections:
+            connection.close()
+        for shared_memory_block in self._shared_memories:
+            if shared_memory_block is not None:
+                shared_memory_block.close()
+                shared_memory_block.unlink()
+        self._connections = []
+        self._processes = []
+        self._shared_memories = []
+
+    def __enter__(self):
+        """Returns the runner, the site processes are closed on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the site processes."""
+        self.close()
+
+    def _collect(self, sites):
+        results = []
+        site_exceptions = {}
+        for site in sites:
+            try:
+                kind, value = self._connections[site].recv()
+            except EOFError:
+                kind, value = _ERROR, "the worker process of the site exited"
+            if kind == _SHARED_RESULT:
+                values = self._shared_memories[site].buf.cast("q")
+                try:
+                    results.append(values[:value].tolist())
+                finally:
+                    values.release()
+            elif kind == _RESULT:
+                results.append(value)
+            else:
+                results.append(None)
+                site_exceptions[site] = RuntimeError(value)
+        if site_exceptions:
+            raise MultiSiteError(site_exceptions, results)
+        return results
+
+
+def _run_worker(connection, isconfigpath, backend_resolver, shared_memory_name, result_capacity):
+    from nisdc.backend import set_backend_resolver
+    from nisdc.nisemidevicecontrol import SemiconductorDeviceControl
+
+    shared_memory_block = None
+    values = None
+    try:
+        if shared_memory_name is not None:
+            shared_memory_block = shared_memory.SharedMemory(name=shared_memory_name)
+            values = shared_memory_block.buf.cast("q")
+        if backend_resolver is not None:
+            set_backend_resolver(backend_resolver)
+        semi_device_control = SemiconductorDeviceControl(isconfigpath)
+        connection.send((_RESULT, None))
+    except Exception as e:
+        connection.send((_ERROR, "{}: {}".format(type(e).__name__, e)))
+        return
+
+    try:
+        while True:
+            command = connection.recv()
+            if command is None:
+                break
+            method_name, args = command
+            try:
+                result = getattr(semi_device_control, method_name)(*args)
+                if (
+                    values is not None
+                    and method_name in _BULK_READ_METHOD_NAMES
+                    and len(result) <= result_capacity
+                ):
+                    count = len(result)
+                    values[:count] = array.array("q", _to_int_list(result))
+                    connection.send((_SHARED_RESULT, count))
+                else:
+                    connection.send((_RESULT, _to_picklable(result)))
+            except Exception as e:
+                connection.send((_ERROR, "{}: {}".format(type(e).__name__, e)))
+    except EOFError:
+        pass
+    finally:
+        if values is not None:
+            values.release()
+        if shared_memory_block is not None:
+            shared_memory_block.close()
+
+
+def _to_int_list(values):
+    if isinstance(values, list):
+        return values
+    return [int(value) for value in values]
+
+
+def _to_picklable(value):
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return type(value)(_to_picklable(element) for element in value)
+    if isinstance(value, dict):
+        return {_to_picklable(key): _to_picklable(element) for key, element in value.items()}
+    if hasattr(value, "GetType"):
+        # .NET values and arrays cannot be pickled.
+        if hasattr(value, "Length"):
+            return [_to_picklable(element) for element in value]
+        return str(value)
+    return value
+
+
+def main(argv=None):
+    """Benchmarks the multi-site process runner against the simulated device."""
+    from nisdc.backend import set_backend_resolver
+    from nisdc.session_pool import SessionPool
+    from nisdc.simulation import LatencyModel, SimulatedBackend, generate_register_map_description
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sites", type=int, default=4)
+    parser.add_argument("--register-count", type=int, default=1024)
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument(
+        "--call-latency", type=float, default=0.0, help="simulated latency of every call in seconds"
+    )
+    parser.add_argument(
+        "--realtime",
+        action="store_true",
+        help="sleep for the simulated latency instead of only accumulating it",
+    )
+    arguments = parser.parse_args(argv)
+
+    register_map = generate_register_map_description(arguments.register_count)
+    backend_resolver = SimulatedBackend(
+        register_map,
+        LatencyModel(arguments.call_latency, realtime=arguments.realtime),
+        log_transactions=False,
+    )
+    register_uid_list = [register["uid"] for register in register_map["registers"]]
+    isconfigpaths = ["simulation"] * arguments.sites
+
+    def run(runner):
+        runner.start()
+        start_time = time.perf_counter()
+        for _ in range(arguments.iterations):
+            runner.call("read_multi_register_by_name_device", register_uid_list)
+        elapsed_time = time.perf_counter() - start_time
+        runner.stop()
+        return elapsed_time
+
+    set_backend_resolver(backend_resolver)
+    try:
+        session_pool = SessionPool.create(isconfigpaths)
+        try:
+            thread_time = run(session_pool)
+        finally:
+            session_pool.destroy()
+    finally:
+        set_backend_resolver(None)
+
+    with ProcessSiteRunner(isconfigpaths, backend_resolver) as process_runner:
+        process_time = run(process_runner)
+
+    print(
+        "{} sites, {} iterations of {} register reads".format(
+            arguments.sites, arguments.iterations, len(register_uid_list)
+        )
+    )
+    print("thread session pool:   {:.3f} s".format(thread_time))
+    print("process site runner:   {:.3f} s".format(process_time))
+
+
+if __name__ == "__main__":
+    main()
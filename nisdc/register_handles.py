@@ -0,0 +1,94 @@
+"""This file is used for the integer register handles of the Semi Device Control API.
+
+The register UIDs are resolved once to integer handles. A handle indexes the pre-split IP
+block name and register address of the register, so the handle based calls do not parse nor
+look up the "<IP block>-<Register group>-<Name>" string of the register on every call.
+"""
+
+
+class RegisterHandleTable:
+    """This class maps the register UIDs to integer handles and the handles to addresses."""
+
+    def __init__(self, register_uid_list, register_address_list):
+        """Creates the handle table, the handle of a register is its index in the lists.
+
+        Args:
+            register_uid_list: {list of string}
+            register_address_list: {list of int}
+        """
+        self.register_uids = list(register_uid_list)
+        self.register_addresses = list(register_address_list)
+        self.ip_block_names = [register_uid.split("-", 1)[0] for register_uid in self.register_uids]
+        self._handle_by_uid = {
+            register_uid: handle for handle, register_uid in enumerate(self.register_uids)
+        }
+        self._handle_by_address = {
+            address: handle
+            for handle, address in enumerate(zip(self.ip_block_names, self.register_addresses))
+        }
+
+    def __len__(self):
+        """Gets the number of registers of the table."""
+        return len(self.register_uids)
+
+    def __contains__(self, register_uid):
+        """Checks whether the register is in the table."""
+        return register_uid in self._handle_by_uid
+
+    def resolve(self, register_uid_list):
+        """Resolves the register UIDs to handles.
+
+        Args:
+            register_uid_list: {list of string}
+
+        Return:
+            list of int
+
+        Raises:
+            KeyError: if a register UID is not in the register map
+        """
+        handle_by_uid = self._handle_by_uid
+        return [handle_by_uid[register_uid] for register_uid in register_uid_list]
+
+    def get_register_uid(self, ip_block_name, register_address):
+        """Gets the register UID of the register address.
+
+        Args:
+            ip_block_name: {string}
+            register_address: {int}
+
+        Return:
+            register_uid {string}
+
+        Raises:
+            KeyError: if the register address is not in the register map
+        """
+        return self.register_uids[self._handle_by_address[(ip_block_name, register_address)]]
+
+    def get_addresses(self, handle_list):
+        """Gets the IP block names and register addresses of the handles.
+
+        Args:
+            handle_list: {list of int}
+
+        Return:
+            Tuple {list of string - IP block names, list of int - register addresses}
+        """
+        ip_block_names = self.ip_block_names
+        register_addresses = self.register_addresses
+        return (
+            [ip_block_names[handle] for handle in handle_list],
+            [register_addresses[handle] for handle in handle_list],
+        )
+
+    def get_register_uids(self, handle_list):
+        """Gets the register UIDs of the handles.
+
+        Args:
+            handle_list: {list of int}
+
+        Return:
+            list of string
+        """
+        register_uids = self.register_uids
+        return [register_uids[handle] for handle in handle_list]
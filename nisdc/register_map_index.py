@@ -0,0 +1,446 @@
+"""This file is used for the offline register map index of the Semi Device Control API.
+
+The register map referenced by the ActiveRegisterMap of an sdconfig file is parsed in pure
+Python into a compact columnar index: the strings are stored once in a string table and the
+registers, fields and value definitions are stored in typed arrays. The index answers the
+register and field lookups without a device control session, for tools and pre-validation,
+and seeds the register handles and field layouts of a session without session round trips.
+
+The register map description format of nisdc.simulation (.json) is supported. The parsers
+of other register map formats, for example the Semi Device Control register maps (.solireg),
+are registered with register_register_map_parser.
+"""
+import array
+import json
+import ntpath
+import os
+
+from nisdc.field_layout import FieldLayoutTable
+from nisdc.register_handles import RegisterHandleTable
+
+_register_map_parsers = {}
+
+
+def register_register_map_parser(file_extension, parser):
+    """Registers the parser of a register map file format.
+
+    Args:
+        file_extension: {string} for example ".solireg"
+        parser: {callable} called with the register map file path, returns a register map
+            description, refer nisdc.simulation
+    """
+    _register_map_parsers[file_extension.lower()] = parser
+
+
+def load_register_map_description_file(file_path):
+    """Loads a register map description from a JSON file.
+
+    Args:
+        file_path: {string}
+
+    Return:
+        {dict} register map description
+    """
+    with open(file_path, encoding="utf-8-sig") as register_map_file:
+        return json.load(register_map_file)
+
+
+register_register_map_parser(".json", load_register_map_description_file)
+
+
+def get_register_map_path(sdconfig_path):
+    """Gets the path of the register map referenced by the ActiveRegisterMap of an sdconfig.
+
+    If the referenced path does not exist, for example a Windows path on another machine,
+    the register map file is looked for next to the sdconfig file.
+
+    Args:
+        sdconfig_path: {string}
+
+    Return:
+        string
+    """
+    with open(sdconfig_path, encoding="utf-8-sig") as sdconfig_file:
+        register_map_path = json.load(sdconfig_file)["ActiveRegisterMap"]["FilePath"]
+    if os.path.exists(register_map_path):
+        return register_map_path
+    local_register_map_path = os.path.join(
+        os.path.dirname(os.path.abspath(sdconfig_path)), ntpath.basename(register_map_path)
+    )
+    if os.path.exists(local_register_map_path):
+        return local_register_map_path
+    raise FileNotFoundError("Register map file not found: {}".format(register_map_path))
+
+
+def load_register_map_index(path):
+    """Loads the register map index of an sdconfig file or of a register map file.
+
+    Args:
+        path: {string} sdconfig file or register map file
+
+    Return:
+        RegisterMapIndex
+    """
+    if os.path.splitext(path)[1].lower() == ".sdconfig":
+        path = get_register_map_path(path)
+    extension = os.path.splitext(path)[1].lower()
+    parser = _register_map_parsers.get(extension)
+    if parser is None:
+        raise ValueError(
+            "No parser registered for the register map format {}: {}".format(extension, path)
+        )
+    return RegisterMapIndex.from_register_map_description(parser(path))
+
+
+class RegisterMapIndex:
+    """This class holds the registers, fields and value definitions of a register map.
+
+    The registers and fields are numbered in the order of the register map. The register
+    columns are uid, ip_block, address, size, first field and field count. The field columns
+    are uid, register, offset, width, first value definition and value definition count.
+    The string columns hold indices in the string table.
+    """
+
+    def __init__(self):
+        """Creates the empty index."""
+        self.strings = []
+        self._string_ids = {}
+
+        self.register_uid_ids = array.array("q")
+        self.register_ip_block_ids = array.array("q")
+        self.register_addresses = array.array("q")
+        self.register_sizes = array.array("H")
+        self.register_field_starts = array.array("q")
+        self.register_field_counts = array.array("q")
+
+        self.field_uid_ids = array.array("q")
+        self.field_registers = array.array("q")
+        self.field_offsets = array.array("H")
+        self.field_widths = array.array("H")
+        self.field_value_definition_starts = array.array("q")
+        self.field_value_definition_counts = array.array("q")
+
+        self.value_definition_name_ids = array.array("q")
+        self.value_definition_values = array.array("q")
+
+        self._register_by_uid = {}
+        self._register_by_address = {}
+        self._field_by_uid = {}
+
+    @classmethod
+    def from_register_map_description(cls, register_map):
+        """Builds the index of a register map description.
+
+        Args:
+            register_map: {dict} register map description, refer nisdc.simulation
+
+        Returns:
+            RegisterMapIndex
+        """
+        index = cls()
+        for register_description in register_map.get("registers", []):
+            index.add_register(
+                register_description["uid"],
+                register_description["address"],
+                register_description.get("size", 8),
+                [
+                    (
+                        field_description["uid"],
+                        field_description["offset"],
+                        field_description["width"],
+                        field_description.get("values", {}),
+                    )
+                    for field_description in register_description.get("fields", [])
+                ],
+            )
+        return index
+
+    def __len__(self):
+        """Gets the number of registers of the index."""
+        return len(self.register_uid_ids)
+
+    def add_register(self, register_uid, address, size, fields=()):
+        """Adds a register and its fields to the index.
+
+        Args:
+            register_uid: {string} <IP block>-<Register group>-<Name>
+            address: {int}
+            size: {int} in bits
+            fields: {list of tuple} (field UID, offset, width, {display value: value})
+        """
+        if register_uid in self._register_by_uid:
+            raise ValueError("Duplicate register unique ID: {}".format(register_uid))
+        register = len(self.register_uid_ids)
+        ip_block_id = self._get_string_id(register_uid.split("-", 1)[0])
+        self._register_by_uid[register_uid] = register
+        self._register_by_address[(self.strings[ip_block_id], address)] = register
+        self.register_uid_ids.append(self._get_string_id(register_uid))
+        self.register_ip_block_ids.append(ip_block_id)
+        self.register_addresses.append(address)
+        self.register_sizes.append(size)
+        self.register_field_starts.append(len(self.field_uid_ids))
+        self.register_field_counts.append(len(fields))
+        for field_uid, offset, width, value_definitions in fields:
+            self._field_by_uid[field_uid] = len(self.field_uid_ids)
+            self.field_uid_ids.append(self._get_string_id(field_uid))
+            self.field_registers.append(register)
+            self.field_offsets.append(offset)
+            self.field_widths.append(width)
+            self.field_value_definition_starts.append(len(self.value_definition_name_ids))
+            self.field_value_definition_counts.append(len(value_definitions))
+            for display_value, value in value_definitions.items():
+                self.value_definition_name_ids.append(self._get_string_id(display_value))
+                self.value_definition_values.append(value)
+
+    def get_register_uids(self):
+        """Gets the register UIDs in the order of the register map.
+
+        Return:
+            list of string
+        """
+        strings = self.strings
+        return [strings[uid_id] for uid_id in self.register_uid_ids]
+
+    def get_field_uids(self):
+        """Gets the field UIDs in the order of the register map.
+
+        Return:
+            list of string
+        """
+        strings = self.strings
+        return [strings[uid_id] for uid_id in self.field_uid_ids]
+
+    def has_register(self, register_uid):
+        """Checks whether the register is in the register map.
+
+        Args:
+            register_uid: {string}
+
+        Return:
+            bool
+        """
+        return register_uid in self._register_by_uid
+
+    def has_field(self, field_uid):
+        """Checks whether the field is in the register map.
+
+        Args:
+            field_uid: {string}
+
+        Return:
+            bool
+        """
+        return field_uid in self._field_by_uid
+
+    def get_register_address(self, register_uid):
+        """Gets the IP block name and address of a register.
+
+        Args:
+            register_uid: {string}
+
+        Return:
+            Tuple {string - IP block name, int - register address}
+
+        Raises:
+            KeyError: if the register is not in the register map
+        """
+        register = self._register_by_uid[register_uid]
+        return (
+            self.strings[self.register_ip_block_ids[register]],
+            self.register_addresses[register],
+        )
+
+    def get_register_uid(self, ip_block_name, register_address):
+        """Gets the UID of the register at an address.
+
+        Args:
+            ip_block_name: {string}
+            register_address: {int}
+
+        Return:
+            register_uid {string}
+
+        Raises:
+            KeyError: if the address is not in the register map
+        """
+        register = self._register_by_address[(ip_block_name, register_address)]
+        return self.strings[self.register_uid_ids[register]]
+
+    def get_register_size(self, register_uid):
+        """Gets the size of a register in bits.
+
+        Args:
+            register_uid: {string}
+
+        Return:
+            int
+        """
+        return self.register_sizes[self._register_by_uid[register_uid]]
+
+    def get_field_layout(self, field_uid):
+        """Gets the parent register, offset and width of a field.
+
+        Args:
+            field_uid: {string}
+
+        Return:
+            Tuple {string - register UID, int - offset, int - width}
+
+        Raises:
+            KeyError: if the field is not in the register map
+        """
+        field = self._field_by_uid[field_uid]
+        return (
+            self.strings[self.register_uid_ids[self.field_registers[field]]],
+            self.field_offsets[field],
+            self.field_widths[field],
+        )
+
+    def get_value_definitions(self, field_uid):
+        """Gets the value definitions of a field.
+
+        Args:
+            field_uid: {string}
+
+        Return:
+            {dict of display value: value}
+
+        Raises:
+            KeyError: if the field is not in the register map
+        """
+        field = self._field_by_uid[field_uid]
+        start = self.field_value_definition_starts[field]
+        stop = start + self.field_value_definition_counts[field]
+        strings = self.strings
+        return {
+            strings[name_id]: value
+            for name_id, value in zip(
+                self.value_definition_name_ids[start:stop],
+                self.value_definition_values[start:stop],
+            )
+        }
+
+    def get_mismatches(self, register_uid_list, register_address_list, field_definitions):
+        """Compares the index with the register map of a device control session.
+
+        The registers, their addresses, the fields, their widths and value definitions must
+        be the same. The session does not give the parent register and offset of the fields,
+        a field must be in the register group of its parent register and fit in its size.
+
+        Args:
+            register_uid_list: {list of string} register UIDs of the session
+            register_address_list: {list of int} register addresses of the session
+            field_definitions: {dict of field UID: (display values, values, size)} field
+                definitions of the session
+
+        Return:
+            list of string - the mismatches, empty if the index matches the session
+        """
+        mismatches = []
+        register_address_by_uid = {
+            str(register_uid): int(register_address)
+            for register_uid, register_address in zip(register_uid_list, register_address_list)
+        }
+        for register_uid in self.get_register_uids():
+            if register_uid not in register_address_by_uid:
+                mismatches.append("register {} is not in the session".format(register_uid))
+        for register_uid, register_address in register_address_by_uid.items():
+            register = self._register_by_uid.get(register_uid)
+            if register is None:
+                mismatches.append("register {} is not in the index".format(register_uid))
+            elif self.register_addresses[register] != register_address:
+                mismatches.append(
+                    "register {} address {} differs from {} in the session".format(
+                        register_uid, self.register_addresses[register], register_address
+                    )
+                )
+
+        for field_uid in self.get_field_uids():
+            if field_uid not in field_definitions:
+                mismatches.append("field {} is not in the session".format(field_uid))
+        for field_uid, (display_values, values, size) in field_definitions.items():
+            if field_uid not in self._field_by_uid:
+                mismatches.append("field {} is not in the index".format(field_uid))
+                continue
+            register_uid, offset, width = self.get_field_layout(field_uid)
+            if width != int(size):
+                mismatches.append(
+                    "field {} width {} differs from {} in the session".format(
+                        field_uid, width, size
+                    )
+                )
+            if field_uid.rsplit("-", 1)[0] != register_uid.rsplit("-", 1)[0]:
+                mismatches.append(
+                    "field {} is not in the register group of {}".format(field_uid, register_uid)
+                )
+            if offset + width > self.get_register_size(register_uid):
+                mismatches.append(
+                    "field {} does not fit in the register {}".format(field_uid, register_uid)
+                )
+            session_value_definitions = {
+                str(display_value): int(value)
+                for display_value, value in zip(display_values, values)
+            }
+            if self.get_value_definitions(field_uid) != session_value_definitions:
+                mismatches.append(
+                    "field {} value definitions differ from the session".format(field_uid)
+                )
+        return mismatches
+
+    def to_register_handle_table(self, register_uid_list=()):
+        """Creates the register handle table of the register map.
+
+        Args:
+            register_uid_list: {list of string} registers of the first handles, in order, for
+                example the registers of a handle table whose handles must stay valid, the
+                other registers of the register map get the next handles
+
+        Return:
+            RegisterHandleTable
+
+        Raises:
+            ValueError: if a register of register_uid_list is not in the register map
+        """
+        register_by_uid = self._register_by_uid
+        missing_register_uids = [
+            register_uid
+            for register_uid in register_uid_list
+            if register_uid not in register_by_uid
+        ]
+        if missing_register_uids:
+            raise ValueError(
+                "Registers not in the register map: {}".format(", ".join(missing_register_uids))
+            )
+        registers = [register_by_uid[register_uid] for register_uid in register_uid_list]
+        first_registers = set(registers)
+        registers.extend(
+            register for register in range(len(self)) if register not in first_registers
+        )
+        strings = self.strings
+        return RegisterHandleTable(
+            [strings[self.register_uid_ids[register]] for register in registers],
+            [self.register_addresses[register] for register in registers],
+        )
+
+    def to_field_layout_table(self):
+        """Creates the field layout table of the register map.
+
+        Return:
+            FieldLayoutTable
+        """
+        field_layout_table = FieldLayoutTable()
+        strings = self.strings
+        for field_uid_id, register, offset, width in zip(
+            self.field_uid_ids, self.field_registers, self.field_offsets, self.field_widths
+        ):
+            field_layout_table.add(
+                strings[field_uid_id], strings[self.register_uid_ids[register]], offset, width
+            )
+        return field_layout_table
+
+    def _get_string_id(self, string):
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = self._string_ids[string] = len(self.strings)
+            self.strings.append(string)
+        return string_id
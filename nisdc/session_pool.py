@@ -0,0 +1,260 @@
+"""This file is used for the multi-site session pool of the Semi Device Control API.
+
+The session pool owns one device control session per site and runs the calls on the sites
+in parallel. The .NET device control session is not free-threaded, so every site has a
+dedicated thread and all the calls of a site run on it, in order.
+"""
+import concurrent.futures
+
+from nisdc.nisemidevicecontrol import SemiconductorDeviceControl
+
+_FAN_OUT_METHOD_NAMES = (
+    "write_register_by_name_device",
+    "write_multi_register_by_name_device",
+    "write_register_by_address_device",
+    "write_multi_register_by_address_device",
+    "read_register_by_name_device",
+    "read_multi_register_by_name_device",
+    "read_register_by_address_device",
+    "read_multi_register_by_address_device",
+    "write_field_by_name_device",
+    "write_multi_field_by_name_device",
+    "write_field_by_value_definition_device",
+    "read_field_by_name_device",
+    "read_multi_field_by_name_device",
+    "write_from_cache_to_device",
+    "clear_cache",
+    "flush",
+    "read_pin_state",
+    "write_pin_state",
+    "read_pin_states",
+    "write_pin_states",
+    "execute_script",
+    "execute_script_command",
+    "abort_script",
+    "get_logs",
+    "get_new_logs",
+    "reset_to_default_state",
+    "set_protocol_dynamic_setting",
+    "set_interface_dynamic_setting",
+    "set_protocol_dynamic_settings",
+    "set_interface_dynamic_settings",
+)
+
+
+class MultiSiteError(Exception):
+    """This exception is raised when a call failed on one or more sites.
+
+    The site_exceptions are the exceptions by site, the results are the results of the
+    call per site, None for the failed sites.
+    """
+
+    def __init__(self, site_exceptions, results):
+        """Creates the exception of a multi-site call.
+
+        Args:
+            site_exceptions: {dict of site: Exception}
+            results: {list} result of the call per site, None for the failed sites
+        """
+        super().__init__(
+            "Call failed on site(s) {}: {}".format(
+                sorted(site_exceptions),
+                "; ".join(
+                    "site {}: {}".format(site, exception)
+                    for site, exception in sorted(site_exceptions.items())
+                ),
+            )
+        )
+        self.site_exceptions = site_exceptions
+        self.results = results
+
+
+class SessionPool:
+    """This class owns one device control session per site and fans the calls out to them.
+
+    The fan-out methods take the same arguments as the SemiconductorDeviceControl methods,
+    plus an optional sites list, and return the list of the results per site.
+    """
+
+    def __init__(self, semi_device_controls=()):
+        """Creates the session pool and the threads of the sites.
+
+        Args:
+            semi_device_controls: {list of SemiconductorDeviceControl} one session per site,
+                use create to create the sessions on the threads of the sites
+        """
+        self.semi_device_controls = list(semi_device_controls)
+        self._executors = [_create_site_executor(site) for site in self.sites]
+
+    @classmethod
+    def create(cls, isconfigpaths, semidevicecontrol_mains=None):
+        """Creates the device control sessions of the sites in parallel, on the site threads.
+
+        Args:
+            isconfigpaths: {list of string} isconfig path per site
+            semidevicecontrol_mains: {list of object} main object per site, if not specified
+                the .NET SemiDeviceControlMain is used
+
+        Returns:
+            SessionPool
+        """
+        if semidevicecontrol_mains is None:
+            semidevicecontrol_mains = [None] * len(isconfigpaths)
+        session_pool = cls()
+        session_pool.semi_device_controls = [None] * len(isconfigpaths)
+        session_pool._executors = [_create_site_executor(site) for site in session_pool.sites]
+        try:
+            session_pool.semi_device_controls = session_pool._run(
+                lambda site: SemiconductorDeviceControl(
+                    isconfigpaths[site], semidevicecontrol_mains[site]
+                ),
+                None,
+            )
+        except Exception:
+            session_pool.close()
+            raise
+        return session_pool
+
+    @property
+    def sites(self):
+        """Gets the sites of the pool.
+
+        Returns:
+            {range of int}
+        """
+        return range(len(self.semi_device_controls))
+
+    def __len__(self):
+        """Gets the number of sites."""
+        return len(self.semi_device_controls)
+
+    def run_on_sites(self, function, sites=None):
+        """Runs a function on the session of each site in parallel.
+
+        Args:
+            function: {callable} called with the SemiconductorDeviceControl of the site
+            sites: {list of int} if not specified, all the sites
+
+        Returns:
+            {list} result per site, in the order of the sites
+
+        Raises:
+            MultiSiteError: if the function raised on any site, after all the sites are done
+        """
+        semi_device_controls = self.semi_device_controls
+        return self._run(lambda site: function(semi_device_controls[site]), sites)
+
+    def call(self, method_name, *args, sites=None):
+        """Calls a SemiconductorDeviceControl method with the same arguments on every site.
+
+        Args:
+            method_name: {string}
+            sites: {list of int} if not specified, all the sites
+
+        Returns:
+            {list} result per site, in the order of the sites
+        """
+        return self.run_on_sites(
+            lambda semi_device_control: getattr(semi_device_control, method_name)(*args), sites
+        )
+
+    def call_per_site(self, method_name, site_args):
+        """Calls a SemiconductorDeviceControl method with different arguments per site.
+
+        Args:
+            method_name: {string}
+            site_args: {dict of site: tuple of arguments} the sites to call
+
+        Returns:
+            {list} result per site, in the order of the site_args
+        """
+        semi_device_controls = self.semi_device_controls
+        return self._run(
+            lambda site: getattr(semi_device_controls[site], method_name)(*site_args[site]),
+            list(site_args),
+        )
+
+    def start(self, sites=None):
+        """Starts the sessions of the sites in parallel.
+
+        Args:
+            sites: {list of int} if not specified, all the sites
+        """
+        self.call("start", sites=sites)
+
+    def stop(self, sites=None):
+        """Stops the sessions of the sites in parallel.
+
+        Args:
+            sites: {list of int} if not specified, all the sites
+        """
+        self.call("stop", sites=sites)
+
+    def destroy(self):
+        """Stops and destroys the sessions of all the sites and shuts the site threads down.
+
+        The session of a site is destroyed even if stopping it failed.
+        """
+        try:
+            self.run_on_sites(_stop_and_destroy)
+        finally:
+            self.close()
+
+    def close(self):
+        """Shuts the site threads down, the sessions are not destroyed."""
+        for executor in self._executors:
+            executor.shutdown(wait=True)
+
+    def __enter__(self):
+        """Returns the pool, the sessions are stopped and destroyed on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stops and destroys the sessions of all the sites and shuts the site threads down."""
+        self.destroy()
+
+    def _run(self, site_function, sites):
+        if sites is None:
+            sites = range(len(self._executors))
+        futures = [(site, self._executors[site].submit(site_function, site)) for site in sites]
+        results = []
+        site_exceptions = {}
+        for site, future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                results.append(None)
+                site_exceptions[site] = e
+        if site_exceptions:
+            raise MultiSiteError(site_exceptions, results)
+        return results
+
+
+def _stop_and_destroy(semi_device_control):
+    try:
+        semi_device_control.stop()
+    finally:
+        semi_device_control.destroy()
+
+
+def _create_site_executor(site):
+    return concurrent.futures.ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix="nisdc-site{}".format(site)
+    )
+
+
+def _make_fan_out_method(method_name):
+    def fan_out_method(self, *args, sites=None):
+        return self.call(method_name, *args, sites=sites)
+
+    fan_out_method.__name__ = method_name
+    fan_out_method.__qualname__ = "SessionPool." + method_name
+    fan_out_method.__doc__ = "Fan-out of SemiconductorDeviceControl.{}.\n{}".format(
+        method_name, getattr(SemiconductorDeviceControl, method_name).__doc__
+    )
+    return fan_out_method
+
+
+for _method_name in _FAN_OUT_METHOD_NAMES:
+    setattr(SessionPool, _method_name, _make_fan_out_method(_method_name))
+del _method_name
@@ -0,0 +1,123 @@
+"""This file is used for the shadow register cache of the Semi Device Control API.
+
+The shadow register cache holds the last known device value of the registers. The values of
+the non-volatile registers are served from the shadow cache without a bus transaction, the
+volatile registers (for example status and data output registers) are always read from the
+device.
+"""
+
+
+class ShadowRegisterCache:
+    """This class holds the last known device value of the registers by register UID."""
+
+    def __init__(
+        self, non_volatile_register_uids=(), volatile_register_uids=(), default_non_volatile=False
+    ):
+        """Creates the empty shadow register cache.
+
+        Args:
+            non_volatile_register_uids: {list of string} registers served from the shadow cache
+            volatile_register_uids: {list of string} registers always read from the device
+            default_non_volatile: {bool} if True, every register that is not marked volatile
+                is served from the shadow cache
+        """
+        self.default_non_volatile = default_non_volatile
+        self._non_volatile = set(non_volatile_register_uids)
+        self._volatile = set(volatile_register_uids)
+        self._values = {}
+
+    def mark_non_volatile(self, register_uids):
+        """Marks the registers to be served from the shadow cache.
+
+        Args:
+            register_uids: {list of string}
+        """
+        self._non_volatile.update(register_uids)
+        self._volatile.difference_update(register_uids)
+
+    def mark_volatile(self, register_uids):
+        """Marks the registers to be always read from the device.
+
+        Args:
+            register_uids: {list of string}
+        """
+        self._volatile.update(register_uids)
+        self._non_volatile.difference_update(register_uids)
+
+    def is_non_volatile(self, register_uid):
+        """Checks whether the register is served from the shadow cache.
+
+        Args:
+            register_uid: {string}
+
+        Return:
+            bool
+        """
+        if register_uid in self._volatile:
+            return False
+        return self.default_non_volatile or register_uid in self._non_volatile
+
+    def get(self, register_uid):
+        """Gets the shadow value of a non-volatile register.
+
+        Args:
+            register_uid: {string}
+
+        Return:
+            register_data {int} None if the register is volatile or its value is not known
+        """
+        if not self.is_non_volatile(register_uid):
+            return None
+        return self._values.get(register_uid)
+
+    def get_known_value(self, register_uid):
+        """Gets the last known device value of a register, regardless of its volatility.
+
+        Args:
+            register_uid: {string}
+
+        Return:
+            register_data {int} None if the value is not known
+        """
+        return self._values.get(register_uid)
+
+    def update(self, register_uid, register_data):
+        """Updates the last known device value of a register.
+
+        Args:
+            register_uid: {string}
+            register_data: {int}
+        """
+        self._values[register_uid] = register_data
+
+    def update_multiple(self, register_uid_list, register_data_list):
+        """Updates the last known device value of multiple registers.
+
+        Args:
+            register_uid_list: {list of string}
+            register_data_list: {list of int}
+        """
+        self._values.update(zip(register_uid_list, register_data_list))
+
+    def invalidate(self, register_uid=None):
+        """Discards the shadow value of a register.
+
+        Args:
+            register_uid: {string} if not specified, all the shadow values are discarded
+        """
+        if register_uid is None:
+            self._values.clear()
+        else:
+            self._values.pop(register_uid, None)
+
+    def invalidate_register_group(self, uid):
+        """Discards the shadow values of the registers in the register group of the given UID.
+
+        This is used when a field is written, as the register of the field is not known.
+
+        Args:
+            uid: {string} register or field UID <IP block>-<Register group>-<Name>
+        """
+        prefix = "-".join(uid.split("-", 2)[:2]) + "-"
+        for register_uid in [key for key in self._values if key.startswith(prefix)]:
+            del self._values[register_uid]
@@ -0,0 +1,862 @@
+r"""This file is used for the simulated Semi Device Control backend.
+
+The simulated backend holds the registers, fields, pins and scripts of a device in memory
+and implements the same methods as the .NET Semi Device Control session, so that it can be
+used in place of SemiDeviceControlMain to run, benchmark or load test a test program without
+the Semi Device Control addon.
+
+The register map description used to seed the simulation is a dictionary (or a JSON file)
+of the below format. Only "registers" is mandatory.
+
+    {
+        "registers": [
+            {
+                "uid": "LPS22HH-Control_Register-CTRL_REG1",
+                "address": 16,
+                "size": 8,
+                "default": 0,
+                "fields": [
+                    {
+                        "uid": "LPS22HH-Control_Register-ODR",
+                        "offset": 4,
+                        "width": 3,
+                        "values": {"Power down": 0, "1 Hz": 1}
+                    }
+                ]
+            }
+        ],
+        "pins": {"Vdd": 0, "CS": 0},
+        "scripts": {"PowerUpInI2C": "writedio Vdd High\\nwritedio CS High"},
+        "interfaces": [{"name": "Simulation1", "type": "Simulation"}]
+    }
+"""
+import collections
+import enum
+import json
+import time
+
+SCRIPT_FILE_EXTENSION = ".sdcscript"
+# Maximum number of transactions kept in the simulated logs, the oldest ones are dropped.
+LOG_CAPACITY = 10000
+
+RegisterAddress = collections.namedtuple("RegisterAddress", ["UniqueID", "Address"])
+FieldDefinition = collections.namedtuple("FieldDefinition", ["DisplayValues", "Values", "Size"])
+DeviceStateKeys = collections.namedtuple("DeviceStateKeys", ["RegisterUIDs", "FieldUIDs"])
+InterfaceDetail = collections.namedtuple("InterfaceDetail", ["Name", "Type"])
+ScriptDetail = collections.namedtuple("ScriptDetail", ["IsScriptValid", "ScriptContent"])
+GrpcSessionOptions = collections.namedtuple(
+    "GrpcSessionOptions", ["Address", "Port", "SessionName", "ResourceName"]
+)
+
+
+class PinState(enum.IntEnum):
+    """This class contains the simulated pin states."""
+
+    Low = 0
+    High = 1
+    Terminate = 2
+
+
+def load_register_map_description(file_path):
+    """Loads the register map description used to seed the simulated device from a JSON file.
+
+    Args:
+        file_path: {string}
+
+    Return:
+        register_map {dict}
+    """
+    with open(file_path, "r", encoding="utf-8-sig") as register_map_file:
+        return json.load(register_map_file)
+
+
+def get_ip_block_name(uid):
+    """Gets the IP block name from the register or field unique name.
+
+    Args:
+        uid: {string}
+
+    Return:
+        ip_block_name {string}
+    """
+    return uid.split("-", 1)[0]
+
+
+def generate_register_map_description(
+    register_count, fields_per_register=4, ip_block_count=1, register_group_count=1, pin_count=4
+):
+    """Generates a register map description of the given size, for benchmark and load tests.
+
+    The registers are 8 bit wide and evenly distributed across the IP blocks and register
+    groups, each register contains the given number of fields of equal width.
+
+    Args:
+        register_count: {int}
+        fields_per_register: {int} 0, 1, 2, 4 or 8
+        ip_block_count: {int}
+        register_group_count: {int}
+        pin_count: {int}
+
+    Return:
+        register_map {dict}
+    """
+    field_width = 8 // fields_per_register if fields_per_register else 0
+    registers = []
+    for index in range(register_count):
+        ip_block_name = "IPBlock{}".format(index % ip_block_count)
+        register_group = "Group{}".format((index // ip_block_count) % register_group_count)
+        prefix = "{}-{}-".format(ip_block_name, register_group)
+        registers.append(
+            {
+                "uid": "{}REG{}".format(prefix, index),
+                "address": index // ip_block_count,
+                "size": 8,
+                "default": 0,
+                "fields": [
+                    {
+                        "uid": "{}REG{}_F{}".format(prefix, index, field_index),
+                        "offset": field_index * field_width,
+                        "width": field_width,
+                        "values": {"Disabled": 0, "Enabled": 1},
+                    }
+                    for field_index in range(fields_per_register)
+                ],
+            }
+        )
+    pins = ["P{}".format(index) for index in range(pin_count)]
+    return {
+        "registers": registers,
+        "pins": {pin_name: 0 for pin_name in pins},
+        "scripts": {
+            "PowerUp": "\n".join("writedio {} High".format(pin_name) for pin_name in pins),
+            "PowerDown": "\n".join("writedio {} Low".format(pin_name) for pin_name in pins),
+        },
+        "interfaces": [{"name": "Simulation1", "type": "Simulation"}],
+    }
+
+
+class LatencyModel:
+    """This class models the latency of the simulated device calls.
+
+    The latency of a call is the fixed latency configured for the method (or the default
+    latency) plus the per element latency multiplied by the number of registers or fields
+    accessed by the call.
+    """
+
+    def __init__(self, default_latency=0.0, default_element_latency=0.0, realtime=False):
+        """Creates the latency model.
+
+        Args:
+            default_latency: {float} latency in seconds applied to every call
+            default_element_latency: {float} latency in seconds applied per accessed element
+            realtime: {bool} if True, the calls sleep for the modelled latency,
+                else the latency is only accumulated in the simulated time of the session.
+        """
+        self.default_latency = default_latency
+        self.default_element_latency = default_element_latency
+        self.realtime = realtime
+        self._call_latencies = {}
+
+    def set_call_latency(self, method_name, latency, element_latency=0.0):
+        """Configures the latency of a simulated session method.
+
+        Args:
+            method_name: {string} .NET method name, for example "ReadRegisterByName_Device"
+            latency: {float} latency in seconds applied to every call of the method
+            element_latency: {float} latency in seconds applied per accessed element
+        """
+        self._call_latencies[method_name] = (latency, element_latency)
+
+    def get_latency(self, method_name, element_count=1):
+        """Gets the modelled latency of a call.
+
+        Args:
+            method_name: {string}
+            element_count: {int}
+
+        Return:
+            latency {float} in seconds
+        """
+        latency, element_latency = self._call_latencies.get(
+            method_name, (self.default_latency, self.default_element_latency)
+        )
+        return latency + element_latency * element_count
+
+
+class _SimulatedField:
+    def __init__(self, uid, register, offset, width, values):
+        self.uid = uid
+        self.register = register
+        self.offset = offset
+        self.width = width
+        self.mask = ((1 << width) - 1) << offset
+        self.display_values = list(values.keys())
+        self.values = list(values.values())
+        self.value_definitions = dict(values)
+
+    def extract(self, register_data):
+        return (register_data & self.mask) >> self.offset
+
+    def insert(self, register_data, field_data):
+        if field_data < 0 or field_data >= (1 << self.width):
+            raise ValueError(
+                "Data {} is out of range for the field {}".format(field_data, self.uid)
+            )
+        return (register_data & ~self.mask) | (field_data << self.offset)
+
+
+class _SimulatedRegister:
+    def __init__(self, uid, address, size, default):
+        self.uid = uid
+        self.ip_block_name = get_ip_block_name(uid)
+        self.address = address
+        self.size = size
+        self.default = default
+        self.fields = []
+
+    def validate(self, register_data):
+        if register_data < 0 or register_data >= (1 << self.size):
+            raise ValueError(
+                "Data {} is out of range for the register {}".format(register_data, self.uid)
+            )
+        return register_data
+
+
+class SimulatedSemiDeviceControlSession:
+    """This class simulates the .NET Semi Device Control session in memory."""
+
+    def __init__(self, register_map, latency_model=None, isconfigpath=None, log_transactions=True):
+        """Creates the simulated session seeded from the register map description.
+
+        Args:
+            register_map: {dict} register map description, refer the module documentation
+            latency_model: {LatencyModel} if not specified, the calls have no latency
+            isconfigpath: {string} the isconfig path the session is created for
+            log_transactions: {bool} if True, every device transaction is added to the logs,
+                up to LOG_CAPACITY transactions
+        """
+        self.latency_model = latency_model if latency_model is not None else LatencyModel()
+        self.isconfigpath = isconfigpath
+        self.log_transactions = log_transactions
+        self.simulated_time = 0.0
+        self.call_count = 0
+        self.is_started = False
+
+        self._registers = collections.OrderedDict()
+        self._registers_by_address = {}
+        self._fields = collections.OrderedDict()
+        for register_description in register_map.get("registers", []):
+            register = _SimulatedRegister(
+                register_description["uid"],
+                register_description["address"],
+                register_description.get("size", 8),
+                register_description.get("default", 0),
+            )
+            self._registers[register.uid] = register
+            self._registers_by_address[(register.ip_block_name, register.address)] = register
+            for field_description in register_description.get("fields", []):
+                field = _SimulatedField(
+                    field_description["uid"],
+                    register,
+                    field_description["offset"],
+                    field_description["width"],
+                    field_description.get("values", {}),
+                )
+                register.fields.append(field)
+                self._fields[field.uid] = field
+
+        self._default_pin_states = dict(register_map.get("pins", {}))
+        self._scripts = dict(register_map.get("scripts", {}))
+        self._interfaces = [
+            InterfaceDetail(interface["name"], interface["type"])
+            for interface in register_map.get("interfaces", [])
+        ]
+        self._device = {}
+        self._cache = collections.OrderedDict()
+        self._custom_registers = {}
+        self._pin_states = {}
+        self._protocol_settings = {}
+        self._interface_settings = {}
+        self._logs = collections.deque(maxlen=LOG_CAPACITY)
+        self.ResetToDefaultState()
+
+    # ------------------------------ Simulation ------------------------------
+    def _transaction(self, method_name, element_count=1, message=None):
+        latency = self.latency_model.get_latency(method_name, element_count)
+        self.call_count += 1
+        self.simulated_time += latency
+        if self.latency_model.realtime and latency > 0:
+            time.sleep(latency)
+        if self.log_transactions:
+            self._logs.append(
+                [
+                    "{:.9f}".format(self.simulated_time),
+                    method_name,
+                    message if message is not None else "",
+                ]
+            )
+
+    def _get_register(self, register_uid):
+        try:
+            return self._registers[register_uid]
+        except KeyError:
+            raise ValueError("Invalid register unique ID: {}".format(register_uid)) from None
+
+    def _get_register_by_address(self, ip_block_name, register_address):
+        try:
+            return self._registers_by_address[(ip_block_name, register_address)]
+        except KeyError:
+            raise ValueError(
+                "Invalid register address {} for the IP block {}".format(
+                    register_address, ip_block_name
+                )
+            ) from None
+
+    def _get_field(self, field_uid):
+        try:
+            return self._fields[field_uid]
+        except KeyError:
+            raise ValueError("Invalid field unique ID: {}".format(field_uid)) from None
+
+    def _get_value_definition(self, field, value_definition):
+        try:
+            return field.value_definitions[value_definition]
+        except KeyError:
+            raise ValueError(
+                "Invalid value definition {} for the field {}".format(value_definition, field.uid)
+            ) from None
+
+    def _read_cache(self, register):
+        return self._cache.get(register.uid, self._device[register.uid])
+
+    def _write_cache(self, register, register_data):
+        self._cache.pop(register.uid, None)
+        self._cache[register.uid] = register.validate(register_data)
+
+    def _get_script_content(self, file_name):
+        script_name = file_name
+        if script_name.endswith(SCRIPT_FILE_EXTENSION):
+            script_name = script_name[: -len(SCRIPT_FILE_EXTENSION)]
+        try:
+            return self._scripts[script_name]
+        except KeyError:
+            raise ValueError("Invalid script name: {}".format(file_name)) from None
+
+    def _run_script(self, method_name, script_string):
+        results = []
+        commands = [line.strip() for line in script_string.splitlines() if line.strip()]
+        for command in commands:
+            arguments = command.split()
+            if arguments[0].lower() != "writedio" or len(arguments) != 3:
+                raise ValueError("Invalid script command: {}".format(command))
+            self._pin_states[arguments[1]] = PinState[arguments[2].capitalize()]
+            results.append(json.dumps({"Command": command, "Status": "Success"}))
+        self._transaction(method_name, len(commands), script_string)
+        return results
+
+    # ------------------------------ Session ------------------------------
+    def Start(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET Start method."""
+        self._transaction("Start")
+        self.is_started = True
+
+    def Stop(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET Stop method."""
+        self._transaction("Stop")
+        self.is_started = False
+
+    # ------------------------------ Register Device ------------------------------
+    def WriteRegisterByName_Device(  # noqa: N802 - mirrors the .NET method name
+        self, register_uid, register_data
+    ):
+        """Simulates the .NET WriteRegisterByName_Device method."""
+        register = self._get_register(register_uid)
+        self._device[register.uid] = register.validate(register_data)
+        self._transaction("WriteRegisterByName_Device", 1, register_uid)
+
+    def WriteMultipleRegistersByName_Device(  # noqa: N802 - mirrors the .NET method name
+        self, register_uid_list, register_data_list
+    ):
+        """Simulates the .NET WriteMultipleRegistersByName_Device method."""
+        registers = [self._get_register(register_uid) for register_uid in register_uid_list]
+        for register, register_data in zip(registers, register_data_list):
+            self._device[register.uid] = register.validate(register_data)
+        self._transaction("WriteMultipleRegistersByName_Device", len(registers))
+
+    def WriteRegisterByAddress_Device(  # noqa: N802 - mirrors the .NET method name
+        self, ip_block_name, register_address, register_data
+    ):
+        """Simulates the .NET WriteRegisterByAddress_Device method."""
+        register = self._get_register_by_address(ip_block_name, register_address)
+        self._device[register.uid] = register.validate(register_data)
+        self._transaction("WriteRegisterByAddress_Device", 1, register.uid)
+
+    def WriteMultipleRegistersByAddress_Device(  # noqa: N802 - mirrors the .NET method name
+        self, ip_block_name_list, register_address_list, register_data_list
+    ):
+        """Simulates the .NET WriteMultipleRegistersByAddress_Device method."""
+        registers = [
+            self._get_register_by_address(ip_block_name, register_address)
+            for ip_block_name, register_address in zip(ip_block_name_list, register_address_list)
+        ]
+        for register, register_data in zip(registers, register_data_list):
+            self._device[register.uid] = register.validate(register_data)
+        self._transaction("WriteMultipleRegistersByAddress_Device", len(registers))
+
+    def WriteCustomRegisterByAddress_Device(  # noqa: N802 - mirrors the .NET method name
+        self,
+        register_address,
+        address_size,
+        register_data,
+        register_size,
+        interface_name,
+        protocol_name,
+    ):
+        """Simulates the .NET WriteCustomRegisterByAddress_Device method."""
+        self._custom_registers[(interface_name, protocol_name, register_address)] = register_data
+        self._transaction("WriteCustomRegisterByAddress_Device")
+
+    def ReadRegisterByName_Device(self, register_uid):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET ReadRegisterByName_Device method."""
+        register = self._get_register(register_uid)
+        self._transaction("ReadRegisterByName_Device", 1, register_uid)
+        return self._device[register.uid]
+
+    def ReadMultipleRegistersByName_Device(  # noqa: N802 - mirrors the .NET method name
+        self, register_uid_list
+    ):
+        """Simulates the .NET ReadMultipleRegistersByName_Device method."""
+        registers = [self._get_register(register_uid) for register_uid in register_uid_list]
+        self._transaction("ReadMultipleRegistersByName_Device", len(registers))
+        return [self._device[register.uid] for register in registers]
+
+    def ReadRegisterByAddress_Device(  # noqa: N802 - mirrors the .NET method name
+        self, ip_block_name, register_address
+    ):
+        """Simulates the .NET ReadRegisterByAddress_Device method."""
+        register = self._get_register_by_address(ip_block_name, register_address)
+        self._transaction("ReadRegisterByAddress_Device", 1, register.uid)
+        return self._device[register.uid]
+
+    def ReadMultipleRegistersByAddress_Device(  # noqa: N802 - mirrors the .NET method name
+        self, ip_block_name_list, register_address_list
+    ):
+        """Simulates the .NET ReadMultipleRegistersByAddress_Device method."""
+        registers = [
+            self._get_register_by_address(ip_block_name, register_address)
+            for ip_block_name, register_address in zip(ip_block_name_list, register_address_list)
+        ]
+        self._transaction("ReadMultipleRegistersByAddress_Device", len(registers))
+        return [self._device[register.uid] for register in registers]
+
+    def ReadCustomRegisterByAddress_Device(  # noqa: N802 - mirrors the .NET method name
+        self, register_address, address_size, register_size, interface_name, protocol_name
+    ):
+        """Simulates the .NET ReadCustomRegisterByAddress_Device method."""
+        self._transaction("ReadCustomRegisterByAddress_Device")
+        return self._custom_registers.get((interface_name, protocol_name, register_address), 0)
+
+    def GetRegisterAddresses(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET GetRegisterAddresses method."""
+        return [
+            RegisterAddress(register.uid, register.address) for register in self._registers.values()
+        ]
+
+    # ------------------------------ Field Device ------------------------------
+    def WriteFieldByName_Device(  # noqa: N802 - mirrors the .NET method name
+        self, field_uid, field_data
+    ):
+        """Simulates the .NET WriteFieldByName_Device method."""
+        field = self._get_field(field_uid)
+        register_uid = field.register.uid
+        self._device[register_uid] = field.insert(self._device[register_uid], field_data)
+        self._transaction("WriteFieldByName_Device", 1, field_uid)
+
+    def WriteMultipleFieldsByName_Device(  # noqa: N802 - mirrors the .NET method name
+        self, field_uid_list, field_data_list
+    ):
+        """Simulates the .NET WriteMultipleFieldsByName_Device method."""
+        fields = [self._get_field(field_uid) for field_uid in field_uid_list]
+        for field, field_data in zip(fields, field_data_list):
+            register_uid = field.register.uid
+            self._device[register_uid] = field.insert(self._device[register_uid], field_data)
+        self._transaction("WriteMultipleFieldsByName_Device", len(fields))
+
+    def WriteFieldByValueDefinition_Device(  # noqa: N802 - mirrors the .NET method name
+        self, field_uid, value_definition
+    ):
+        """Simulates the .NET WriteFieldByValueDefinition_Device method."""
+        field = self._get_field(field_uid)
+        field_data = self._get_value_definition(field, value_definition)
+        register_uid = field.register.uid
+        self._device[register_uid] = field.insert(self._device[register_uid], field_data)
+        self._transaction("WriteFieldByValueDefinition_Device", 1, field_uid)
+
+    def ReadFieldByName_Device(self, field_uid):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET ReadFieldByName_Device method."""
+        field = self._get_field(field_uid)
+        self._transaction("ReadFieldByName_Device", 1, field_uid)
+        return field.extract(self._device[field.register.uid])
+
+    def ReadMultipleFieldsByName_Device(  # noqa: N802 - mirrors the .NET method name
+        self, field_uid_list
+    ):
+        """Simulates the .NET ReadMultipleFieldsByName_Device method."""
+        fields = [self._get_field(field_uid) for field_uid in field_uid_list]
+        self._transaction("ReadMultipleFieldsByName_Device", len(fields))
+        return [field.extract(self._device[field.register.uid]) for field in fields]
+
+    def GetFieldDefinitionDetails(self, field_uid):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET GetFieldDefinitionDetails method."""
+        field = self._get_field(field_uid)
+        return FieldDefinition(list(field.display_values), list(field.values), field.width)
+
+    # ------------------------------ Register Cache ------------------------------
+    def WriteRegisterByName_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, register_uid, register_data
+    ):
+        """Simulates the .NET WriteRegisterByName_Cache method."""
+        self._write_cache(self._get_register(register_uid), register_data)
+
+    def WriteMultipleRegistersByName_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, register_uid_list, register_data_list
+    ):
+        """Simulates the .NET WriteMultipleRegistersByName_Cache method."""
+        registers = [self._get_register(register_uid) for register_uid in register_uid_list]
+        for register, register_data in zip(registers, register_data_list):
+            self._write_cache(register, register_data)
+
+    def WriteRegisterByAddress_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, ip_block_name, register_address, register_data
+    ):
+        """Simulates the .NET WriteRegisterByAddress_Cache method."""
+        register = self._get_register_by_address(ip_block_name, register_address)
+        self._write_cache(register, register_data)
+
+    def WriteMultipleRegistersByAddress_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, ip_block_name_list, register_address_list, register_data_list
+    ):
+        """Simulates the .NET WriteMultipleRegistersByAddress_Cache method."""
+        for ip_block_name, register_address, register_data in zip(
+            ip_block_name_list, register_address_list, register_data_list
+        ):
+            register = self._get_register_by_address(ip_block_name, register_address)
+            self._write_cache(register, register_data)
+
+    def ReadRegisterByName_Cache(self, register_uid):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET ReadRegisterByName_Cache method."""
+        return self._read_cache(self._get_register(register_uid))
+
+    def ReadMultipleRegistersByName_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, register_uid_list
+    ):
+        """Simulates the .NET ReadMultipleRegistersByName_Cache method."""
+        return [
+            self._read_cache(self._get_register(register_uid)) for register_uid in register_uid_list
+        ]
+
+    def ReadRegisterByAddress_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, ip_block_name, register_address
+    ):
+        """Simulates the .NET ReadRegisterByAddress_Cache method."""
+        return self._read_cache(self._get_register_by_address(ip_block_name, register_address))
+
+    def ReadMultipleRegistersByAddress_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, ip_block_name_list, register_address_list
+    ):
+        """Simulates the .NET ReadMultipleRegistersByAddress_Cache method."""
+        return [
+            self._read_cache(self._get_register_by_address(ip_block_name, register_address))
+            for ip_block_name, register_address in zip(ip_block_name_list, register_address_list)
+        ]
+
+    ReadMultipleRegistersByAddress = ReadMultipleRegistersByAddress_Cache
+
+    # ------------------------------ Field Cache ------------------------------
+    def WriteFieldByName_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, field_uid, field_data
+    ):
+        """Simulates the .NET WriteFieldByName_Cache method."""
+        field = self._get_field(field_uid)
+        register_data = self._read_cache(field.register)
+        self._write_cache(field.register, field.insert(register_data, field_data))
+
+    def WriteMultipleFieldsByName_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, field_uid_list, field_data_list
+    ):
+        """Simulates the .NET WriteMultipleFieldsByName_Cache method."""
+        for field_uid, field_data in zip(field_uid_list, field_data_list):
+            self.WriteFieldByName_Cache(field_uid, field_data)
+
+    def WriteFieldByValueDefinition_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, field_uid, value_definition
+    ):
+        """Simulates the .NET WriteFieldByValueDefinition_Cache method."""
+        field = self._get_field(field_uid)
+        self.WriteFieldByName_Cache(field_uid, self._get_value_definition(field, value_definition))
+
+    def ReadFieldByName_Cache(self, field_uid):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET ReadFieldByName_Cache method."""
+        field = self._get_field(field_uid)
+        return field.extract(self._read_cache(field.register))
+
+    def ReadMultipleFieldsByName_Cache(  # noqa: N802 - mirrors the .NET method name
+        self, field_uid_list
+    ):
+        """Simulates the .NET ReadMultipleFieldsByName_Cache method."""
+        return [self.ReadFieldByName_Cache(field_uid) for field_uid in field_uid_list]
+
+    # ------------------------------ Cache ------------------------------
+    def WriteFromCacheToDevice(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET WriteFromCacheToDevice method."""
+        for register_uid, register_data in self._cache.items():
+            self._device[register_uid] = register_data
+        self._transaction("WriteFromCacheToDevice", len(self._cache))
+        self._cache.clear()
+
+    def ClearCache(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET ClearCache method."""
+        self._cache.clear()
+
+    # ------------------------------ DIO ------------------------------
+    def ReadPinState(self, pin_name):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET ReadPinState method."""
+        if pin_name not in self._pin_states:
+            raise ValueError("Invalid pin name: {}".format(pin_name))
+        self._transaction("ReadPinState", 1, pin_name)
+        return self._pin_states[pin_name]
+
+    def WritePinState(self, pin_name, pin_state):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET WritePinState method."""
+        if pin_name not in self._pin_states:
+            raise ValueError("Invalid pin name: {}".format(pin_name))
+        self._pin_states[pin_name] = PinState(int(pin_state))
+        self._transaction("WritePinState", 1, pin_name)
+
+    # ------------------------------ Scripts ------------------------------
+    def ExecuteScript(  # noqa: N802 - mirrors the .NET method name
+        self, file_name, wait_until_complete
+    ):
+        """Simulates the .NET ExecuteScript method."""
+        return self._run_script("ExecuteScript", self._get_script_content(file_name))
+
+    def ExecuteScriptCommand(  # noqa: N802 - mirrors the .NET method name
+        self, script_string, wait_until_complete
+    ):
+        """Simulates the .NET ExecuteScriptCommand method."""
+        return self._run_script("ExecuteScriptCommand", script_string)
+
+    def AbortScript(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET AbortScript method."""
+        pass
+
+    def GetScriptFileName(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET GetScriptFileName method."""
+        return [script_name + SCRIPT_FILE_EXTENSION for script_name in self._scripts]
+
+    def GetScriptString(self, script_name):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET GetScriptString method."""
+        try:
+            return ScriptDetail(True, self._get_script_content(script_name))
+        except ValueError:
+            return ScriptDetail(False, "")
+
+    # ------------------------------ Utils ------------------------------
+    def GetLogs(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET GetLogs method."""
+        return [list(log) for log in self._logs]
+
+    def ResetToDefaultState(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET ResetToDefaultState method."""
+        for register in self._registers.values():
+            self._device[register.uid] = register.default
+        self._cache.clear()
+        self._pin_states = {
+            pin_name: PinState(int(pin_state))
+            for pin_name, pin_state in self._default_pin_states.items()
+        }
+
+    def GetProtocolDynamicSetting(  # noqa: N802 - mirrors the .NET method name
+        self, interface_name, protocol_name, setting_name
+    ):
+        """Simulates the .NET GetProtocolDynamicSetting method."""
+        return self._protocol_settings.get((interface_name, protocol_name, setting_name), "")
+
+    def SetProtocolDynamicSetting(  # noqa: N802 - mirrors the .NET method name
+        self, interface_name, protocol_name, setting_name, setting_value
+    ):
+        """Simulates the .NET SetProtocolDynamicSetting method."""
+        self._protocol_settings[(interface_name, protocol_name, setting_name)] = setting_value
+        self._transaction("SetProtocolDynamicSetting", 1, setting_name)
+
+    def GetInterfaceDynamicSetting(  # noqa: N802 - mirrors the .NET method name
+        self, interface_name, setting_name
+    ):
+        """Simulates the .NET GetInterfaceDynamicSetting method."""
+        return self._interface_settings.get((interface_name, setting_name), "")
+
+    def SetInterfaceDynamicSetting(  # noqa: N802 - mirrors the .NET method name
+        self, interface_name, setting_name, setting_value
+    ):
+        """Simulates the .NET SetInterfaceDynamicSetting method."""
+        self._interface_settings[(interface_name, setting_name)] = setting_value
+        self._transaction("SetInterfaceDynamicSetting", 1, setting_name)
+
+    def GetInterfaceSessionID(self, interface_name):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET GetInterfaceSessionID method."""
+        return self._get_interface_index(interface_name) + 1
+
+    def GetGrpcSessionOptions(self, interface_name):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET GetGrpcSessionOptions method."""
+        self._get_interface_index(interface_name)
+        return GrpcSessionOptions("localhost", 31763, interface_name, interface_name)
+
+    def GetInterfaceDetails(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET GetInterfaceDetails method."""
+        return list(self._interfaces)
+
+    def GetDeviceStateKeys(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET GetDeviceStateKeys method."""
+        return DeviceStateKeys(list(self._registers), list(self._fields))
+
+    def _get_interface_index(self, interface_name):
+        for index, interface in enumerate(self._interfaces):
+            if interface.Name == interface_name:
+                return index
+        raise ValueError("Invalid interface name: {}".format(interface_name))
+
+
+class SimulatedI3CSession:
+    """This class simulates the .NET Semi Device Control I3C session in memory."""
+
+    def __init__(self, semidevicecontrol_session, interface_name, protocol_name):
+        """Creates the simulated I3C session on the simulated Semi Device Control session.
+
+        Args:
+            semidevicecontrol_session: {SimulatedSemiDeviceControlSession}
+            interface_name: {string}
+            protocol_name: {string}
+        """
+        self.semidevicecontrol_session = semidevicecontrol_session
+        self.interface_name = interface_name
+        self.protocol_name = protocol_name
+        self.dynamic_address = -1
+        self._ccc_data = {}
+
+    def ExecuteDynamicAddressingCCC(  # noqa: N802 - mirrors the .NET method name
+        self, ccc_type, command_id, dynamic_address
+    ):
+        """Simulates the .NET ExecuteDynamicAddressingCCC method."""
+        if dynamic_address != -1:
+            self.dynamic_address = dynamic_address
+        self.semidevicecontrol_session._transaction("ExecuteDynamicAddressingCCC")
+
+    def ExecuteDynamicAddressingCCCWithRead(  # noqa: N802 - mirrors the .NET method name
+        self, ccc_type, command_id, dynamic_address
+    ):
+        """Simulates the .NET ExecuteDynamicAddressingCCCWithRead method."""
+        if dynamic_address != -1:
+            self.dynamic_address = dynamic_address
+        self.semidevicecontrol_session._transaction("ExecuteDynamicAddressingCCCWithRead", 8)
+        return [0] * 8
+
+    def ExecuteSDRCCCWrite(  # noqa: N802 - mirrors the .NET method name
+        self, ccc_type, command_id, defining_byte, write_data
+    ):
+        """Simulates the .NET ExecuteSDRCCCWrite method."""
+        write_data = list(write_data) if write_data is not None else []
+        self._ccc_data[(command_id, defining_byte)] = write_data
+        self.semidevicecontrol_session._transaction("ExecuteSDRCCCWrite", len(write_data))
+
+    def ExecuteSDRCCCRead(  # noqa: N802 - mirrors the .NET method name
+        self, ccc_type, command_id, defining_byte, read_byte_length
+    ):
+        """Simulates the .NET ExecuteSDRCCCRead method."""
+        read_data = self._ccc_data.get((command_id, defining_byte), [])
+        if read_byte_length >= 0:
+            read_data = (read_data + [0] * read_byte_length)[:read_byte_length]
+        self.semidevicecontrol_session._transaction("ExecuteSDRCCCRead", len(read_data))
+        return list(read_data)
+
+
+class SimulatedSemiDeviceControlMain:
+    """This class simulates the .NET SemiDeviceControlMain.
+
+    It can be passed to SemiconductorDeviceControl in place of the .NET SemiDeviceControlMain.
+    """
+
+    PinState = PinState
+
+    def __init__(self, register_map, latency_model=None, log_transactions=True):
+        """Creates the simulated main seeded from the register map description.
+
+        Args:
+            register_map: {dict} register map description, refer the module documentation
+            latency_model: {LatencyModel} latency model shared by the created sessions
+            log_transactions: {bool} if True, every device transaction is added to the logs,
+                up to LOG_CAPACITY transactions
+        """
+        self.register_map = register_map
+        self.latency_model = latency_model
+        self.log_transactions = log_transactions
+        self.sessions = []
+
+    def CreateSemiDeviceControlSession(  # noqa: N802 - mirrors the .NET method name
+        self, isconfigpath
+    ):
+        """Simulates the .NET CreateSemiDeviceControlSession method."""
+        session = SimulatedSemiDeviceControlSession(
+            self.register_map, self.latency_model, isconfigpath, self.log_transactions
+        )
+        self.sessions.append(session)
+        return session
+
+    def AttachToExistingSession(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET AttachToExistingSession method."""
+        if not self.sessions:
+            raise RuntimeError("There is no instantiated semi device control session")
+        return self.sessions[-1]
+
+    def DestroySemiDeviceControlSession(self, session):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET DestroySemiDeviceControlSession method."""
+        if session in self.sessions:
+            self.sessions.remove(session)
+
+
+class SimulatedBackend:
+    """This class provides the simulated device as the backend of the Semi Device Control API.
+
+    It can be passed to nisdc.backend.set_backend_resolver, so that every session created
+    afterwards uses the simulated device.
+    """
+
+    PinState = PinState
+
+    def __init__(self, register_map, latency_model=None, log_transactions=True):
+        """Creates the simulated backend seeded from the register map description.
+
+        Args:
+            register_map: {dict} register map description, refer the module documentation
+            latency_model: {LatencyModel} latency model shared by the created sessions
+            log_transactions: {bool} if True, every device transaction is added to the logs,
+                up to LOG_CAPACITY transactions
+        """
+        self.register_map = register_map
+        self.latency_model = latency_model
+        self.log_transactions = log_transactions
+
+    def __call__(self, assembly_name):
+        """Resolves the backend of the given assembly to the simulated backend."""
+        return self
+
+    def SemiDeviceControlMain(self):  # noqa: N802 - mirrors the .NET method name
+        """Simulates the .NET SemiDeviceControlMain method."""
+        return SimulatedSemiDeviceControlMain(
+            self.register_map, self.latency_model, self.log_transactions
+        )
+
+    def SemiconductorDeviceControlI3CSession(  # noqa: N802 - mirrors the .NET method name
+        self, semidevicecontrol_session, interface_name, protocol_name
+    ):
+        """Simulates the .NET SemiconductorDeviceControlI3CSession method."""
+        return SimulatedI3CSession(semidevicecontrol_session, interface_name, protocol_name)
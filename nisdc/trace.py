@@ -0,0 +1,407 @@
+"""This file is used for the binary transaction trace of the Semi Device Control API.
+
+The TraceRecorder is a session observer that records the device calls of the
+SemiconductorDeviceControl and SemiDeviceControlI3CSession sessions in a memory mapped file
+of fixed size records: the operation, the register, field or pin name, the address, the data
+and the monotonic start time and duration of the call. A multi register or multi field call
+is recorded as one record per element, the records after the first one have the
+TRACE_CONTINUATION flag. The strings (operations, names, exceptions) are stored once in a
+string table file next to the trace file, the new strings are written on flush and close.
+
+The TraceReader iterates the records of a trace lazily:
+
+    python -m nisdc.trace <trace file>
+"""
+import argparse
+import collections
+import mmap
+import struct
+import threading
+import time
+
+DEFAULT_TRACE_CAPACITY = 65536
+STRING_TABLE_SUFFIX = ".strings"
+
+TRACE_EXCEPTION = 1
+TRACE_CONTINUATION = 2
+TRACE_VALUE_STRING = 4
+
+_FILE_MAGIC = b"NISDCTR1"
+_FILE_VERSION = 1
+_HEADER = struct.Struct("<8sIIqqq")
+_HEADER_SIZE = 64
+_RECORD_COUNT_OFFSET = _HEADER.size - 8
+_RECORD_COUNT = struct.Struct("<q")
+# start time, elapsed time, operation, flags, name, exception, address, value
+_RECORD = struct.Struct("<qqIIiiqQ")
+_STRING_LENGTH = struct.Struct("<I")
+_VALUE_MASK = (1 << 64) - 1
+
+# Roles of the arguments of the traced session methods: N - name, A - address, V - value,
+# S - string value, None - not recorded. The bool is True if the result is the value.
+_TRACED_METHODS = {
+    "Start": ((), False),
+    "Stop": ((), False),
+    "WriteCustomRegisterByAddress_Device": (("A", None, "V", None, "N", None), False),
+    "ReadCustomRegisterByAddress_Device": (("A", None, None, "N", None), True),
+    "WriteFromCacheToDevice": ((), False),
+    "ClearCache": ((), False),
+    "ReadPinState": (("N",), True),
+    "WritePinState": (("N", "V"), False),
+    "ExecuteScript": (("N", None), False),
+    "ExecuteScriptCommand": (("S", None), False),
+    "AbortScript": ((), False),
+    "ResetToDefaultState": ((), False),
+    "SetProtocolDynamicSetting": ((None, None, "N", "S"), False),
+    "SetInterfaceDynamicSetting": ((None, "N", "S"), False),
+    # I3C
+    "ExecuteDynamicAddressingCCC": ((None, "A", "V"), False),
+    "ExecuteDynamicAddressingCCCWithRead": ((None, "A", None), True),
+    "ExecuteSDRCCCWrite": ((None, "A", None, "V"), False),
+    "ExecuteSDRCCCRead": ((None, "A", None, None), True),
+}
+for _suffix in ("_Device", "_Cache"):
+    _TRACED_METHODS.update(
+        {
+            "WriteRegisterByName" + _suffix: (("N", "V"), False),
+            "WriteMultipleRegistersByName" + _suffix: (("N", "V"), False),
+            "WriteRegisterByAddress" + _suffix: (("N", "A", "V"), False),
+            "WriteMultipleRegistersByAddress" + _suffix: (("N", "A", "V"), False),
+            "ReadRegisterByName" + _suffix: (("N",), True),
+            "ReadMultipleRegistersByName" + _suffix: (("N",), True),
+            "ReadRegisterByAddress" + _suffix: (("N", "A"), True),
+            "ReadMultipleRegistersByAddress" + _suffix: (("N", "A"), True),
+            "WriteFieldByName" + _suffix: (("N", "V"), False),
+            "WriteMultipleFieldsByName" + _suffix: (("N", "V"), False),
+            "WriteFieldByValueDefinition" + _suffix: (("N", "S"), False),
+            "ReadFieldByName" + _suffix: (("N",), True),
+            "ReadMultipleFieldsByName" + _suffix: (("N",), True),
+        }
+    )
+
+TraceRecord = collections.namedtuple(
+    "TraceRecord",
+    ["start_time", "elapsed_time", "operation", "flags", "name", "address", "value", "exception"],
+)
+TraceRecord.__doc__ = """Record of a traced call, the times are in nanoseconds.
+
+The start_time is from time.perf_counter_ns, refer TraceReader.get_wall_time_ns. The name,
+address and value are None if not applicable, the value is a string for the value
+definitions, script commands and settings. The exception is the text of the exception
+raised by the call, None if the call succeeded.
+"""
+
+
+def _is_sequence(value):
+    return not isinstance(value, str) and hasattr(value, "__len__")
+
+
+class TraceRecorder:
+    """This class appends the device calls of the sessions to a binary trace file.
+
+    Pass the recorder to SemiconductorDeviceControl.start_trace or to
+    SemiDeviceControlI3CSession.start_trace, several sessions can share a recorder.
+    """
+
+    def __init__(self, path, capacity=DEFAULT_TRACE_CAPACITY):
+        """Creates the trace file, replacing any existing trace file.
+
+        Args:
+            path: {string}
+            capacity: {int} initial number of records of the file, the file grows as needed
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._string_ids = {}
+        self._pending_strings = []
+        self._record_count = 0
+        self._capacity = max(int(capacity), 1)
+        self._string_file = open(path + STRING_TABLE_SUFFIX, "wb")
+        self._file = open(path, "w+b")
+        self._file.truncate(_HEADER_SIZE + self._capacity * _RECORD.size)
+        self._mapped_file = mmap.mmap(self._file.fileno(), 0)
+        _HEADER.pack_into(
+            self._mapped_file,
+            0,
+            _FILE_MAGIC,
+            _FILE_VERSION,
+            _RECORD.size,
+            time.time_ns(),
+            time.perf_counter_ns(),
+            0,
+        )
+
+    def __len__(self):
+        """Gets the number of records of the trace."""
+        return self._record_count
+
+    def __enter__(self):
+        """Returns the trace, the trace file is closed on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the trace file."""
+        self.close()
+
+    @property
+    def closed(self):
+        """True if the trace file is closed, bool."""
+        return self._mapped_file is None
+
+    def on_call(self, method_name, args, result, start_time, elapsed_time, exception):
+        """Records a call of a backend session, if it is a device call.
+
+        Args:
+            method_name: {string}
+            args: {tuple}
+            result: {object}
+            start_time: {int} in nanoseconds
+            elapsed_time: {int} in nanoseconds
+            exception: {Exception} None if the call succeeded
+        """
+        traced_method = _TRACED_METHODS.get(method_name)
+        if traced_method is None:
+            return
+        argument_roles, result_is_value = traced_method
+        names = addresses = values = None
+        value_is_string = False
+        for role, arg in zip(argument_roles, args):
+            if role == "N":
+                names = arg
+            elif role == "A":
+                addresses = arg
+            elif role == "V":
+                values = arg
+            elif role == "S":
+                values = arg
+                value_is_string = True
+        if result_is_value and exception is None:
+            values = result
+
+        columns = (names, addresses, values)
+        is_multiple = any(_is_sequence(column) for column in columns)
+        if is_multiple:
+            columns = [list(column) if _is_sequence(column) else column for column in columns]
+            rows = [
+                [
+                    (column[index] if index < len(column) else None)
+                    if isinstance(column, list)
+                    else column
+                    for column in columns
+                ]
+                for index in range(
+                    max(len(column) for column in columns if isinstance(column, list))
+                )
+            ] or [(None, None, None)]
+        else:
+            rows = (columns,)
+
+        with self._lock:
+            if self._mapped_file is None:
+                return
+            get_string_id = self._get_string_id
+            operation = get_string_id(method_name)
+            flags = TRACE_VALUE_STRING if value_is_string else 0
+            exception_id = -1
+            if exception is not None:
+                flags |= TRACE_EXCEPTION
+                exception_id = get_string_id("{}: {}".format(type(exception).__name__, exception))
+            for name, address, value in rows:
+                self._append(
+                    start_time,
+                    elapsed_time,
+                    operation,
+                    flags,
+                    -1 if name is None else get_string_id(str(name)),
+                    exception_id,
+                    0 if address is None else int(address),
+                    self._get_value(value, value_is_string),
+                )
+                flags |= TRACE_CONTINUATION
+
+    def flush(self):
+        """Writes the records and the string table to the disk."""
+        with self._lock:
+            if self._mapped_file is not None:
+                self._mapped_file.flush()
+                self._write_pending_strings()
+                self._string_file.flush()
+
+    def close(self):
+        """Closes the trace file, the file is truncated to the recorded records."""
+        with self._lock:
+            if self._mapped_file is None:
+                return
+            self._mapped_file.flush()
+            self._mapped_file.close()
+            self._mapped_file = None
+            self._file.truncate(_HEADER_SIZE + self._record_count * _RECORD.size)
+            self._file.close()
+            self._write_pending_strings()
+            self._string_file.close()
+
+    def _get_value(self, value, value_is_string):
+        if value is None:
+            return 0
+        if value_is_string:
+            return self._get_string_id(str(value))
+        return int(value) & _VALUE_MASK
+
+    def _append(self, *record):
+        if self._record_count == self._capacity:
+            self._grow()
+        _RECORD.pack_into(
+            self._mapped_file, _HEADER_SIZE + self._record_count * _RECORD.size, *record
+        )
+        self._record_count += 1
+        _RECORD_COUNT.pack_into(self._mapped_file, _RECORD_COUNT_OFFSET, self._record_count)
+
+    def _grow(self):
+        self._capacity *= 2
+        self._mapped_file.close()
+        self._file.truncate(_HEADER_SIZE + self._capacity * _RECORD.size)
+        self._mapped_file = mmap.mmap(self._file.fileno(), 0)
+
+    def _get_string_id(self, string):
+        string_id = self._string_ids.get(string)
+        if string_id is None:
+            string_id = self._string_ids[string] = len(self._string_ids)
+            encoded_string = string.encode("utf-8")
+            self._pending_strings.append(_STRING_LENGTH.pack(len(encoded_string)))
+            self._pending_strings.append(encoded_string)
+        return string_id
+
+    def _write_pending_strings(self):
+        if self._pending_strings:
+            self._string_file.write(b"".join(self._pending_strings))
+            self._pending_strings = []
+
+
+class TraceReader:
+    """This class reads the records of a trace file lazily."""
+
+    def __init__(self, path):
+        """Opens the trace file and loads its string table.
+
+        Args:
+            path: {string}
+        """
+        self.path = path
+        self.strings = []
+        with open(path + STRING_TABLE_SUFFIX, "rb") as string_file:
+            string_table = string_file.read()
+        offset = 0
+        while offset + _STRING_LENGTH.size <= len(string_table):
+            (length,) = _STRING_LENGTH.unpack_from(string_table, offset)
+            offset += _STRING_LENGTH.size
+            self.strings.append(string_table[offset : offset + length].decode("utf-8"))
+            offset += length
+
+        self._file = open(path, "rb")
+        self._mapped_file = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            record_size,
+            self.wall_time,
+            self.perf_time,
+            record_count,
+        ) = _HEADER.unpack_from(self._mapped_file, 0)
+        if magic != _FILE_MAGIC or version != _FILE_VERSION or record_size != _RECORD.size:
+            self.close()
+            raise ValueError("Invalid trace file: {}".format(path))
+        self._record_count = min(
+            record_count, (len(self._mapped_file) - _HEADER_SIZE) // _RECORD.size
+        )
+
+    def __len__(self):
+        """Gets the number of records of the trace."""
+        return self._record_count
+
+    def __getitem__(self, index):
+        """Gets the record at an index of the trace."""
+        if index < 0:
+            index += self._record_count
+        if not 0 <= index < self._record_count:
+            raise IndexError("Trace record index out of range: {}".format(index))
+        return self._get_record(index)
+
+    def __iter__(self):
+        """Iterates the records of the trace, one record at a time."""
+        for index in range(self._record_count):
+            yield self._get_record(index)
+
+    def __enter__(self):
+        """Returns the trace, the trace file is closed on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Closes the trace file."""
+        self.close()
+
+    def get_wall_time_ns(self, start_time):
+        """Converts the start time of a record to the wall clock time.
+
+        Args:
+            start_time: {int} in nanoseconds from time.perf_counter_ns
+
+        Return:
+            int - nanoseconds since the epoch
+        """
+        return self.wall_time + start_time - self.perf_time
+
+    def close(self):
+        """Closes the trace file."""
+        if self._mapped_file is not None:
+            self._mapped_file.close()
+            self._mapped_file = None
+            self._file.close()
+
+    def _get_record(self, index):
+        strings = self.strings
+        (
+            start_time,
+            elapsed_time,
+            operation,
+            flags,
+            name,
+            exception,
+            address,
+            value,
+        ) = _RECORD.unpack_from(self._mapped_file, _HEADER_SIZE + index * _RECORD.size)
+        return TraceRecord(
+            start_time,
+            elapsed_time,
+            strings[operation],
+            flags,
+            None if name < 0 else strings[name],
+            address,
+            strings[value] if flags & TRACE_VALUE_STRING else value,
+            None if exception < 0 else strings[exception],
+        )
+
+
+def main():
+    """Prints the records of a trace file, one line per record."""
+    parser = argparse.ArgumentParser(description="Prints the records of an nisdc trace file.")
+    parser.add_argument("path", help="trace file")
+    arguments = parser.parse_args()
+
+    with TraceReader(arguments.path) as trace_reader:
+        for record in trace_reader:
+            print(
+                "{:.9f} {:>10} {}{} {} {} {}{}".format(
+                    (record.start_time - trace_reader.perf_time) / 1e9,
+                    record.elapsed_time,
+                    "  " if record.flags & TRACE_CONTINUATION else "",
+                    record.operation,
+                    "" if record.name is None else record.name,
+                    record.address,
+                    record.value,
+                    "" if record.exception is None else " !" + record.exception,
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
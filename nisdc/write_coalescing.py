@@ -0,0 +1,90 @@
+"""This file is used for the write coalescing of the Semi Device Control API.
+
+The consecutive register writes on the device are queued and written in a single multiple
+register write, by name or by address, instead of one bus transaction per register.
+"""
+
+DEFAULT_FLUSH_THRESHOLD = 256
+
+WRITE_BY_NAME = "name"
+WRITE_BY_ADDRESS = "address"
+
+
+class WriteCoalescer:
+    """This class queues the consecutive register writes of the same kind."""
+
+    def __init__(self, flush_threshold=DEFAULT_FLUSH_THRESHOLD):
+        """Creates the empty write queue.
+
+        Args:
+            flush_threshold: {int} number of queued writes at which the queue is to be flushed
+        """
+        self.flush_threshold = flush_threshold
+        self.kind = None
+        self.register_uid_list = []
+        self.ip_block_name_list = []
+        self.register_address_list = []
+        self.register_data_list = []
+
+    def __len__(self):
+        """Gets the number of queued register writes."""
+        return len(self.register_data_list)
+
+    def is_full(self):
+        """Checks whether the flush threshold is reached.
+
+        Return:
+            bool
+        """
+        return len(self.register_data_list) >= self.flush_threshold
+
+    def queue_by_name(self, register_uid_list, register_data_list):
+        """Queues register writes by register UID.
+
+        The queue must be empty or contain only writes by register UID.
+
+        Args:
+            register_uid_list: {list of string}
+            register_data_list: {list of int}
+        """
+        self.kind = WRITE_BY_NAME
+        self.register_uid_list.extend(register_uid_list)
+        self.register_data_list.extend(register_data_list)
+
+    def queue_by_address(self, ip_block_name_list, register_address_list, register_data_list):
+        """Queues register writes by IP block name and register address.
+
+        The queue must be empty or contain only writes by register address.
+
+        Args:
+            ip_block_name_list: {list of string}
+            register_address_list: {list of int}
+            register_data_list: {list of int}
+        """
+        self.kind = WRITE_BY_ADDRESS
+        self.ip_block_name_list.extend(ip_block_name_list)
+        self.register_address_list.extend(register_address_list)
+        self.register_data_list.extend(register_data_list)
+
+    def take(self):
+        """Takes the queued writes out of the queue.
+
+        Return:
+            Tuple {string - kind, tuple - arguments of the multiple register write}
+            the kind is None if the queue is empty.
+        """
+        if self.kind == WRITE_BY_NAME:
+            writes = (WRITE_BY_NAME, (self.register_uid_list, self.register_data_list))
+        elif self.kind == WRITE_BY_ADDRESS:
+            writes = (
+                WRITE_BY_ADDRESS,
+                (self.ip_block_name_list, self.register_address_list, self.register_data_list),
+            )
+        else:
+            writes = (None, ())
+        self.kind = None
+        self.register_uid_list = []
+        self.ip_block_name_list = []
+        self.register_address_list = []
+        self.register_data_list = []
+        return writes
@@ -0,0 +1,48 @@
+"""Fixtures of the behavior tests, run on the simulated Semi Device Control session."""
+import pytest
+
+from nisdc.nisemidevicecontrol import SemiconductorDeviceControl
+from nisdc.simulation import SimulatedSemiDeviceControlMain, generate_register_map_description
+
+REGISTER_COUNT = 8
+FIELDS_PER_REGISTER = 4
+
+
+@pytest.fixture
+def register_map():
+    """Register map description of the simulated device."""
+    return generate_register_map_description(REGISTER_COUNT, FIELDS_PER_REGISTER)
+
+
+@pytest.fixture
+def semidevicecontrol_main(register_map):
+    """Simulated main object of the device control sessions."""
+    return SimulatedSemiDeviceControlMain(register_map)
+
+
+@pytest.fixture
+def semi_device_control(semidevicecontrol_main):
+    """Started device control session of the simulated device, instrumented."""
+    semi_device_control = SemiconductorDeviceControl("simulated.isconfig", semidevicecontrol_main)
+    semi_device_control.start()
+    semi_device_control.enable_instrumentation()
+    yield semi_device_control
+    semi_device_control.destroy()
+
+
+@pytest.fixture
+def simulated_session(semi_device_control, semidevicecontrol_main):
+    """Simulated session behind the device control session."""
+    return semidevicecontrol_main.sessions[-1]
+
+
+@pytest.fixture
+def device_calls(semi_device_control):
+    """Function getting the calls per session method made since its last call."""
+
+    def get_device_calls():
+        snapshot = semi_device_control.get_instrumentation_snapshot()
+        semi_device_control.reset_instrumentation()
+        return {method_name: statistics.calls for method_name, statistics in snapshot.items()}
+
+    return get_device_calls
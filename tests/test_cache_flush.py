@@ -0,0 +1,80 @@
+"""Behavior tests of the write from cache to device and its minimal diff mode."""
+
+REGISTER_UIDS = ["IPBlock0-Group0-REG{}".format(index) for index in range(3)]
+
+
+def test_write_from_cache_to_device___repeated_writes___counted_per_register(
+    semi_device_control, simulated_session
+):
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[0], 1)
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[0], 2)
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[1], 3)
+
+    cache_flush_result = semi_device_control.write_from_cache_to_device()
+
+    assert cache_flush_result == (3, 2, 1)
+    assert simulated_session.ReadMultipleRegistersByName_Device(REGISTER_UIDS[:2]) == [2, 3]
+
+
+def test_minimal_diff___repeated_writes___final_values_written_once(
+    semi_device_control, device_calls, simulated_session
+):
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[0], 1)
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[1], 2)
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[0], 3)
+
+    cache_flush_result = semi_device_control.write_from_cache_to_device(minimal_diff=True)
+
+    assert cache_flush_result == (3, 2, 1)
+    assert device_calls() == {
+        "WriteRegisterByName_Cache": 3,
+        "WriteMultipleRegistersByName_Device": 1,
+        "ClearCache": 1,
+    }
+    assert simulated_session.ReadMultipleRegistersByName_Device(REGISTER_UIDS[:2]) == [3, 2]
+
+
+def test_minimal_diff___unchanged_values___not_written(semi_device_control, device_calls):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[0], 5)
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[1], 6)
+    semi_device_control.write_from_cache_to_device(minimal_diff=True)
+    device_calls()
+
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[0], 5)
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[1], 7)
+    cache_flush_result = semi_device_control.write_from_cache_to_device(minimal_diff=True)
+
+    assert cache_flush_result == (2, 1, 1)
+    assert device_calls() == {
+        "WriteRegisterByName_Cache": 2,
+        "WriteMultipleRegistersByName_Device": 1,
+        "ClearCache": 1,
+    }
+    assert semi_device_control.read_register_by_name_device(REGISTER_UIDS[1]) == 7
+
+
+def test_minimal_diff___all_values_unchanged___no_device_write(semi_device_control, device_calls):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.write_register_by_name_device(REGISTER_UIDS[0], 5)
+    device_calls()
+
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[0], 5)
+    cache_flush_result = semi_device_control.write_from_cache_to_device(minimal_diff=True)
+
+    assert cache_flush_result == (1, 0, 1)
+    assert device_calls() == {"WriteRegisterByName_Cache": 1, "ClearCache": 1}
+
+
+def test_minimal_diff___after_restart___mirror_complete(semi_device_control, device_calls):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.stop()
+    semi_device_control.start()
+    device_calls()
+
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[0], 5)
+    semi_device_control.write_register_by_name_cache(REGISTER_UIDS[0], 6)
+    cache_flush_result = semi_device_control.write_from_cache_to_device(minimal_diff=True)
+
+    assert cache_flush_result == (2, 1, 1)
+    assert "WriteFromCacheToDevice" not in device_calls()
@@ -0,0 +1,63 @@
+"""Behavior tests of the diff-aware dynamic settings."""
+
+INTERFACE_NAME = "Simulation1"
+PROTOCOL_NAME = "I2C"
+
+
+def test_set_interface_dynamic_settings___unchanged_settings___not_set_again(
+    semi_device_control, device_calls
+):
+    settings = {"Voltage": "1.8", "Frequency": "400000"}
+    semi_device_control.set_interface_dynamic_settings(INTERFACE_NAME, settings)
+    device_calls()
+
+    changed_setting_names = semi_device_control.set_interface_dynamic_settings(
+        INTERFACE_NAME, {"Voltage": "1.8", "Frequency": "100000"}
+    )
+
+    assert changed_setting_names == ["Frequency"]
+    assert device_calls() == {"SetInterfaceDynamicSetting": 1}
+
+
+def test_set_protocol_dynamic_settings___unchanged_settings___not_set_again(
+    semi_device_control, device_calls
+):
+    settings = {"AddressWidth": "7", "ClockRate": "400000"}
+    semi_device_control.set_protocol_dynamic_settings(INTERFACE_NAME, PROTOCOL_NAME, settings)
+    device_calls()
+
+    changed_setting_names = semi_device_control.set_protocol_dynamic_settings(
+        INTERFACE_NAME, PROTOCOL_NAME, settings
+    )
+
+    assert changed_setting_names == []
+    assert device_calls() == {}
+
+
+def test_set_interface_dynamic_settings___value_of_other_type___compared_as_string(
+    semi_device_control, device_calls
+):
+    semi_device_control.set_interface_dynamic_setting(INTERFACE_NAME, "Voltage", "1.8")
+    device_calls()
+
+    changed_setting_names = semi_device_control.set_interface_dynamic_settings(
+        INTERFACE_NAME, {"Voltage": 1.8}
+    )
+
+    assert changed_setting_names == []
+    assert device_calls() == {}
+
+
+def test_set_interface_dynamic_settings___after_reset___set_again(
+    semi_device_control, device_calls
+):
+    semi_device_control.set_interface_dynamic_settings(INTERFACE_NAME, {"Voltage": "1.8"})
+    semi_device_control.reset_to_default_state()
+    device_calls()
+
+    changed_setting_names = semi_device_control.set_interface_dynamic_settings(
+        INTERFACE_NAME, {"Voltage": "1.8"}
+    )
+
+    assert changed_setting_names == ["Voltage"]
+    assert device_calls() == {"SetInterfaceDynamicSetting": 1}
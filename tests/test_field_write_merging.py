@@ -0,0 +1,73 @@
+"""Behavior tests of the merge of the field writes into register writes."""
+import pytest
+
+from nisdc.field_layout import FieldLayoutTable
+
+REGISTER_UIDS = ["IPBlock0-Group0-REG{}".format(index) for index in range(2)]
+
+
+@pytest.fixture
+def field_layouts(register_map):
+    """Field layout table of the simulated device."""
+    return FieldLayoutTable.from_register_map_description(register_map)
+
+
+def test_field_write_merging___fields_of_shadowed_register___one_register_write(
+    semi_device_control, device_calls, simulated_session, field_layouts
+):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.write_register_by_name_device(REGISTER_UIDS[0], 0b11000000)
+    semi_device_control.enable_field_write_merging(field_layouts)
+    device_calls()
+
+    semi_device_control.write_multi_field_by_name_device(
+        [REGISTER_UIDS[0] + "_F0", REGISTER_UIDS[0] + "_F1"], [1, 2]
+    )
+
+    assert device_calls() == {"WriteRegisterByName_Device": 1}
+    assert simulated_session.ReadRegisterByName_Device(REGISTER_UIDS[0]) == 0b11001001
+
+
+def test_field_write_merging___no_shadow_value___written_as_fields(
+    semi_device_control, device_calls, simulated_session, field_layouts
+):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.enable_field_write_merging(field_layouts)
+
+    semi_device_control.write_multi_field_by_name_device(
+        [REGISTER_UIDS[0] + "_F0", REGISTER_UIDS[0] + "_F1"], [1, 2]
+    )
+
+    assert device_calls() == {"WriteMultipleFieldsByName_Device": 1}
+    assert simulated_session.ReadRegisterByName_Device(REGISTER_UIDS[0]) == 0b00001001
+
+
+def test_coalesce_field_writes___several_calls___one_write_per_register(
+    semi_device_control, device_calls, simulated_session, field_layouts
+):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.write_multi_register_by_name_device(REGISTER_UIDS, [0, 0])
+    semi_device_control.enable_field_write_merging(field_layouts)
+    device_calls()
+
+    with semi_device_control.coalesce_field_writes():
+        semi_device_control.write_field_by_name_device(REGISTER_UIDS[0] + "_F0", 1)
+        semi_device_control.write_field_by_name_device(REGISTER_UIDS[1] + "_F3", 3)
+        semi_device_control.write_field_by_name_device(REGISTER_UIDS[0] + "_F0", 2)
+        assert device_calls() == {}
+
+    assert device_calls() == {"WriteMultipleRegistersByName_Device": 1}
+    assert simulated_session.ReadMultipleRegistersByName_Device(REGISTER_UIDS) == [2, 0b11000000]
+
+
+def test_coalesce_field_writes___register_read___queued_fields_written_first(
+    semi_device_control, device_calls, field_layouts
+):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.write_register_by_name_device(REGISTER_UIDS[0], 0)
+    semi_device_control.enable_field_write_merging(field_layouts)
+
+    with semi_device_control.coalesce_field_writes():
+        semi_device_control.write_field_by_name_device(REGISTER_UIDS[0] + "_F1", 1)
+
+        assert semi_device_control.read_register_by_name_device(REGISTER_UIDS[0]) == 0b100
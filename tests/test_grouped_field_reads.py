@@ -0,0 +1,60 @@
+"""Behavior tests of the field reads grouped by parent register."""
+import pytest
+
+from nisdc.field_layout import FieldLayoutTable
+
+REGISTER_UIDS = ["IPBlock0-Group0-REG{}".format(index) for index in range(2)]
+FIELD_UIDS = [
+    "{}_F{}".format(register_uid, field_index)
+    for register_uid in REGISTER_UIDS
+    for field_index in range(4)
+]
+
+
+@pytest.fixture
+def field_layouts(register_map):
+    """Field layout table of the simulated device."""
+    return FieldLayoutTable.from_register_map_description(register_map)
+
+
+def test_grouped_field_reads___fields_of_two_registers___registers_read_once(
+    semi_device_control, device_calls, field_layouts
+):
+    semi_device_control.write_multi_register_by_name_device(REGISTER_UIDS, [0b11100100, 0b00011011])
+    semi_device_control.enable_grouped_field_reads(field_layouts)
+    device_calls()
+
+    field_data_list = semi_device_control.read_multi_field_by_name_device(FIELD_UIDS)
+
+    assert list(field_data_list) == [0, 1, 2, 3, 3, 2, 1, 0]
+    assert device_calls() == {"ReadMultipleRegistersByName_Device": 1}
+
+
+def test_grouped_field_reads___field_without_layout___read_by_session(
+    semi_device_control, device_calls, field_layouts
+):
+    semi_device_control.write_register_by_name_device(REGISTER_UIDS[0], 0b11100100)
+    semi_device_control.enable_grouped_field_reads(
+        FieldLayoutTable({FIELD_UIDS[1]: field_layouts.get(FIELD_UIDS[1])})
+    )
+    device_calls()
+
+    field_data_list = semi_device_control.read_multi_field_by_name_device(FIELD_UIDS[:3])
+
+    assert list(field_data_list) == [0, 1, 2]
+    assert device_calls() == {
+        "ReadMultipleRegistersByName_Device": 1,
+        "ReadMultipleFieldsByName_Device": 1,
+    }
+
+
+def test_grouped_field_reads___disabled___fields_read_by_session(
+    semi_device_control, device_calls, field_layouts
+):
+    semi_device_control.enable_grouped_field_reads(field_layouts)
+    semi_device_control.disable_grouped_field_reads()
+    device_calls()
+
+    semi_device_control.read_multi_field_by_name_device(FIELD_UIDS)
+
+    assert device_calls() == {"ReadMultipleFieldsByName_Device": 1}
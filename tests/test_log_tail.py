@@ -0,0 +1,69 @@
+"""Behavior tests of the incremental log tail."""
+import pytest
+
+from nisdc import simulation
+from nisdc.simulation import LatencyModel, SimulatedSemiDeviceControlMain
+
+LOG_CAPACITY = 10
+REGISTER_UID = "IPBlock0-Group0-REG1"
+
+
+@pytest.fixture
+def semidevicecontrol_main(register_map, monkeypatch):
+    """Simulated main object with a small log, each row logged at a distinct time."""
+    monkeypatch.setattr(simulation, "LOG_CAPACITY", LOG_CAPACITY)
+    return SimulatedSemiDeviceControlMain(register_map, LatencyModel(default_latency=1e-3))
+
+
+def _get_times(logs):
+    return [float(log[0]) for log in logs]
+
+
+def test_get_new_logs___polled___only_new_rows_returned(semi_device_control):
+    first_logs = semi_device_control.get_new_logs()
+    semi_device_control.write_register_by_name_device(REGISTER_UID, 1)
+    semi_device_control.write_register_by_name_device(REGISTER_UID, 2)
+
+    new_logs = semi_device_control.get_new_logs()
+
+    assert len(first_logs) == 1
+    assert [log[1] for log in new_logs] == ["WriteRegisterByName_Device"] * 2
+    assert semi_device_control.get_new_logs() == []
+
+
+def test_get_new_logs___log_wraps_between_polls___no_row_missed_or_repeated(
+    semi_device_control, simulated_session
+):
+    logs = semi_device_control.get_new_logs()
+    for register_data in range(40):
+        semi_device_control.write_register_by_name_device(REGISTER_UID, register_data)
+        if register_data % 7 == 6:
+            logs += semi_device_control.get_new_logs()
+    logs += semi_device_control.get_new_logs()
+
+    times = _get_times(logs)
+    assert len(logs) == simulated_session.call_count
+    assert times == sorted(set(times))
+
+
+def test_get_new_logs___all_rows_dropped_since_last_poll___whole_log_returned(
+    semi_device_control, simulated_session
+):
+    semi_device_control.get_new_logs()
+    for register_data in range(LOG_CAPACITY * 2):
+        semi_device_control.write_register_by_name_device(REGISTER_UID, register_data)
+
+    logs = semi_device_control.get_new_logs()
+
+    assert logs == semi_device_control.get_logs()
+    assert len(logs) == LOG_CAPACITY
+
+
+def test_get_recent_logs___capacity_reached___oldest_rows_dropped(semi_device_control):
+    semi_device_control.set_log_tail_capacity(3)
+    for register_data in range(5):
+        semi_device_control.write_register_by_name_device(REGISTER_UID, register_data)
+
+    logs = semi_device_control.get_new_logs()
+
+    assert semi_device_control.get_recent_logs() == logs[-3:]
@@ -0,0 +1,77 @@
+"""Behavior tests of the batched pin state writes."""
+
+REGISTER_UID = "IPBlock0-Group0-REG1"
+
+
+def test_write_pin_states___changed_pins___written_in_one_script(
+    semi_device_control, device_calls, simulated_session
+):
+    changed_pin_names = semi_device_control.write_pin_states({"P0": 1, "P1": 1, "P2": 2})
+
+    assert changed_pin_names == ["P0", "P1", "P2"]
+    assert device_calls() == {"ExecuteScriptCommand": 1}
+    pin_states = [simulated_session.ReadPinState(pin_name) for pin_name in ("P0", "P1", "P2")]
+    assert pin_states == [1, 1, 2]
+
+
+def test_write_pin_states___unchanged_pins___not_written_again(semi_device_control, device_calls):
+    semi_device_control.write_pin_states({"P0": 1, "P1": 1})
+    device_calls()
+
+    changed_pin_names = semi_device_control.write_pin_states({"P0": 1, "P1": 0})
+
+    assert changed_pin_names == ["P1"]
+    assert device_calls() == {"WritePinState": 1}
+    assert semi_device_control.write_pin_states({"P0": 1, "P1": 0}) == []
+    assert device_calls() == {}
+
+
+def test_write_pin_states___pins_read_before___unchanged_pins_not_written(
+    semi_device_control, device_calls
+):
+    semi_device_control.read_pin_states(["P0", "P1"])
+    device_calls()
+
+    changed_pin_names = semi_device_control.write_pin_states({"P0": 0, "P1": 1})
+
+    assert changed_pin_names == ["P1"]
+    assert device_calls() == {"WritePinState": 1}
+
+
+def test_write_pin_states___after_script___pins_written_again(semi_device_control, device_calls):
+    semi_device_control.write_pin_states({"P0": 1, "P1": 1})
+    semi_device_control.execute_script("PowerDown")
+    device_calls()
+
+    changed_pin_names = semi_device_control.write_pin_states({"P0": 1, "P1": 1})
+
+    assert changed_pin_names == ["P0", "P1"]
+    assert device_calls() == {"ExecuteScriptCommand": 1}
+
+
+def test_write_pin_states___signal_pin___shadow_cache_and_settings_kept(
+    semi_device_control, device_calls
+):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True, power_pin_names=["P0"])
+    semi_device_control.write_register_by_name_device(REGISTER_UID, 5)
+    semi_device_control.set_interface_dynamic_settings("Simulation1", {"Voltage": "1.8"})
+
+    semi_device_control.write_pin_states({"P1": 1})
+    device_calls()
+
+    assert semi_device_control.read_register_by_name_device(REGISTER_UID) == 5
+    assert (
+        semi_device_control.set_interface_dynamic_settings("Simulation1", {"Voltage": "1.8"}) == []
+    )
+    assert device_calls() == {}
+
+
+def test_write_pin_states___power_pin___shadow_cache_invalidated(semi_device_control, device_calls):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True, power_pin_names=["P0"])
+    semi_device_control.write_register_by_name_device(REGISTER_UID, 5)
+
+    semi_device_control.write_pin_states({"P0": 1, "P1": 1})
+    device_calls()
+
+    assert semi_device_control.read_register_by_name_device(REGISTER_UID) == 5
+    assert device_calls() == {"ReadRegisterByName_Device": 1}
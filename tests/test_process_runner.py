@@ -0,0 +1,52 @@
+"""Behavior tests of the multi-site process runner."""
+import pytest
+
+from nisdc.process_runner import ProcessSiteRunner
+from nisdc.session_pool import MultiSiteError
+from nisdc.simulation import SimulatedBackend, generate_register_map_description
+
+SITE_COUNT = 2
+REGISTER_UIDS = ["IPBlock0-Group0-REG{}".format(index) for index in range(4)]
+
+
+@pytest.fixture(scope="module")
+def process_site_runner():
+    """Started process runner of the simulated sites, shared by the tests of the module."""
+    backend_resolver = SimulatedBackend(generate_register_map_description(len(REGISTER_UIDS)))
+    with ProcessSiteRunner(["site.isconfig"] * SITE_COUNT, backend_resolver) as runner:
+        runner.start()
+        yield runner
+
+
+def test_process_site_runner___bulk_read___result_per_site(process_site_runner):
+    process_site_runner.call_per_site(
+        "write_multi_register_by_name_device",
+        {site: (REGISTER_UIDS, [site] * len(REGISTER_UIDS)) for site in range(SITE_COUNT)},
+    )
+
+    results = process_site_runner.call("read_multi_register_by_name_device", REGISTER_UIDS)
+
+    assert results == [[0, 0, 0, 0], [1, 1, 1, 1]]
+
+
+def test_process_site_runner___call_fails_on_a_site___errors_aggregated(process_site_runner):
+    process_site_runner.call("write_register_by_name_device", REGISTER_UIDS[1], 5)
+
+    with pytest.raises(MultiSiteError) as exception_info:
+        process_site_runner.call_per_site(
+            "read_register_by_address_device", {0: ("IPBlock0", 1), 1: ("IPBlock0", 99)}
+        )
+
+    multi_site_error = exception_info.value
+    assert list(multi_site_error.site_exceptions) == [1]
+    assert "ValueError" in str(multi_site_error.site_exceptions[1])
+    assert multi_site_error.results == [5, None]
+
+
+def test_process_site_runner___after_site_error___site_still_usable(process_site_runner):
+    process_site_runner.call("write_register_by_name_device", REGISTER_UIDS[0], 3)
+
+    with pytest.raises(MultiSiteError):
+        process_site_runner.call("read_register_by_name_device", "IPBlock0-Group0-Unknown")
+
+    assert process_site_runner.call("read_register_by_name_device", REGISTER_UIDS[0]) == [3, 3]
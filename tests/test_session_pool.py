@@ -0,0 +1,74 @@
+"""Behavior tests of the multi-site session pool."""
+import pytest
+
+from nisdc.session_pool import MultiSiteError, SessionPool
+from nisdc.simulation import SimulatedSemiDeviceControlMain
+
+SITE_COUNT = 3
+REGISTER_UID = "IPBlock0-Group0-REG1"
+
+
+@pytest.fixture
+def semidevicecontrol_mains(register_map):
+    """Simulated main object per site."""
+    return [SimulatedSemiDeviceControlMain(register_map) for _ in range(SITE_COUNT)]
+
+
+@pytest.fixture
+def session_pool(semidevicecontrol_mains):
+    """Started session pool of the simulated sites."""
+    with SessionPool.create(
+        ["site{}.isconfig".format(site) for site in range(SITE_COUNT)], semidevicecontrol_mains
+    ) as session_pool:
+        session_pool.start()
+        yield session_pool
+
+
+def test_session_pool___call___result_per_site(session_pool):
+    session_pool.call_per_site(
+        "write_register_by_name_device",
+        {site: (REGISTER_UID, site + 1) for site in range(SITE_COUNT)},
+    )
+
+    assert session_pool.read_register_by_name_device(REGISTER_UID) == [1, 2, 3]
+    assert session_pool.read_register_by_name_device(REGISTER_UID, sites=[2, 0]) == [3, 1]
+
+
+def test_session_pool___call_fails_on_sites___errors_aggregated(session_pool):
+    session_pool.write_register_by_name_device(REGISTER_UID, 7)
+
+    with pytest.raises(MultiSiteError) as exception_info:
+        session_pool.call_per_site(
+            "read_register_by_address_device",
+            {0: ("IPBlock0", 99), 1: ("IPBlock0", 1), 2: ("IPBlock9", 1)},
+        )
+
+    multi_site_error = exception_info.value
+    assert sorted(multi_site_error.site_exceptions) == [0, 2]
+    assert all(
+        isinstance(exception, ValueError) for exception in multi_site_error.site_exceptions.values()
+    )
+    assert multi_site_error.results == [None, 7, None]
+
+
+def test_session_pool___exit___sessions_destroyed(semidevicecontrol_mains):
+    with SessionPool.create(["site.isconfig"] * SITE_COUNT, semidevicecontrol_mains) as pool:
+        pool.start()
+
+    assert [len(main.sessions) for main in semidevicecontrol_mains] == [0, 0, 0]
+
+
+def test_session_pool___stop_fails_on_a_site___all_sessions_destroyed(semidevicecontrol_mains):
+    session_pool = SessionPool.create(["site.isconfig"] * SITE_COUNT, semidevicecontrol_mains)
+    session_pool.start()
+    semidevicecontrol_mains[1].sessions[0].Stop = _raise_stop_error
+
+    with pytest.raises(MultiSiteError) as exception_info:
+        session_pool.destroy()
+
+    assert list(exception_info.value.site_exceptions) == [1]
+    assert [len(main.sessions) for main in semidevicecontrol_mains] == [0, 0, 0]
+
+
+def _raise_stop_error():
+    raise RuntimeError("Stop failed")
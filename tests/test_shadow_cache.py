@@ -0,0 +1,81 @@
+"""Behavior tests of the shadow register cache."""
+
+REGISTER_UID = "IPBlock0-Group0-REG1"
+VOLATILE_REGISTER_UID = "IPBlock0-Group0-REG2"
+
+
+def test_shadow_cache___first_read___read_from_device(semi_device_control, device_calls):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+
+    assert semi_device_control.read_register_by_name_device(REGISTER_UID) == 0
+    assert device_calls() == {"ReadRegisterByName_Device": 1}
+
+
+def test_shadow_cache___second_read___served_from_shadow(semi_device_control, device_calls):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.read_register_by_name_device(REGISTER_UID)
+    device_calls()
+
+    assert semi_device_control.read_register_by_name_device(REGISTER_UID) == 0
+    assert device_calls() == {}
+
+
+def test_shadow_cache___read_by_address___served_from_shadow(semi_device_control, device_calls):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.read_register_by_name_device(REGISTER_UID)
+    device_calls()
+
+    assert semi_device_control.read_register_by_address_device("IPBlock0", 1) == 0
+    assert semi_device_control.read_register_by_address_device("IPBlock0", 1) == 0
+    # The register addresses are loaded once to map the address to the register.
+    assert device_calls() == {"GetRegisterAddresses": 1}
+
+
+def test_shadow_cache___read_after_write___served_from_shadow(semi_device_control, device_calls):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+
+    semi_device_control.write_register_by_name_device(REGISTER_UID, 0x12)
+
+    assert semi_device_control.read_register_by_name_device(REGISTER_UID) == 0x12
+    assert device_calls() == {"WriteRegisterByName_Device": 1}
+
+
+def test_shadow_cache___volatile_register___always_read_from_device(
+    semi_device_control, device_calls
+):
+    semi_device_control.enable_shadow_cache(
+        volatile_register_uids=[VOLATILE_REGISTER_UID], default_non_volatile=True
+    )
+    semi_device_control.write_register_by_name_device(VOLATILE_REGISTER_UID, 0x12)
+    device_calls()
+
+    semi_device_control.read_register_by_name_device(VOLATILE_REGISTER_UID)
+    semi_device_control.read_register_by_name_device(VOLATILE_REGISTER_UID)
+
+    assert device_calls() == {"ReadRegisterByName_Device": 2}
+
+
+def test_shadow_cache___multiple_read___misses_read_in_one_call(semi_device_control, device_calls):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.write_register_by_name_device(REGISTER_UID, 0x12)
+    device_calls()
+
+    register_data_list = semi_device_control.read_multi_register_by_name_device(
+        [REGISTER_UID, VOLATILE_REGISTER_UID]
+    )
+
+    assert list(register_data_list) == [0x12, 0]
+    assert device_calls() == {"ReadMultipleRegistersByName_Device": 1}
+
+
+def test_shadow_cache___reset_to_default_state___read_from_device(
+    semi_device_control, device_calls
+):
+    semi_device_control.enable_shadow_cache(default_non_volatile=True)
+    semi_device_control.write_register_by_name_device(REGISTER_UID, 0x12)
+
+    semi_device_control.reset_to_default_state()
+    device_calls()
+
+    assert semi_device_control.read_register_by_name_device(REGISTER_UID) == 0
+    assert device_calls() == {"ReadRegisterByName_Device": 1}
@@ -0,0 +1,41 @@
+"""Behavior tests of the simulated Semi Device Control backend."""
+import pytest
+
+REGISTER_UID = "IPBlock0-Group0-REG1"
+FIELD_UID = "IPBlock0-Group0-REG1_F2"
+
+
+def test_register_write___read_back___returns_written_value(semi_device_control):
+    semi_device_control.write_register_by_name_device(REGISTER_UID, 0x5A)
+
+    assert semi_device_control.read_register_by_name_device(REGISTER_UID) == 0x5A
+    assert semi_device_control.read_register_by_address_device("IPBlock0", 1) == 0x5A
+
+
+def test_field_write___read_register___field_bits_updated(semi_device_control):
+    semi_device_control.write_field_by_name_device(FIELD_UID, 3)
+
+    assert semi_device_control.read_register_by_name_device(REGISTER_UID) == 0x30
+    assert semi_device_control.read_field_by_name_device(FIELD_UID) == 3
+
+
+def test_cache_write___before_and_after_flush___device_updated_on_flush(semi_device_control):
+    semi_device_control.write_register_by_name_cache(REGISTER_UID, 7)
+
+    assert semi_device_control.read_register_by_name_device(REGISTER_UID) == 0
+    semi_device_control.write_from_cache_to_device()
+    assert semi_device_control.read_register_by_name_device(REGISTER_UID) == 7
+
+
+def test_register_write___out_of_range___raises(semi_device_control):
+    with pytest.raises(ValueError):
+        semi_device_control.write_register_by_name_device(REGISTER_UID, 0x100)
+
+
+def test_destroy___session_removed_from_main(semi_device_control, semidevicecontrol_main):
+    assert len(semidevicecontrol_main.sessions) == 1
+
+    semi_device_control.stop()
+    semi_device_control.destroy()
+
+    assert semidevicecontrol_main.sessions == []
@@ -0,0 +1,76 @@
+"""Behavior tests of the binary transaction trace."""
+import pytest
+
+from nisdc.trace import TRACE_CONTINUATION, TRACE_EXCEPTION, TRACE_VALUE_STRING, TraceReader
+
+REGISTER_UIDS = ["IPBlock0-Group0-REG{}".format(index) for index in range(2)]
+
+
+@pytest.fixture
+def trace_path(tmp_path):
+    """Path of the trace file."""
+    return str(tmp_path / "session.trace")
+
+
+def _read_trace(trace_path):
+    with TraceReader(trace_path) as trace_reader:
+        return list(trace_reader)
+
+
+def test_trace___register_calls___read_back(semi_device_control, trace_path):
+    semi_device_control.start_trace(trace_path)
+    semi_device_control.write_register_by_address_device("IPBlock0", 1, 0x5A)
+    semi_device_control.read_multi_register_by_name_device(REGISTER_UIDS)
+    semi_device_control.stop_trace()
+
+    records = _read_trace(trace_path)
+
+    assert [
+        (record.operation, record.name, record.address, record.value, record.flags)
+        for record in records
+    ] == [
+        ("WriteRegisterByAddress_Device", "IPBlock0", 1, 0x5A, 0),
+        ("ReadMultipleRegistersByName_Device", REGISTER_UIDS[0], 0, 0, 0),
+        ("ReadMultipleRegistersByName_Device", REGISTER_UIDS[1], 0, 0x5A, TRACE_CONTINUATION),
+    ]
+    assert all(record.exception is None for record in records)
+    assert records[0].start_time <= records[1].start_time
+
+
+def test_trace___string_values___read_back(semi_device_control, trace_path):
+    semi_device_control.start_trace(trace_path)
+    semi_device_control.write_field_by_value_definition_device(REGISTER_UIDS[0] + "_F0", "Enabled")
+    semi_device_control.set_interface_dynamic_setting("Simulation1", "Voltage", "1.8")
+    semi_device_control.stop_trace()
+
+    records = _read_trace(trace_path)
+
+    assert [(record.name, record.value) for record in records] == [
+        (REGISTER_UIDS[0] + "_F0", "Enabled"),
+        ("Voltage", "1.8"),
+    ]
+    assert all(record.flags & TRACE_VALUE_STRING for record in records)
+
+
+def test_trace___failed_call___exception_recorded(semi_device_control, trace_path):
+    semi_device_control.start_trace(trace_path)
+    with pytest.raises(ValueError):
+        semi_device_control.write_register_by_name_device(REGISTER_UIDS[0], 0x100)
+    semi_device_control.stop_trace()
+
+    (record,) = _read_trace(trace_path)
+
+    assert record.flags & TRACE_EXCEPTION
+    assert "out of range" in record.exception
+
+
+def test_trace___more_records_than_capacity___file_grows(semi_device_control, trace_path):
+    trace_recorder = semi_device_control.start_trace(trace_path, capacity=2)
+    for register_data in range(5):
+        semi_device_control.write_register_by_name_device(REGISTER_UIDS[0], register_data)
+    assert len(trace_recorder) == 5
+    semi_device_control.stop_trace()
+
+    records = _read_trace(trace_path)
+
+    assert [record.value for record in records] == [0, 1, 2, 3, 4]
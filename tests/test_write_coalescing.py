@@ -0,0 +1,70 @@
+"""Behavior tests of the write-behind coalescing of the register writes."""
+
+REGISTER_UIDS = ["IPBlock0-Group0-REG{}".format(index) for index in range(4)]
+
+
+def test_coalesce_writes___consecutive_writes___one_device_write(
+    semi_device_control, device_calls, simulated_session
+):
+    with semi_device_control.coalesce_writes():
+        for index, register_uid in enumerate(REGISTER_UIDS):
+            semi_device_control.write_register_by_name_device(register_uid, index + 1)
+        assert device_calls() == {}
+
+    assert device_calls() == {"WriteMultipleRegistersByName_Device": 1}
+    assert simulated_session.ReadMultipleRegistersByName_Device(REGISTER_UIDS) == [1, 2, 3, 4]
+
+
+def test_coalesce_writes___read_after_write___queued_writes_flushed_first(
+    semi_device_control, device_calls
+):
+    with semi_device_control.coalesce_writes():
+        semi_device_control.write_register_by_name_device(REGISTER_UIDS[0], 5)
+        semi_device_control.write_register_by_name_device(REGISTER_UIDS[1], 6)
+
+        assert semi_device_control.read_register_by_name_device(REGISTER_UIDS[1]) == 6
+        assert device_calls() == {
+            "WriteMultipleRegistersByName_Device": 1,
+            "ReadRegisterByName_Device": 1,
+        }
+
+    assert device_calls() == {}
+
+
+def test_coalesce_writes___flush_threshold_reached___queued_writes_flushed(
+    semi_device_control, device_calls
+):
+    with semi_device_control.coalesce_writes(flush_threshold=2):
+        for index, register_uid in enumerate(REGISTER_UIDS[:3]):
+            semi_device_control.write_register_by_name_device(register_uid, index)
+        assert device_calls() == {"WriteMultipleRegistersByName_Device": 1}
+
+    assert device_calls() == {"WriteRegisterByName_Device": 1}
+
+
+def test_coalesce_writes___pin_write___queued_writes_flushed_first(
+    semi_device_control, device_calls, simulated_session
+):
+    with semi_device_control.coalesce_writes():
+        semi_device_control.write_register_by_name_device(REGISTER_UIDS[0], 5)
+        semi_device_control.write_pin_state("P0", 1)
+
+        assert simulated_session.ReadRegisterByName_Device(REGISTER_UIDS[0]) == 5
+        assert device_calls() == {"WriteRegisterByName_Device": 1, "WritePinState": 1}
+
+
+def test_enable_write_coalescing___disable___queued_writes_flushed(
+    semi_device_control, device_calls
+):
+    semi_device_control.enable_write_coalescing()
+    semi_device_control.write_register_by_name_device(REGISTER_UIDS[0], 5)
+    semi_device_control.write_register_by_address_device("IPBlock0", 1, 6)
+    semi_device_control.write_register_by_address_device("IPBlock0", 2, 7)
+
+    semi_device_control.disable_write_coalescing()
+
+    assert device_calls() == {
+        "WriteRegisterByName_Device": 1,
+        "WriteMultipleRegistersByAddress_Device": 1,
+    }
+    assert semi_device_control.read_multi_register_by_name_device(REGISTER_UIDS[:3]) == [5, 6, 7]